@@ -0,0 +1 @@
+"""Benchmarks of the freeze pipeline, using synthetic projects."""
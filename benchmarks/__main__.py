@@ -0,0 +1,158 @@
+"""Run the benchmarks of the freeze pipeline and compare the results."""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import subprocess
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from benchmarks.suite import BENCHMARKS, SCALES, run_benchmarks
+from benchmarks.synthetic import SHAPES
+from cx_Freeze import __version__
+
+
+def git_revision() -> str | None:
+    """Return the commit of the working tree, if it is a git repository."""
+    try:
+        process = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],  # noqa: S607
+            check=True,
+            capture_output=True,
+            text=True,
+            cwd=Path(__file__).parent,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return process.stdout.strip()
+
+
+def compare(
+    baseline: dict[str, Any], current: dict[str, Any], threshold: float
+) -> bool:
+    """Print the ratio of the medians; return False on a regression."""
+    base_results = baseline["results"]
+    ok = True
+    print(
+        f"{'Benchmark':<32} {'Baseline':>12} {'Current':>12} {'Unit':<4}"
+        f" {'Ratio':>7}"
+    )
+    for name, result in current["results"].items():
+        base = base_results.get(name)
+        if base is None:
+            continue
+        ratio = result["median"] / base["median"] if base["median"] else 1.0
+        unit = result.get("unit", "s")
+        flag = ""
+        if ratio > 1 + threshold:
+            flag = "  slower" if unit == "s" else "  larger"
+            ok = False
+        elif ratio < 1 - threshold:
+            flag = "  faster" if unit == "s" else "  smaller"
+        print(
+            f"{name:<32} {base['median']:>12.4f} {result['median']:>12.4f}"
+            f" {unit:<4} {ratio:>7.2f}{flag}"
+        )
+    for key in ("scale", "shape", "python"):
+        if baseline["meta"].get(key) != current["meta"].get(key):
+            print(f"warning: the {key} of the results differ", file=sys.stderr)
+    return ok
+
+
+def main() -> None:
+    """Entry point of python -m benchmarks."""
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks", description=__doc__
+    )
+    parser.add_argument(
+        "--scale",
+        choices=SCALES,
+        default="1k",
+        help="number of modules of the synthetic project [default: 1k]",
+    )
+    parser.add_argument(
+        "--shape",
+        choices=SHAPES,
+        default="mixed",
+        help="structure of the packages of the project [default: mixed]",
+    )
+    parser.add_argument(
+        "--libraries",
+        type=int,
+        default=300,
+        help="number of shared objects of the elf benchmark [default: 300]",
+    )
+    parser.add_argument(
+        "--benchmark",
+        action="append",
+        choices=BENCHMARKS,
+        help="benchmark to run, can be repeated [default: all]",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="number of runs of each benchmark [default: 3]",
+    )
+    parser.add_argument(
+        "--output", type=Path, help="write the results to this JSON file"
+    )
+    parser.add_argument(
+        "--compare",
+        type=Path,
+        metavar="BASELINE",
+        help="compare the medians with the results of a previous run",
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative change reported as a regression [default: 0.1]",
+    )
+    args = parser.parse_args()
+
+    names = args.benchmark or list(BENCHMARKS)
+    results = {
+        "meta": {
+            "revision": git_revision(),
+            "version": __version__,
+            "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "scale": args.scale,
+            "shape": args.shape,
+            "libraries": args.libraries,
+            "repeat": args.repeat,
+        },
+        "results": run_benchmarks(
+            names,
+            SCALES[args.scale],
+            args.shape,
+            args.libraries,
+            args.repeat,
+        ),
+    }
+    for name, result in results["results"].items():
+        unit = result["unit"]
+        print(
+            f"{name:<32} median {result['median']:.4f} {unit}"
+            f" (min {result['min']:.4f} {unit})"
+        )
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(
+            json.dumps(results, indent=1) + "\n", encoding="utf-8"
+        )
+    if args.compare:
+        baseline = json.loads(args.compare.read_text(encoding="utf-8"))
+        if not compare(baseline, results, args.threshold):
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
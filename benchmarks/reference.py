@@ -0,0 +1,88 @@
+"""The generator that scanned the bytecode before the single-pass scanner.
+
+It is kept as the reference of the scan_stdlib benchmark, to compare the
+speed and the results of cx_Freeze._bytecode.scan_code with it.
+"""
+
+from __future__ import annotations
+
+import sys
+from dis import _unpack_opargs  # ty: ignore[unresolved-import]
+from typing import TYPE_CHECKING
+
+from cx_Freeze._bytecode import (
+    CALL,
+    CALL_FUNCTION,
+    CALL_INTRINSIC_1,
+    HAS_LAZY,
+    IMPORT_NAME,
+    IMPORT_STAR,
+    LOAD_COMMON_CONSTANT,
+    LOAD_CONST,
+    LOAD_NAME,
+    LOAD_SMALL_INT,
+    PRECALL,
+    PUSH_NULL,
+    STORE_OPS,
+    _common_constants,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Generator
+    from types import CodeType
+
+__all__ = ["scan_code"]
+
+if sys.version_info[:2] >= (3, 13):
+    unpack_opargs = _unpack_opargs
+else:
+
+    def unpack_opargs(co_code: bytes) -> Generator:
+        for i, op, arg in _unpack_opargs(co_code):
+            yield (i, i, op, arg)
+
+
+def scan_code(code: CodeType) -> Generator:
+    """Yield the imports, import * and stored names of the code."""
+    arguments = []
+    names = code.co_names
+    consts = code.co_consts
+    for _i, _offset, opc, arg in unpack_opargs(code.co_code):
+        if opc == LOAD_CONST:
+            arguments.append(consts[arg])
+            continue
+        if LOAD_SMALL_INT and opc == LOAD_SMALL_INT:
+            arguments.append(arg)
+            continue
+        if LOAD_COMMON_CONSTANT and opc == LOAD_COMMON_CONSTANT:
+            if 7 <= arg <= 11:
+                arguments.append(_common_constants[arg])
+            continue
+        if opc == LOAD_NAME:
+            arguments.append(names[arg])
+            continue
+        if PUSH_NULL and opc == PUSH_NULL:
+            continue
+        if PRECALL and opc == PRECALL:
+            continue
+        if (opc, arg) == (CALL or CALL_FUNCTION, 1) and len(arguments) >= 2:
+            func = arguments[-2]
+            if func in ("__import__", "import_module"):
+                name = arguments[-1]
+                yield func, (name, -1, [])
+        elif opc == IMPORT_NAME:
+            name = names[arg >> 2 if HAS_LAZY else arg]
+            if len(arguments) >= 2:
+                relative_import_index, from_list = arguments[-2:]
+            else:
+                relative_import_index = -1
+                from_list = arguments[0] if arguments else None
+            yield "import", (name, relative_import_index, from_list)
+        elif (IMPORT_STAR and opc == IMPORT_STAR) or (
+            CALL_INTRINSIC_1 and (opc, arg) == (CALL_INTRINSIC_1, 2)
+        ):
+            yield "star", ()
+        elif opc in STORE_OPS:
+            name = names[arg]
+            yield "store", (name,)
+        arguments = []
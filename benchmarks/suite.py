@@ -0,0 +1,325 @@
+"""The benchmarks of the freeze pipeline."""
+
+from __future__ import annotations
+
+import gc
+import multiprocessing
+import os
+import statistics
+import sys
+import sysconfig
+import tracemalloc
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path, PurePath
+from tempfile import TemporaryDirectory
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
+
+from benchmarks import reference
+from benchmarks.synthetic import create_libraries, create_project
+from cx_Freeze import Freezer
+from cx_Freeze._bytecode import scan_code
+from cx_Freeze.dep_parser import ELFParser
+from cx_Freeze.exception import PlatformError
+from cx_Freeze.finder import ModuleFinder
+from cx_Freeze.module import ConstantsModule, Module
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Sequence
+    from types import CodeType
+
+__all__ = ["BENCHMARKS", "SCALES", "run_benchmarks"]
+
+# the number of modules of the synthetic projects
+SCALES = {"1k": 1_000, "10k": 10_000, "20k": 20_000, "50k": 50_000}
+
+# the phases of the freeze that are reported separately
+PHASES = (
+    "module finder",
+    "load module code",
+    "scan code",
+    "get dependent files",
+    "copy file",
+    "write modules",
+    "post freeze hook",
+    "freeze",
+)
+
+
+def measure(func: Callable[[], Any], repeat: int) -> list[float]:
+    """Return the wall time of each run, with the garbage collector off."""
+    times = []
+    for _ in range(repeat):
+        gc.collect()
+        gc.disable()
+        try:
+            start = perf_counter()
+            func()
+            times.append(perf_counter() - start)
+        finally:
+            gc.enable()
+    return times
+
+
+def compile_tree(paths: Iterable[Path]) -> list[CodeType]:
+    """Compile the files, and return their code objects and nested ones."""
+    codes: list[CodeType] = []
+    for path in paths:
+        try:
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore")
+                code = compile(path.read_bytes(), os.fspath(path), "exec")
+        except (SyntaxError, ValueError):
+            continue
+        pending = [code]
+        while pending:
+            code = pending.pop()
+            codes.append(code)
+            pending += [c for c in code.co_consts if isinstance(c, type(code))]
+    return codes
+
+
+def bench_scan_code(script: Path, repeat: int) -> dict[str, list[float]]:
+    """Scan the bytecode of all the modules of the project."""
+    codes = compile_tree(sorted(script.parent.rglob("*.py")))
+
+    def run() -> None:
+        for code in codes:
+            scan_code(code)
+
+    return {"scan_code": measure(run, repeat)}
+
+
+def bench_scan_stdlib(repeat: int) -> dict[str, list[float]]:
+    """Compare the scanner with the generator it replaced, on the stdlib."""
+    stdlib = Path(sysconfig.get_paths()["stdlib"])
+    codes = compile_tree(sorted(stdlib.rglob("*.py")))
+    for code in codes:
+        if list(reference.scan_code(code)) != list(scan_code(code)):
+            msg = f"the scanners disagree on {code!r}"
+            raise AssertionError(msg)
+
+    def run_generator() -> None:
+        for code in codes:
+            for _ in reference.scan_code(code):
+                pass
+
+    def run_scanner() -> None:
+        for code in codes:
+            scan_code(code)
+
+    return {
+        "scan_stdlib/generator": measure(run_generator, repeat),
+        "scan_stdlib/scanner": measure(run_scanner, repeat),
+    }
+
+
+def bench_finder(script: Path, repeat: int) -> dict[str, list[float]]:
+    """Find all the modules imported by the script, without cache."""
+
+    def run() -> None:
+        finder = ModuleFinder(
+            ConstantsModule(), path=[os.fspath(script.parent), *sys.path]
+        )
+        try:
+            finder.include_file_as_module(script, "__main__")
+        finally:
+            finder.cleanup()
+
+    return {"finder": measure(run, repeat)}
+
+
+def _attributes(obj: object) -> list[object]:
+    """Return the values of the attributes of an object, and its dict."""
+    values: list[object] = []
+    instance_dict = getattr(obj, "__dict__", None)
+    if instance_dict is not None:
+        values += [instance_dict, *instance_dict.values()]
+    for cls in type(obj).__mro__:
+        for slot in getattr(cls, "__slots__", ()):
+            if slot not in ("__dict__", "__weakref__"):
+                values.append(getattr(obj, slot, None))
+    return values
+
+
+def footprint(modules: Sequence[Module]) -> int:
+    """Return the bytes used by the modules and the values they own.
+
+    The names, paths and sets of names are counted, once if they are shared,
+    but not the code objects, loaders, hooks and other modules.
+    """
+    seen: set[int] = set()
+    pending: list[object] = list(modules)
+    total = 0
+    while pending:
+        obj = pending.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, (Module, PurePath)):
+            values = _attributes(obj)
+        elif isinstance(obj, dict):
+            values = [*obj.keys(), *obj.values()]
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            values = list(obj)
+        else:
+            continue
+        pending += [
+            value
+            for value in values
+            if isinstance(
+                value, (str, PurePath, dict, list, tuple, set, frozenset)
+            )
+        ]
+    return total
+
+
+def _measure_finder(script: Path, stream_modules: bool) -> tuple[int, ...]:
+    """Find all the modules; runs in a new process.
+
+    Returns the peak of the memory allocated meanwhile, the memory still
+    allocated once they are found, and the footprint of the modules.
+    """
+    finder = ModuleFinder(
+        ConstantsModule(),
+        path=[os.fspath(script.parent), *sys.path],
+        stream_modules=stream_modules,
+    )
+    tracemalloc.start()
+    try:
+        finder.include_file_as_module(script, "__main__")
+        gc.collect()
+        retained, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+        finder.cleanup()
+    return peak, retained, footprint(finder.modules)
+
+
+def bench_memory(script: Path, repeat: int) -> dict[str, list[float]]:
+    """Measure the memory used to find all the modules, in MiB.
+
+    The peak is the memory allocated while the modules are found, and the
+    retained memory is the memory still allocated once they are found, with
+    the code of the modules kept in memory or streamed to a temporary file.
+    The modules are the memory used by the modules found (see footprint).
+    Each run uses a new process, so the runs do not share any cache.
+    """
+    results: dict[str, list[float]] = {}
+    context = multiprocessing.get_context("spawn")
+    for _ in range(repeat):
+        for stream_modules in (False, True):
+            with ProcessPoolExecutor(1, mp_context=context) as executor:
+                peak, retained, size = executor.submit(
+                    _measure_finder, script, stream_modules
+                ).result()
+            suffix = ", streamed" if stream_modules else ""
+            results.setdefault(f"memory/finder peak{suffix}", []).append(
+                peak / 2**20
+            )
+            results.setdefault(f"memory/finder retained{suffix}", []).append(
+                retained / 2**20
+            )
+            if not stream_modules:
+                results.setdefault("memory/modules", []).append(size / 2**20)
+    return results
+
+
+def bench_freeze(
+    work_dir: Path, script: Path, repeat: int
+) -> dict[str, list[float]]:
+    """Freeze the project, and report the total time of each phase."""
+    results: dict[str, list[float]] = {}
+    for run in range(repeat):
+        gc.collect()
+        freezer = Freezer(
+            executables=[os.fspath(script)],
+            path=[os.fspath(script.parent), *sys.path],
+            target_dir=work_dir / f"build{run}",
+            cache=False,
+            silent=True,
+            timings=True,
+        )
+        freezer.freeze()
+        timings = freezer._timings  # noqa: SLF001
+        if timings is None:
+            continue
+        for name in PHASES:
+            values = timings.phases.get(name)
+            if values is not None:
+                results.setdefault(f"freeze/{name}", []).append(values[1])
+    return results
+
+
+def bench_elf(
+    work_dir: Path, libraries: int, repeat: int
+) -> dict[str, list[float]]:
+    """Resolve the dependencies of chains of shared objects."""
+    paths = create_libraries(work_dir / "elf", libraries)
+    try:
+        parser = ELFParser([], [], 3, {})
+    except PlatformError as exc:
+        print(f"skipping elf: {exc}", file=sys.stderr)
+        return {}
+
+    def run() -> None:
+        parser.dependent_files.clear()
+        for path in paths:
+            parser.get_dependent_files(path)
+
+    return {"elf": measure(run, repeat)}
+
+
+BENCHMARKS = (
+    "scan_code",
+    "scan_stdlib",
+    "finder",
+    "memory",
+    "freeze",
+    "elf",
+)
+
+
+def summarize(values: list[float], unit: str = "s") -> dict[str, Any]:
+    """Return the statistics of the runs of a benchmark."""
+    return {
+        "median": statistics.median(values),
+        "min": min(values),
+        "max": max(values),
+        "unit": unit,
+        "runs": values,
+    }
+
+
+def run_benchmarks(
+    names: list[str],
+    modules: int,
+    shape: str,
+    libraries: int,
+    repeat: int,
+) -> dict[str, dict[str, Any]]:
+    """Run the benchmarks on a synthetic project created for them."""
+    results: dict[str, dict[str, Any]] = {}
+    with TemporaryDirectory(prefix="cxfreeze-bench-") as tmp:
+        work_dir = Path(tmp)
+        script = create_project(work_dir / "project", modules, shape)
+        for name in names:
+            print(f"running {name}...", file=sys.stderr)
+            if name == "scan_code":
+                measured = bench_scan_code(script, repeat)
+            elif name == "scan_stdlib":
+                measured = bench_scan_stdlib(repeat)
+            elif name == "finder":
+                measured = bench_finder(script, repeat)
+            elif name == "memory":
+                measured = bench_memory(script, repeat)
+            elif name == "freeze":
+                measured = bench_freeze(work_dir, script, repeat)
+            else:
+                measured = bench_elf(work_dir, libraries, repeat)
+            unit = "MiB" if name == "memory" else "s"
+            for key, values in measured.items():
+                results[key] = summarize(values, unit)
+    return results
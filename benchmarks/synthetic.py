@@ -0,0 +1,177 @@
+"""Generators of synthetic projects and shared libraries."""
+
+from __future__ import annotations
+
+import struct
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+__all__ = ["SHAPES", "create_libraries", "create_project"]
+
+SHAPES = ("wide", "deep", "namespace", "mixed")
+
+# modules in each package
+MODULES_PER_PACKAGE = 20
+# nesting of the packages of the deep shape
+DEPTH = 8
+# regular packages in each namespace package
+SUBPACKAGES = 4
+
+MODULE_SOURCE = '''\
+"""Synthetic module {name}."""
+
+import json
+import os
+{sibling}
+CONSTANT_{index} = {index}
+TABLE_{index} = {{"name": {name!r}, "values": list(range({index} % 50))}}
+
+
+def function_{index}(value):
+    """Return a computed value."""
+    data = json.dumps({{"value": value, "sep": os.sep}})
+    return [item * {index} for item in range(value)], data
+
+
+class Class{index}:
+    """A synthetic class."""
+
+    def __init__(self, value=CONSTANT_{index}):
+        self.value = value
+
+    def method(self, value):
+        """Call the function of the module."""
+        return function_{index}(value + self.value)
+'''
+
+
+def _write_package(
+    root: Path, package: str, count: int, children: list[str], start: int
+) -> int:
+    """Write a regular package with its modules; return the next index."""
+    directory = root.joinpath(*package.split("."))
+    directory.mkdir(parents=True, exist_ok=True)
+    names = [f"mod{index}" for index in range(count)]
+    imports = ", ".join([*names, *children])
+    directory.joinpath("__init__.py").write_text(
+        f'"""Synthetic package {package}."""\n\nfrom . import {imports}\n',
+        encoding="utf-8",
+    )
+    for position, name in enumerate(names):
+        sibling = ""
+        if position + 1 < count:
+            sibling = f"from {package} import {names[position + 1]}\n"
+        directory.joinpath(f"{name}.py").write_text(
+            MODULE_SOURCE.format(
+                name=f"{package}.{name}", index=start, sibling=sibling
+            ),
+            encoding="utf-8",
+        )
+        start += 1
+    return start
+
+
+def create_project(root: Path, modules: int, shape: str = "mixed") -> Path:
+    """Create a project with about this number of modules.
+
+    The shapes are: wide (many top-level packages), deep (chains of nested
+    packages), namespace (namespace packages of regular packages) or mixed
+    (a third of each). Each package imports its modules, and each module
+    imports the next one and a few modules of the standard library.
+
+    :return: The path of the main script, which imports all the packages.
+    """
+    if shape not in SHAPES:
+        msg = f"unknown shape {shape!r}, expected one of {SHAPES}"
+        raise ValueError(msg)
+    root.mkdir(parents=True, exist_ok=True)
+    shapes = ["wide", "deep", "namespace"] if shape == "mixed" else [shape]
+    share = max(modules // len(shapes), 1)
+    per_package = MODULES_PER_PACKAGE
+    imports: list[str] = []
+    index = 0
+    for kind in shapes:
+        packages = max(share // (per_package + 1), 1)
+        if kind == "wide":
+            for number in range(packages):
+                package = f"bench_wide{number}"
+                index = _write_package(root, package, per_package, [], index)
+                imports.append(package)
+        elif kind == "deep":
+            for number in range(-(-packages // DEPTH)):
+                levels = [f"bench_deep{number}"]
+                levels += [f"level{level}" for level in range(1, DEPTH)]
+                for level in range(DEPTH, 0, -1):
+                    package = ".".join(levels[:level])
+                    children = levels[level : level + 1]
+                    index = _write_package(
+                        root, package, per_package, children, index
+                    )
+                imports.append(levels[0])
+        else:
+            for number in range(-(-packages // SUBPACKAGES)):
+                for sub in range(SUBPACKAGES):
+                    package = f"bench_ns{number}.sub{sub}"
+                    index = _write_package(
+                        root, package, per_package, [], index
+                    )
+                    imports.append(package)
+    script = root / "main.py"
+    script.write_text(
+        "".join(f"import {name}\n" for name in imports), encoding="utf-8"
+    )
+    return script
+
+
+def _create_elf(path: Path, soname: str, needed: list[str]) -> None:
+    """Create a minimal 64-bit little endian ELF file with a dynamic table."""
+    ehsize, phentsize = 64, 56
+    vaddr = 0x10000
+    strings = [(14, soname), *((1, name) for name in needed)]
+    strings.append((29, "$ORIGIN"))  # DT_RUNPATH
+    dynamic_off = ehsize + 2 * phentsize
+    dynamic_size = (len(strings) + 2) * 16
+    strtab_off = dynamic_off + dynamic_size
+    strtab = b"\0"
+    entries = []
+    for d_tag, value in strings:
+        entries.append((d_tag, len(strtab)))
+        strtab += value.encode() + b"\0"
+    entries.append((5, vaddr + strtab_off))  # DT_STRTAB
+    entries.append((0, 0))  # DT_NULL
+    file_size = strtab_off + len(strtab)
+    ident = b"\x7fELF\x02\x01\x01".ljust(16, b"\0")
+    header = struct.pack(
+        "<HHIQQQIHHHHHH",
+        3, 62, 1, 0, ehsize, 0, 0, ehsize, phentsize, 2, 0, 0, 0,
+    )  # fmt: skip
+    phdrs = struct.pack(
+        "<IIQQQQQQ", 1, 4, 0, vaddr, vaddr, file_size, file_size, 0
+    ) + struct.pack(
+        "<IIQQQQQQ",
+        2, 4, dynamic_off, vaddr + dynamic_off, vaddr + dynamic_off,
+        dynamic_size, dynamic_size, 8,
+    )  # fmt: skip
+    dynamic = b"".join(struct.pack("<qQ", *entry) for entry in entries)
+    path.write_bytes(ident + header + phdrs + dynamic + strtab)
+
+
+def create_libraries(root: Path, count: int, fanout: int = 3) -> list[Path]:
+    """Create shared objects with chains of DT_NEEDED entries.
+
+    Each library needs the next ones, up to fanout, and finds them using a
+    DT_RUNPATH of $ORIGIN.
+    """
+    root.mkdir(parents=True, exist_ok=True)
+    libraries = []
+    for index in range(count):
+        needed = [
+            f"libbench{other}.so"
+            for other in range(index + 1, min(index + 1 + fanout, count))
+        ]
+        path = root / f"libbench{index}.so"
+        _create_elf(path, path.name, needed)
+        libraries.append(path)
+    return libraries
@@ -0,0 +1,303 @@
+"""Internal _archive module - an archive of modules mapped in memory.
+
+The archive stores the marshalled code of the modules contiguously, aligned,
+after a table of entries sorted by name. A frozen application maps the file
+in memory and loads the code of a module directly from the mapped pages, so
+opening the archive costs nothing and the pages are shared between the
+processes that use it.
+
+This module is included in the frozen application as _cx_freeze_archive and
+is imported at the end of the init module, installing ArchiveFinder. The
+modules are located in the zip file, like the modules that zipimport loads,
+so the data files of the packages are read from the zip file.
+
+The code is written as the modules are added, so the table and the names
+follow it and the header, written last, locates the table.
+
+Layout (little endian)::
+
+    header    magic (8 bytes), version (4 bytes), number of entries (4 bytes),
+              offset of the table (8 bytes)
+    code      the marshalled code of each module, aligned to 16 bytes
+    table     for each entry, sorted by name: offset and size of the name
+              (8 + 4 bytes), offset and size of the code (8 + 4 bytes) and
+              flags (4 bytes)
+    names     the names of the modules, utf-8 encoded
+"""
+
+from __future__ import annotations
+
+import marshal
+import mmap
+import os
+import sys
+from _frozen_importlib import ModuleSpec
+from _frozen_importlib_external import PathFinder
+from typing import TYPE_CHECKING
+from zipimport import zipimporter
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+    from importlib.abc import ResourceReader
+    from types import CodeType, ModuleType, TracebackType
+
+    if sys.version_info >= (3, 11):
+        from typing import Self
+    else:
+        from typing_extensions import Self
+
+__all__ = [
+    "ARCHIVE_FILENAME",
+    "ARCHIVE_MODULE",
+    "ArchiveFinder",
+    "ArchiveWriter",
+    "write_archive",
+]
+
+ARCHIVE_MODULE = "_cx_freeze_archive"
+ARCHIVE_FILENAME = "library.mar"
+
+MAGIC = b"CXFZMAR\0"
+VERSION = 2
+HEADER_SIZE = 24
+RECORD_SIZE = 28
+ALIGNMENT = 16
+
+# flags of the entries
+IS_PACKAGE = 1
+
+
+class ArchiveWriter:
+    """Write an archive, appending the code of each module as it is added.
+
+    Only the names and the locations of the entries are kept until the
+    archive is closed.
+    """
+
+    def __init__(self, filename: str | os.PathLike[str]) -> None:
+        self.filename = filename
+        self._file = open(filename, "wb")  # noqa: SIM115
+        self._file.write(bytes(HEADER_SIZE))
+        # the name, the offset and size of the code, and the flags
+        self._entries: list[tuple[bytes, int, int, int]] = []
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._file.close()
+            os.remove(self.filename)
+
+    def add(self, name: str, data: bytes | memoryview, flags: int = 0) -> None:
+        """Append the marshalled code of the module."""
+        file = self._file
+        file.write(bytes(-file.tell() % ALIGNMENT))
+        self._entries.append((name.encode(), file.tell(), len(data), flags))
+        file.write(data)
+
+    def close(self) -> None:
+        """Write the table of the entries and the header."""
+        file = self._file
+        if file.closed:
+            return
+        entries = sorted(self._entries)
+        table_offset = file.tell()
+        names_offset = table_offset + RECORD_SIZE * len(entries)
+        for name, offset, size, flags in entries:
+            file.write(
+                names_offset.to_bytes(8, "little")
+                + len(name).to_bytes(4, "little")
+                + offset.to_bytes(8, "little")
+                + size.to_bytes(4, "little")
+                + flags.to_bytes(4, "little")
+            )
+            names_offset += len(name)
+        file.writelines(name for name, _, _, _ in entries)
+        file.seek(0)
+        file.write(MAGIC)
+        file.write(VERSION.to_bytes(4, "little"))
+        file.write(len(entries).to_bytes(4, "little"))
+        file.write(table_offset.to_bytes(8, "little"))
+        file.close()
+
+
+def write_archive(
+    filename: str | os.PathLike[str], entries: Iterable[tuple[str, bytes, int]]
+) -> None:
+    """Write the archive with the (name, marshalled code, flags) entries."""
+    with ArchiveWriter(filename) as writer:
+        for name, data, flags in entries:
+            writer.add(name, data, flags)
+
+
+class ArchiveFinder:
+    """A meta path finder and loader for the modules in an archive.
+
+    The names are looked up using a binary search in the table of the mapped
+    file, and the code is unmarshalled from the mapped memory. When a zip file
+    is given, the modules are located in it and their data is read from it.
+    """
+
+    def __init__(self, filename: str, zip_filename: str | None = None) -> None:
+        self.filename: str = filename
+        self.location: str = zip_filename or filename
+        self._zip: zipimporter | None = None
+        if zip_filename:
+            self._zip = zipimporter(zip_filename)
+        with open(filename, "rb") as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        if self._map[:8] != MAGIC or self._read(8, 4) != VERSION:
+            msg = f"invalid module archive: {filename!r}"
+            raise ValueError(msg)
+        self._count: int = self._read(12, 4)
+        self._table: int = self._read(16, 8)
+
+    def _read(self, offset: int, size: int) -> int:
+        return int.from_bytes(self._map[offset : offset + size], "little")
+
+    def _lookup(self, fullname: str) -> tuple[int, int, int] | None:
+        """Return the offset and size of the code, and the flags."""
+        key = fullname.encode()
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            record = self._table + middle * RECORD_SIZE
+            name_offset = self._read(record, 8)
+            name = self._map[
+                name_offset : name_offset + self._read(record + 8, 4)
+            ]
+            if name < key:
+                low = middle + 1
+            elif name > key:
+                high = middle
+            else:
+                return (
+                    self._read(record + 12, 8),
+                    self._read(record + 20, 4),
+                    self._read(record + 24, 4),
+                )
+        return None
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Sequence[str] | None = None,  # noqa: ARG002
+        target: ModuleType | None = None,  # noqa: ARG002
+    ) -> ModuleSpec | None:
+        """Return the spec of the module, or None if it is not archived."""
+        entry = self._lookup(fullname)
+        if entry is None:
+            return None
+        parts = fullname.split(".")
+        is_package = bool(entry[2] & IS_PACKAGE)
+        if is_package:
+            location = os.path.join(self.location, *parts)
+            origin = os.path.join(location, "__init__.pyc")
+        else:
+            origin = os.path.join(self.location, *parts) + ".pyc"
+        spec = ModuleSpec(fullname, self, origin=origin, is_package=is_package)
+        spec.has_location = True
+        if is_package:
+            spec.submodule_search_locations = [location]
+        return spec
+
+    def create_module(self, spec: ModuleSpec) -> None:
+        """Use the default module creation."""
+
+    def exec_module(self, module: ModuleType) -> None:
+        """Execute the code of the module in its namespace."""
+        code = self.get_code(module.__name__)
+        if code is None:
+            msg = f"module {module.__name__!r} not found in {self.filename!r}"
+            raise ImportError(msg, name=module.__name__)
+        exec(code, module.__dict__)  # noqa: S102
+
+    def get_code(self, fullname: str) -> CodeType | None:
+        """Return the code of the module, or None if it is not archived."""
+        entry = self._lookup(fullname)
+        if entry is None:
+            return None
+        offset, size, _ = entry
+        with self._view[offset : offset + size] as data:
+            return marshal.loads(data)  # noqa: S302
+
+    def get_data(self, path: str) -> bytes:
+        """Return the data of the file, read from the zip file."""
+        if self._zip is None:
+            with open(path, "rb") as file:
+                return file.read()
+        return self._zip.get_data(path)
+
+    def get_filename(self, fullname: str) -> str:
+        """Return the location of the module, as set in its spec."""
+        spec = self.find_spec(fullname)
+        if spec is None:
+            msg = f"module {fullname!r} not found in {self.filename!r}"
+            raise ImportError(msg, name=fullname)
+        return spec.origin
+
+    def get_resource_reader(self, fullname: str) -> ResourceReader | None:
+        """Return a reader of the data of the package in the zip file."""
+        if self._zip is None or not self.is_package(fullname):
+            return None
+        try:
+            from importlib.resources.readers import ZipReader  # noqa: PLC0415
+        except ImportError:  # Python 3.10
+            from importlib.readers import ZipReader  # noqa: PLC0415
+        parent = fullname.rpartition(".")[0]
+        prefix = parent.replace(".", "/") + "/" if parent else ""
+        return ZipReader(_ZipPrefix(self._zip.archive, prefix), fullname)
+
+    def get_source(self, fullname: str) -> None:
+        """Return None, the source code is not stored."""
+
+    def is_package(self, fullname: str) -> bool:
+        """Return True if the module is a package."""
+        entry = self._lookup(fullname)
+        if entry is None:
+            msg = f"module {fullname!r} not found in {self.filename!r}"
+            raise ImportError(msg, name=fullname)
+        return bool(entry[2] & IS_PACKAGE)
+
+
+class _ZipPrefix:
+    """The zip file and the prefix of the parent package, for ZipReader."""
+
+    def __init__(self, archive: str, prefix: str) -> None:
+        self.archive = archive
+        self.prefix = prefix
+
+    def is_package(self, fullname: str) -> bool:  # noqa: ARG002
+        """Return True, the reader is only used for packages."""
+        return True
+
+
+def install() -> None:
+    """Open the archive in the lib directory and install the finder."""
+    loader = globals().get("__loader__")
+    zip_filename = getattr(loader, "archive", None)
+    lib_dir = os.path.dirname(zip_filename or __file__)
+    try:
+        finder = ArchiveFinder(
+            os.path.join(lib_dir, ARCHIVE_FILENAME), zip_filename
+        )
+    except (ImportError, OSError, ValueError):
+        return
+    try:
+        position = sys.meta_path.index(PathFinder)
+    except ValueError:
+        position = len(sys.meta_path)
+    sys.meta_path.insert(position, finder)
+
+
+if __name__ == ARCHIVE_MODULE:
+    install()
@@ -3,6 +3,8 @@
 from __future__ import annotations
 
 import logging
+import opcode
+import os
 import sys
 from contextlib import suppress
 from opcode import opmap
@@ -11,21 +13,9 @@ from types import CodeType
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
-    from collections.abc import Generator
-
+    from cx_Freeze._typing import ScanResults
     from cx_Freeze.module import Module
 
-from dis import _unpack_opargs  # ty: ignore[unresolved-import]
-
-if sys.version_info[:2] >= (3, 13):
-    unpack_opargs = _unpack_opargs
-else:
-
-    def unpack_opargs(co_code: bytes) -> Generator:
-        for i, op, arg in _unpack_opargs(co_code):
-            yield (i, i, op, arg)
-
-
 if sys.version_info[:2] >= (3, 14):
     from dis import _common_constants  # ty: ignore[unresolved-import]
 else:
@@ -63,6 +53,8 @@ __all__ = [
     "code_object_replace",
     "code_object_replace_function",
     "code_object_replace_package",
+    "code_object_set_package",
+    "module_package",
     "scan_code",
 ]
 
@@ -105,125 +97,234 @@ def code_object_replace_function(
     return code_object_replace(code, co_consts=consts)
 
 
-def code_object_replace_package(module: Module) -> CodeType | None:
-    """Replace the value of __package__ directly in the code.
+def module_package(module: Module) -> str | None:
+    """Return the value of __package__ to set in the code of the module.
 
-    When the module is in a package and will be stored in shared zip file.
+    When the module is in a package and will be stored in shared zip file,
+    and does not define it (like 'six' do).
     """
-    code = module.code
-    # Check if module is in a package and will be stored in zip file
-    # and is not defined in the module, like 'six' do
     if (
-        code is None
-        or module.parent is None
+        module.parent is None
+        or module.file_name is None
         or "__package__" in module.global_names
         or module.in_file_system >= 1
     ):
+        return None
+    if os.path.splitext(module.file_name)[0] == "__init__":
+        return module.name
+    return module.parent.name
+
+
+def code_object_set_package(code: CodeType, package: str | None) -> CodeType:
+    """Return the code with the value of __package__ set at its start.
+
+    Only if the code references it.
+    """
+    if package is None or "__package__" not in code.co_names:
+        return code
+    co_consts = list(code.co_consts)
+    pkg_const_index = len(co_consts)
+    pkg_name_index = code.co_names.index("__package__")
+    if pkg_const_index > 255 or pkg_name_index > 255:
+        # Don't touch modules with many constants or names;
+        # This is good for now.
         return code
-    # Only if the code references it.
-    if "__package__" in code.co_names:
-        co_consts = list(code.co_consts)
-        pkg_const_index = len(co_consts)
-        pkg_name_index = code.co_names.index("__package__")
-        if pkg_const_index > 255 or pkg_name_index > 255:
-            # Don't touch modules with many constants or names;
-            # This is good for now.
-            return code
-        # Insert a bytecode to set __package__ as module.parent.name
-        codes = [LOAD_CONST, pkg_const_index, STORE_NAME, pkg_name_index]
-        co_code = bytes(codes) + code.co_code
-        if module.file:
-            if module.file.stem == "__init__":
-                co_consts.append(module.name)
-            else:
-                co_consts.append(module.parent.name)
-        code = code_object_replace(code, co_code=co_code, co_consts=co_consts)
-    return code
-
-
-def scan_code(code: CodeType) -> Generator:
-    arguments = []
+    # Insert a bytecode to set __package__ as the package
+    codes = [LOAD_CONST, pkg_const_index, STORE_NAME, pkg_name_index]
+    co_code = bytes(codes) + code.co_code
+    co_consts.append(package)
+    return code_object_replace(code, co_code=co_code, co_consts=co_consts)
+
+
+def code_object_replace_package(module: Module) -> CodeType | None:
+    """Replace the value of __package__ directly in the code.
+
+    When the module is in a package and will be stored in shared zip file.
+    """
+    code = module.code
+    if code is None:
+        return code
+    return code_object_set_package(code, module_package(module))
+
+
+def _cache_entries() -> bytes:
+    """Return the number of inline cache entries of each opcode."""
+    table = bytearray(256)
+    entries = getattr(opcode, "_inline_cache_entries", None)  # Python 3.11+
+    if isinstance(entries, dict):  # Python 3.13+
+        for name, count in entries.items():
+            if name in opmap:
+                table[opmap[name]] = count
+    elif entries:
+        for op, count in enumerate(entries[:256]):
+            table[op] = count
+    return bytes(table)
+
+
+# the kind of each opcode for the scanner; the other opcodes reset the
+# arguments of the next import
+_RESET = 0
+_EXTENDED_ARG = 1
+_CONST = 2
+_SMALL_INT = 3
+_COMMON_CONSTANT = 4
+_NAME = 5
+_IGNORED = 6
+_CALL = 7
+_IMPORT = 8
+_STAR = 9
+_INTRINSIC = 10
+_STORE = 11
+
+
+def _opcode_kinds() -> bytes:
+    """Return the kind of each opcode, indexed by opcode."""
+    table = bytearray(256)
+    kinds = [
+        (EXTENDED_ARG, _EXTENDED_ARG),
+        (LOAD_CONST, _CONST),
+        (LOAD_SMALL_INT, _SMALL_INT),
+        (LOAD_COMMON_CONSTANT, _COMMON_CONSTANT),
+        (LOAD_NAME, _NAME),
+        (PUSH_NULL, _IGNORED),
+        (PRECALL, _IGNORED),
+        (CALL or CALL_FUNCTION, _CALL),
+        (IMPORT_NAME, _IMPORT),
+        (IMPORT_STAR, _STAR),
+        (CALL_INTRINSIC_1, _INTRINSIC),
+        (STORE_NAME, _STORE),
+        (STORE_GLOBAL, _STORE),
+    ]
+    for op, kind in kinds:
+        if op is not None:
+            table[op] = kind
+    return bytes(table)
+
+
+CACHE_ENTRIES = _cache_entries()
+OPCODE_KINDS = _opcode_kinds()
+
+# the opcodes that can produce a result; the calls only matter when the
+# code refers to __import__ or import_module
+_IMPORT_FUNCTIONS = ("__import__", "import_module")
+_RESULT_OPS = frozenset(
+    op
+    for op, kind in enumerate(OPCODE_KINDS)
+    if kind in (_IMPORT, _STAR, _INTRINSIC, _STORE)
+)
+_RESULT_OPS_WITH_CALL = _RESULT_OPS | {CALL or CALL_FUNCTION}
+
+
+def scan_code(code: CodeType) -> ScanResults:
+    """Return the imports, import * and stored names of the code.
+
+    Each result is a pair of the kind of operation ("import", "__import__",
+    "import_module", "star" or "store") and its arguments, in the order of
+    the bytecode. The nested code objects are not scanned.
+    """
+    # most code objects, like the functions, do not import or store names;
+    # their opcodes are checked at once
+    result_ops = _RESULT_OPS
+    for func in _IMPORT_FUNCTIONS:
+        if func in code.co_names or func in code.co_consts:
+            result_ops = _RESULT_OPS_WITH_CALL
+            break
+    if result_ops.isdisjoint(code.co_code[::2]):
+        return ()
+    return _scan_code(code)
+
+
+def _scan_code(code: CodeType) -> ScanResults:
+    co_code = code.co_code
     names = code.co_names
     consts = code.co_consts
-    for _i, _offset, opc, arg in unpack_opargs(code.co_code):
-        # keep track of constants (these are used for importing)
-        # immediately restart loop so arguments are retained
-        if opc == LOAD_CONST:
-            arguments.append(consts[arg])
+    results: list[tuple[str, tuple]] = []
+    append = results.append
+    kinds = OPCODE_KINDS
+    cache_entries = CACHE_ENTRIES
+    # keep track of constants and names (these are used for importing)
+    arguments: list = []
+    extended_arg = 0
+    caches = 0
+    for i in range(0, len(co_code), 2):
+        # skip the inline cache entries
+        if caches:
+            caches -= 1
             continue
-        # constants in Python 3.14
-        if LOAD_SMALL_INT and opc == LOAD_SMALL_INT:
-            arguments.append(arg)
+        opc = co_code[i]
+        caches = cache_entries[opc]
+        arg = co_code[i + 1] | extended_arg
+        kind = kinds[opc]
+        if kind == _EXTENDED_ARG:
+            extended_arg = arg << 8
+            arguments = []
             continue
-        # constants in Python 3.15 (extended use of LOAD_COMMON_CONSTANT)
-        if LOAD_COMMON_CONSTANT and opc == LOAD_COMMON_CONSTANT:
+        extended_arg = 0
+        if kind == _CONST:
+            arguments.append(consts[arg])
+        elif kind == _SMALL_INT:
+            # constants in Python 3.14
+            arguments.append(arg)
+        elif kind == _COMMON_CONSTANT:
+            # constants in Python 3.15 (extended use of LOAD_COMMON_CONSTANT)
             # arg 0-6 are callables; 7-11 are literal values.
             if 7 <= arg <= 11:
                 arguments.append(_common_constants[arg])
-            continue
-
-        # keep track of the name which can be the name of the import func
-        if opc == LOAD_NAME:
+        elif kind == _NAME:
+            # the name can be the name of the import function
             arguments.append(names[arg])
-            continue
-
-        if PUSH_NULL and opc == PUSH_NULL:
-            continue  # ignore it in Python 3.13+ (exists in 3.11+)
-
-        if PRECALL and opc == PRECALL:
-            continue  # ignore it in Python 3.11
-
-        if (opc, arg) == (CALL or CALL_FUNCTION, 1) and len(arguments) >= 2:
-            # Python 3.6-3.10 bytecode of a __import__ call:
-            # 1            0 LOAD_NAME                0 (__import__)
-            #              2 LOAD_CONST               0 ('pkgutil')
-            #              4 CALL_FUNCTION            1
-            # Python 3.11 bytecode of a __import__ call:
-            # 1            2 PUSH_NULL
-            #              4 LOAD_NAME                0 (__import__)
-            #              6 LOAD_CONST               0 ('pkgutil')
-            #              8 PRECALL                  1
-            #             12 CALL                     1
-            # Python 3.12 bytecode of a __import__ call:
-            # 1            2 PUSH_NULL
-            #              4 LOAD_NAME                0 (__import__)
-            #              6 LOAD_CONST               0 ('pkgutil')
-            #              8 CALL                     1
-            # Python 3.13-3.14 bytecode of a __import__ call:
-            # 1            2 LOAD_NAME                0 (__import__)
-            #              4 PUSH_NULL
-            #              6 LOAD_CONST               0 ('pkgutil')
-            #              8 CALL                     1
-            func = arguments[-2]
-            if func in ("__import__", "import_module"):
-                name = arguments[-1]
-                yield func, (name, -1, [])
-
-        # import statement: attempt to import module
-        elif opc == IMPORT_NAME:
-            # IMPORT_NAME encodes lazy/eager flags in bits 0-1,
-            # name index in bits 2+.
-            name = names[arg >> 2 if HAS_LAZY else arg]
-            if len(arguments) >= 2:
-                relative_import_index, from_list = arguments[-2:]
-            else:
-                relative_import_index = -1
-                from_list = arguments[0] if arguments else None
-            yield "import", (name, relative_import_index, from_list)
-
-        # import * statement: copy all global names
-        elif IMPORT_STAR and opc == IMPORT_STAR:
-            # Python up to 3.11
-            yield "star", ()
-        elif CALL_INTRINSIC_1 and (opc, arg) == (CALL_INTRINSIC_1, 2):
-            # Python 3.12+
-            yield "star", ()
-
-        # store operation: track only top level
-        elif opc in STORE_OPS:
-            name = names[arg]
-            yield "store", (name,)
-
-        # reset arguments; these are only needed for import statements so
-        # ignore them in all other cases!
-        arguments = []
+        elif kind == _IGNORED:
+            # PUSH_NULL (Python 3.11+) and PRECALL (Python 3.11 only)
+            pass
+        else:
+            if kind == _CALL:
+                if arg == 1 and len(arguments) >= 2:
+                    # Python 3.6-3.10 bytecode of a __import__ call:
+                    # 1            0 LOAD_NAME                0 (__import__)
+                    #              2 LOAD_CONST               0 ('pkgutil')
+                    #              4 CALL_FUNCTION            1
+                    # Python 3.11 bytecode of a __import__ call:
+                    # 1            2 PUSH_NULL
+                    #              4 LOAD_NAME                0 (__import__)
+                    #              6 LOAD_CONST               0 ('pkgutil')
+                    #              8 PRECALL                  1
+                    #             12 CALL                     1
+                    # Python 3.12 bytecode of a __import__ call:
+                    # 1            2 PUSH_NULL
+                    #              4 LOAD_NAME                0 (__import__)
+                    #              6 LOAD_CONST               0 ('pkgutil')
+                    #              8 CALL                     1
+                    # Python 3.13-3.14 bytecode of a __import__ call:
+                    # 1            2 LOAD_NAME                0 (__import__)
+                    #              4 PUSH_NULL
+                    #              6 LOAD_CONST               0 ('pkgutil')
+                    #              8 CALL                     1
+                    func = arguments[-2]
+                    if func in _IMPORT_FUNCTIONS:
+                        append((func, (arguments[-1], -1, [])))
+
+            # import statement: attempt to import module
+            elif kind == _IMPORT:
+                # IMPORT_NAME encodes lazy/eager flags in bits 0-1,
+                # name index in bits 2+.
+                name = names[arg >> 2 if HAS_LAZY else arg]
+                if len(arguments) >= 2:
+                    relative_import_index, from_list = arguments[-2:]
+                else:
+                    relative_import_index = -1
+                    from_list = arguments[0] if arguments else None
+                append(("import", (name, relative_import_index, from_list)))
+
+            # import * statement: copy all global names
+            elif kind == _STAR or (kind == _INTRINSIC and arg == 2):
+                # IMPORT_STAR up to Python 3.11, CALL_INTRINSIC_1 in 3.12+
+                append(("star", ()))
+
+            # store operation: track only top level
+            elif kind == _STORE:
+                append(("store", (names[arg],)))
+
+            # reset arguments; these are only needed for import statements
+            # so ignore them in all other cases!
+            arguments = []
+    return tuple(results)
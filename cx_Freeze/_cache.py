@@ -0,0 +1,209 @@
+"""Internal _cache module - a persistent cache for ModuleFinder."""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import marshal
+import os
+import shutil
+import sys
+from contextlib import suppress
+from importlib.machinery import EXTENSION_SUFFIXES
+from importlib.metadata import PackageNotFoundError, version
+from importlib.util import MAGIC_NUMBER
+from pathlib import Path
+from tempfile import NamedTemporaryFile
+from typing import TYPE_CHECKING, Any
+
+from cx_Freeze._compat import IS_MACOS, IS_MINGW, IS_WINDOWS
+
+if TYPE_CHECKING:
+    from types import CodeType
+
+    from cx_Freeze._typing import StrPath
+
+__all__ = ["DEFAULT_CACHE_MAX_SIZE", "ModuleCache", "default_cache_dir"]
+
+# Increase this value when the format of the cached entries changes.
+CACHE_FORMAT = 1
+
+DEFAULT_CACHE_MAX_SIZE = 512 * 1024 * 1024  # 512 MiB
+
+logger = logging.getLogger(__name__)
+
+
+def default_cache_dir() -> Path:
+    """Return the default directory of the persistent cache.
+
+    It can be changed with the environment variable CX_FREEZE_CACHE_DIR.
+    """
+    cache_dir = os.environ.get("CX_FREEZE_CACHE_DIR")
+    if cache_dir:
+        return Path(cache_dir)
+    if IS_WINDOWS or IS_MINGW:
+        base_dir = (
+            os.environ.get("LOCALAPPDATA")
+            or Path("~/AppData/Local").expanduser()
+        )
+    elif IS_MACOS:
+        base_dir = Path("~/Library/Caches").expanduser()
+    else:
+        base_dir = (
+            os.environ.get("XDG_CACHE_HOME") or Path("~/.cache").expanduser()
+        )
+    return Path(base_dir, "cx_Freeze")
+
+
+class ModuleCache:
+    """A content-addressed, on-disk cache of the analysis of modules.
+
+    Each entry stores the compiled code object of a module (if any) and the
+    list of imports and stored names detected by scanning its code. Entries
+    are keyed by the module path, size and modification time, the Python
+    magic number and the optimization level, so a changed source file or a
+    different interpreter never matches an old entry. The imports of an
+    extension module are read from its stub file, so the size and the
+    modification time of the stub are part of the key too.
+
+    The total size of the cache is limited, and the least recently used
+    entries are evicted first.
+    """
+
+    def __init__(
+        self,
+        path: StrPath | None = None,
+        max_size: int = DEFAULT_CACHE_MAX_SIZE,
+    ) -> None:
+        self.path: Path = Path(path) if path else default_cache_dir()
+        self.max_size: int = max_size
+        self.hits: int = 0
+        self.misses: int = 0
+        try:
+            cx_freeze_version = version("cx_Freeze")
+        except PackageNotFoundError:
+            cx_freeze_version = ""
+        self._salt: bytes = b"\0".join(
+            [
+                str(CACHE_FORMAT).encode(),
+                cx_freeze_version.encode(),
+                sys.implementation.cache_tag.encode(),
+                MAGIC_NUMBER,
+            ]
+        )
+        self._modules_dir: Path = self.path / "modules"
+
+    def _entry(self, filename: StrPath, optimize: int) -> Path | None:
+        """Return the path of the entry for the given file, if stat works."""
+        try:
+            file_stat = os.stat(filename)
+        except OSError:
+            return None
+        name = os.fsdecode(filename)
+        key = hashlib.sha256(self._salt)
+        key.update(
+            f"\0{name}\0{file_stat.st_size}"
+            f"\0{file_stat.st_mtime_ns}\0{optimize}".encode(
+                errors="surrogateescape"
+            )
+        )
+        for suffix in EXTENSION_SUFFIXES:
+            if name.endswith(suffix):
+                stub_file = name.removesuffix(suffix) + ".pyi"
+                try:
+                    stub_stat = os.stat(stub_file)
+                except OSError:
+                    break
+                key.update(
+                    f"\0{stub_stat.st_size}\0{stub_stat.st_mtime_ns}".encode()
+                )
+                break
+        digest = key.hexdigest()
+        return self._modules_dir / digest[:2] / digest
+
+    def get(
+        self, filename: StrPath, optimize: int
+    ) -> tuple[CodeType | None, list[Any] | None] | None:
+        """Return a tuple (code, imports) of the cached file, or None."""
+        entry = self._entry(filename, optimize)
+        if entry is None:
+            return None
+        try:
+            data = entry.read_bytes()
+            code, imports = marshal.loads(data)  # noqa: S302
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except (OSError, EOFError, ValueError, TypeError):
+            # invalid or truncated entry
+            logger.debug("Removing invalid cache entry %s", entry)
+            with suppress(OSError):
+                entry.unlink()
+            self.misses += 1
+            return None
+        # mark the entry as recently used
+        with suppress(OSError):
+            os.utime(entry)
+        self.hits += 1
+        return code, imports
+
+    def contains(self, filename: StrPath, optimize: int) -> bool:
+        """Return True if the file has an entry, without reading it."""
+        entry = self._entry(filename, optimize)
+        return entry is not None and entry.is_file()
+
+    def put(
+        self,
+        filename: StrPath,
+        optimize: int,
+        code: CodeType | None,
+        imports: list[Any] | None,
+    ) -> None:
+        """Store the code and imports of the file in the cache."""
+        entry = self._entry(filename, optimize)
+        if entry is None:
+            return
+        try:
+            data = marshal.dumps((code, imports))
+        except ValueError:
+            # unmarshallable constant used in an import
+            return
+        try:
+            entry.parent.mkdir(parents=True, exist_ok=True)
+            with NamedTemporaryFile(
+                dir=entry.parent, prefix=".tmp-", delete=False
+            ) as tmp:
+                tmp.write(data)
+            os.replace(tmp.name, entry)
+        except OSError as exc:
+            logger.debug("Cannot write cache entry %s: %s", entry, exc)
+            with suppress(OSError, NameError):
+                os.unlink(tmp.name)
+
+    def clear(self) -> None:
+        """Remove all entries of the cache."""
+        shutil.rmtree(self._modules_dir, ignore_errors=True)
+
+    def prune(self) -> None:
+        """Evict the least recently used entries exceeding the size limit."""
+        entries: list[tuple[int, int, Path]] = []
+        total_size = 0
+        for file in self._modules_dir.glob("*/*"):
+            with suppress(OSError):
+                file_stat = file.stat()
+                entries.append(
+                    (file_stat.st_mtime_ns, file_stat.st_size, file)
+                )
+                total_size += file_stat.st_size
+        if total_size <= self.max_size:
+            return
+        # evict down to 80% of the limit to avoid pruning on every build
+        target_size = self.max_size * 4 // 5
+        entries.sort()
+        for _, size, file in entries:
+            if total_size <= target_size:
+                break
+            with suppress(OSError):
+                file.unlink()
+                total_size -= size
+        logger.debug("Cache pruned to %d bytes", total_size)
@@ -0,0 +1,103 @@
+"""Internal _dedupe module - replace identical files with links."""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+__all__ = ["DEDUPLICATE_MODES", "find_duplicates", "link_duplicates"]
+
+DEDUPLICATE_MODES = ("off", "hardlink", "symlink")
+
+# smaller files are not worth a link
+MIN_SIZE = 4096
+
+CHUNK_SIZE = 1024 * 1024
+
+
+def _digest(path: Path) -> str | None:
+    digest = hashlib.sha256()
+    try:
+        with path.open("rb") as file:
+            while chunk := file.read(CHUNK_SIZE):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def find_duplicates(paths: Iterable[Path], jobs: int = 1) -> list[list[Path]]:
+    """Return the groups of files with the same contents.
+
+    The files are grouped by size first, so only the files that have the
+    same size and mode as another file are hashed. Symbolic links, small
+    files and files that are already hard links of each other are ignored.
+    In each group, the file to keep comes first.
+    """
+    # the files are also grouped by their mode, which links share
+    by_size: dict[tuple[int, int], list[Path]] = {}
+    inodes: set[tuple[int, int]] = set()
+    for path in sorted(set(paths)):
+        try:
+            file_stat = path.lstat()
+        except OSError:
+            continue
+        if not stat.S_ISREG(file_stat.st_mode) or file_stat.st_size < MIN_SIZE:
+            continue
+        inode = (file_stat.st_dev, file_stat.st_ino)
+        if inode in inodes:
+            continue
+        inodes.add(inode)
+        key = (file_stat.st_size, stat.S_IMODE(file_stat.st_mode))
+        by_size.setdefault(key, []).append(path)
+    candidates = [
+        path for group in by_size.values() if len(group) > 1 for path in group
+    ]
+    if jobs > 1:
+        with ThreadPoolExecutor(jobs) as executor:
+            digests = list(executor.map(_digest, candidates))
+    else:
+        digests = [_digest(path) for path in candidates]
+    groups: dict[str, list[Path]] = {}
+    for path, digest in zip(candidates, digests, strict=True):
+        if digest is not None:
+            groups.setdefault(digest, []).append(path)
+    return [group for group in groups.values() if len(group) > 1]
+
+
+def link_duplicates(
+    groups: list[list[Path]], mode: str
+) -> tuple[list[Path], int]:
+    """Replace the duplicates by links to the first file of their group.
+
+    The symbolic links are relative, so the build directory can be moved.
+    A file that cannot be replaced, for instance because the file system
+    does not support links, is kept.
+
+    :return: The files replaced and the number of bytes saved.
+    """
+    replaced: list[Path] = []
+    saved = 0
+    for keep, *duplicates in groups:
+        for duplicate in duplicates:
+            size = duplicate.stat().st_size
+            tmp = duplicate.with_name(f".{duplicate.name}.dedupe")
+            try:
+                if mode == "symlink":
+                    tmp.symlink_to(os.path.relpath(keep, duplicate.parent))
+                else:
+                    os.link(keep, tmp)
+                os.replace(tmp, duplicate)
+            except OSError:
+                tmp.unlink(missing_ok=True)
+                continue
+            replaced.append(duplicate)
+            saved += size
+    return replaced, saved
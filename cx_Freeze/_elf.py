@@ -0,0 +1,303 @@
+"""Internal _elf module - read the dynamic section of ELF files."""
+
+from __future__ import annotations
+
+import mmap
+import struct
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from cx_Freeze._typing import StrPath
+
+__all__ = ["ELFFile"]
+
+MAGIC_ELF = b"\x7fELF"
+
+# e_ident
+EI_CLASS = 4
+EI_DATA = 5
+ELFCLASS32 = 1
+ELFCLASS64 = 2
+ELFDATA2LSB = 1
+ELFDATA2MSB = 2
+
+# p_type
+PT_LOAD = 1
+PT_DYNAMIC = 2
+PT_INTERP = 3
+
+# sh_type
+SHT_DYNAMIC = 6
+SHT_DYNSYM = 11
+SHT_GNU_VERDEF = 0x6FFFFFFD
+SHT_GNU_VERNEED = 0x6FFFFFFE
+
+# d_tag
+DT_NULL = 0
+DT_NEEDED = 1
+DT_STRTAB = 5
+DT_SONAME = 14
+DT_RPATH = 15
+DT_RUNPATH = 29
+# entries whose values are offsets in the string table
+DT_STRINGS = {
+    DT_NEEDED,
+    DT_SONAME,
+    DT_RPATH,
+    DT_RUNPATH,
+    0x6FFFFEFA,  # DT_CONFIG
+    0x6FFFFEFB,  # DT_DEPAUDIT
+    0x6FFFFEFC,  # DT_AUDIT
+    0x7FFFFFFD,  # DT_AUXILIARY
+    0x7FFFFFFF,  # DT_FILTER
+}
+
+
+class ELFFile:
+    """Read the entries of the dynamic section of an ELF file.
+
+    Supports 32 and 64-bit files in both endiannesses. The file is mapped in
+    memory and only the headers and the dynamic section are read.
+
+    :param filename: The ELF file to read.
+    :raises OSError: When the file cannot be read.
+    :raises ValueError: When the file is not a valid ELF file.
+    """
+
+    def __init__(self, filename: StrPath) -> None:
+        self.filename: StrPath = filename
+        # the class and the machine, to match the libraries that can be used
+        self.elf_class: int = 0
+        self.machine: int = 0
+        self.interpreter: str | None = None
+        self.needed: list[str] = []
+        self.rpath: str | None = None
+        self.runpath: str | None = None
+        self.soname: str | None = None
+        # used to modify the file
+        self._order: str = "<"
+        self._is_64: bool = True
+        self._shoff: int = 0
+        self._shentsize: int = 0
+        self._shnum: int = 0
+        self._strtab: int | None = None
+        self._strings: list[tuple[int, int, int]] = []
+        with (
+            open(filename, "rb") as file,
+            mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data,
+        ):
+            try:
+                self._parse(data)
+            except (IndexError, struct.error):
+                msg = "truncated ELF file"
+                raise ValueError(msg) from None
+
+    def _parse(self, data: mmap.mmap) -> None:
+        if data[:4] != MAGIC_ELF:
+            msg = "not an ELF file"
+            raise ValueError(msg)
+        elf_class = data[EI_CLASS]
+        elf_data = data[EI_DATA]
+        if elf_data == ELFDATA2LSB:
+            order = "<"
+        elif elf_data == ELFDATA2MSB:
+            order = ">"
+        else:
+            msg = f"invalid ELF data encoding: {elf_data}"
+            raise ValueError(msg)
+        if elf_class == ELFCLASS64:
+            # e_phoff, e_phentsize and e_phnum
+            phoff, shoff = struct.unpack_from(f"{order}QQ", data, 0x20)
+            phentsize, phnum, shentsize, shnum = struct.unpack_from(
+                f"{order}HHHH", data, 0x36
+            )
+            # p_type, p_offset, p_vaddr and p_filesz
+            phdr = struct.Struct(f"{order}I4xQQ8xQ")
+            dyn = struct.Struct(f"{order}qQ")
+        elif elf_class == ELFCLASS32:
+            phoff, shoff = struct.unpack_from(f"{order}II", data, 0x1C)
+            phentsize, phnum, shentsize, shnum = struct.unpack_from(
+                f"{order}HHHH", data, 0x2A
+            )
+            phdr = struct.Struct(f"{order}III4xI")
+            dyn = struct.Struct(f"{order}iI")
+        else:
+            msg = f"invalid ELF class: {elf_class}"
+            raise ValueError(msg)
+        (self.machine,) = struct.unpack_from(f"{order}H", data, 0x12)
+        self.elf_class = elf_class
+        self._order = order
+        self._is_64 = elf_class == ELFCLASS64
+        self._shoff = shoff
+        self._shentsize = shentsize
+        self._shnum = shnum
+
+        # read the program headers
+        loads: list[tuple[int, int, int]] = []
+        dynamic: tuple[int, int] | None = None
+        for i in range(phnum):
+            p_type, p_offset, p_vaddr, p_filesz = phdr.unpack_from(
+                data, phoff + i * phentsize
+            )
+            if p_type == PT_LOAD:
+                loads.append((p_vaddr, p_offset, p_filesz))
+            elif p_type == PT_DYNAMIC:
+                dynamic = (p_offset, p_filesz)
+            elif p_type == PT_INTERP:
+                interpreter = data[p_offset : p_offset + p_filesz]
+                self.interpreter = interpreter.rstrip(b"\0").decode(
+                    errors="surrogateescape"
+                )
+        if dynamic is None:
+            # static executable
+            return
+
+        # read the dynamic section
+        entries: list[tuple[int, int, int]] = []
+        strtab = None
+        offset, size = dynamic
+        for pos in range(offset, offset + size - dyn.size + 1, dyn.size):
+            d_tag, d_val = dyn.unpack_from(data, pos)
+            if d_tag == DT_NULL:
+                break
+            if d_tag == DT_STRTAB:
+                strtab = d_val
+            elif d_tag in DT_STRINGS:
+                entries.append((d_tag, d_val, pos))
+        if strtab is None:
+            return
+
+        # the string table address is converted to a file offset
+        for p_vaddr, p_offset, p_filesz in loads:
+            if p_vaddr <= strtab < p_vaddr + p_filesz:
+                strtab = strtab - p_vaddr + p_offset
+                break
+        else:
+            msg = "string table not found"
+            raise ValueError(msg)
+        self._strtab = strtab
+        self._strings = entries
+
+        for d_tag, d_val, _ in entries:
+            start = strtab + d_val
+            end = data.find(b"\0", start)
+            if end < 0:
+                msg = "invalid string table"
+                raise ValueError(msg)
+            value = data[start:end].decode(errors="surrogateescape")
+            if d_tag == DT_NEEDED:
+                self.needed.append(value)
+            elif d_tag == DT_SONAME:
+                self.soname = value
+            elif d_tag == DT_RPATH:
+                self.rpath = value
+            elif d_tag == DT_RUNPATH:
+                self.runpath = value
+
+    def set_rpath(self, rpath: str) -> bool:
+        """Overwrite the rpath in place, like patchelf does using DT_RUNPATH.
+
+        This is only possible if the new rpath fits in the space used by the
+        old one in the string table, and that space is not shared with other
+        strings. Returns False if the file was not modified.
+        """
+        strtab = self._strtab
+        entries = [e for e in self._strings if e[0] in (DT_RPATH, DT_RUNPATH)]
+        if strtab is None or len(entries) != 1:
+            return False
+        d_tag, d_val, pos = entries[0]
+        value = rpath.encode(errors="surrogateescape")
+        start = strtab + d_val
+        with (
+            open(self.filename, "r+b") as file,
+            mmap.mmap(file.fileno(), 0) as data,
+        ):
+            end = data.find(b"\0", start)
+            if end < 0 or len(value) > end - start:
+                return False
+            try:
+                refs = self._string_references(data)
+            except (IndexError, struct.error):
+                return False
+            if refs is None:
+                return False
+            # tail merged strings share the same terminator
+            refs.extend(strtab + e[1] for e in self._strings if e[2] != pos)
+            for ref in refs:
+                if ref <= end and data.find(b"\0", ref) >= start:
+                    return False
+            data[start:end] = value.ljust(end - start, b"\0")
+            if d_tag == DT_RPATH:
+                dyn = f"{self._order}qQ" if self._is_64 else f"{self._order}iI"
+                struct.pack_into(dyn, data, pos, DT_RUNPATH, d_val)
+        self.rpath = None
+        self.runpath = rpath
+        return True
+
+    def _string_references(self, data: mmap.mmap) -> list[int] | None:
+        """Return the offsets of the strings used by the other sections.
+
+        Returns None if they cannot be determined.
+        """
+        if self._shoff == 0 or self._shnum == 0:
+            return None
+        order = self._order
+        if self._is_64:
+            # sh_type, sh_offset, sh_size, sh_link, sh_info and sh_entsize
+            shdr = struct.Struct(f"{order}4xI16xQQII8xQ")
+        else:
+            shdr = struct.Struct(f"{order}4xI8xIIII4xI")
+        sections = [
+            shdr.unpack_from(data, self._shoff + i * self._shentsize)
+            for i in range(self._shnum)
+        ]
+        dynstr = [i for i, s in enumerate(sections) if s[1] == self._strtab]
+        refs: list[int] = []
+        for (
+            sh_type,
+            sh_offset,
+            sh_size,
+            sh_link,
+            sh_info,
+            sh_entsize,
+        ) in sections:
+            if sh_link not in dynstr or sh_type == SHT_DYNAMIC:
+                continue
+            strtab = sections[sh_link][1]
+            if sh_type == SHT_DYNSYM and sh_entsize:
+                for pos in range(sh_offset, sh_offset + sh_size, sh_entsize):
+                    (st_name,) = struct.unpack_from(f"{order}I", data, pos)
+                    refs.append(strtab + st_name)
+            elif sh_type == SHT_GNU_VERNEED:
+                pos = sh_offset
+                for _ in range(sh_info):
+                    vn_cnt, vn_file, vn_aux, vn_next = struct.unpack_from(
+                        f"{order}2xHIII", data, pos
+                    )
+                    refs.append(strtab + vn_file)
+                    aux = pos + vn_aux
+                    for _ in range(vn_cnt):
+                        vna_name, vna_next = struct.unpack_from(
+                            f"{order}8xII", data, aux
+                        )
+                        refs.append(strtab + vna_name)
+                        aux += vna_next
+                    pos += vn_next
+            elif sh_type == SHT_GNU_VERDEF:
+                pos = sh_offset
+                for _ in range(sh_info):
+                    vd_cnt, vd_aux, vd_next = struct.unpack_from(
+                        f"{order}6xH4xII", data, pos
+                    )
+                    aux = pos + vd_aux
+                    for _ in range(vd_cnt):
+                        vda_name, vda_next = struct.unpack_from(
+                            f"{order}II", data, aux
+                        )
+                        refs.append(strtab + vda_name)
+                        aux += vda_next
+                    pos += vd_next
+            else:
+                # unknown use of the string table
+                return None
+        return refs
@@ -0,0 +1,156 @@
+"""Internal _graph module - the dependency graph of the frozen modules."""
+
+from __future__ import annotations
+
+import json
+from collections import deque
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+from xml.etree import ElementTree as ET
+
+if TYPE_CHECKING:
+    from cx_Freeze._typing import StrPath
+
+__all__ = ["ROOT", "ImportGraph"]
+
+# the source of the edges added by the options of the freezer
+ROOT = "<build>"
+
+GRAPHML_NAMESPACE = "http://graphml.graphdrawing.org/xmlns"
+NS = f"{{{GRAPHML_NAMESPACE}}}"
+
+
+class ImportGraph:
+    """A directed graph of modules and binary files.
+
+    Each edge records the reason of the dependency, for instance:
+
+    - import: an import statement found in the bytecode;
+    - __import__ or import_module: a call with a constant name;
+    - stub: an import found in the stub (.pyi) of an extension module;
+    - hook: a module included by the hook of the source module;
+    - parent: the package of a submodule;
+    - alias: the module imported instead of the source module;
+    - package: a submodule included with its package;
+    - includes, packages or script: a module included by the options;
+    - libs: a library bundled with the distribution of a package;
+    - extension: the file of an extension module;
+    - DT_NEEDED, LC_LOAD_DYLIB or PE import: a dependency of a binary file.
+    """
+
+    def __init__(self) -> None:
+        self.nodes: dict[str, dict[str, Any]] = {}
+        self.edges: dict[tuple[str, str, str], None] = {}
+
+    def add_node(self, node: str, **attrs: Any) -> None:
+        """Add a node, or update the attributes of an existing node."""
+        self.nodes.setdefault(node, {}).update(attrs)
+
+    def add_edge(self, source: str | None, target: str, reason: str) -> None:
+        """Add an edge; a source of None means the options of the freezer."""
+        if source is None:
+            source = ROOT
+        if source != target:
+            self.edges[source, target, reason] = None
+
+    def import_chains(self) -> dict[str, list[str]]:
+        """Return the shortest chain of dependencies to each node.
+
+        The chains start at the nodes included by the options.
+        """
+        successors: dict[str, list[str]] = {}
+        for source, target, _ in self.edges:
+            successors.setdefault(source, []).append(target)
+        chains: dict[str, list[str]] = {ROOT: []}
+        queue = deque([ROOT])
+        while queue:
+            node = queue.popleft()
+            chain = chains[node]
+            for target in successors.get(node, ()):
+                if target not in chains:
+                    chains[target] = [*chain, target]
+                    queue.append(target)
+        return chains
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the graph in the node-link format."""
+        nodes = dict.fromkeys(node for edge in self.edges for node in edge[:2])
+        nodes.update(dict.fromkeys(self.nodes))
+        return {
+            "directed": True,
+            "multigraph": True,
+            "nodes": [
+                {"id": node, **self.nodes.get(node, {})} for node in nodes
+            ],
+            "edges": [
+                {"source": source, "target": target, "reason": reason}
+                for source, target, reason in self.edges
+            ],
+        }
+
+    def to_graphml(self) -> ET.ElementTree:
+        """Return the graph as a GraphML document."""
+        data = self.to_dict()
+        ET.register_namespace("", GRAPHML_NAMESPACE)
+        root = ET.Element(f"{NS}graphml")
+        keys: dict[str, str] = {}
+        for node in data["nodes"]:
+            for key, value in node.items():
+                if key != "id" and key not in keys:
+                    keys[key] = "long" if isinstance(value, int) else "string"
+        for key, attr_type in keys.items():
+            ET.SubElement(
+                root,
+                f"{NS}key",
+                {
+                    "id": key,
+                    "for": "node",
+                    "attr.name": key,
+                    "attr.type": attr_type,
+                },
+            )
+        ET.SubElement(
+            root,
+            f"{NS}key",
+            {
+                "id": "reason",
+                "for": "edge",
+                "attr.name": "reason",
+                "attr.type": "string",
+            },
+        )
+        graph = ET.SubElement(
+            root,
+            f"{NS}graph",
+            {"id": "G", "edgedefault": "directed"},
+        )
+        for node in data["nodes"]:
+            element = ET.SubElement(graph, f"{NS}node", {"id": node["id"]})
+            for key, value in node.items():
+                if key != "id" and value is not None:
+                    item = ET.SubElement(element, f"{NS}data", {"key": key})
+                    item.text = str(value)
+        for edge in data["edges"]:
+            element = ET.SubElement(
+                graph,
+                f"{NS}edge",
+                {"source": edge["source"], "target": edge["target"]},
+            )
+            item = ET.SubElement(element, f"{NS}data", {"key": "reason"})
+            item.text = edge["reason"]
+        tree = ET.ElementTree(root)
+        ET.indent(tree)
+        return tree
+
+    def write(self, filename: StrPath) -> None:
+        """Write the graph, in GraphML if the suffix is .graphml or JSON."""
+        filename = Path(filename)
+        filename.parent.mkdir(parents=True, exist_ok=True)
+        if filename.suffix.lower() == ".graphml":
+            self.to_graphml().write(
+                filename, encoding="utf-8", xml_declaration=True
+            )
+        else:
+            with filename.open("w", encoding="utf-8") as file:
+                json.dump(self.to_dict(), file, indent=1)
+                file.write("\n")
@@ -0,0 +1,117 @@
+"""Internal _importindex module - find the modules of a frozen application.
+
+This module is included in the frozen application as _cx_freeze_index and is
+imported at the end of the init module. It installs a meta path finder that
+locates the modules using an index created by the freezer, instead of
+searching the zip file and the directories in sys.path for each import.
+"""
+
+from __future__ import annotations
+
+import marshal
+import os
+import sys
+from _frozen_importlib_external import (
+    ExtensionFileLoader,
+    PathFinder,
+    SourcelessFileLoader,
+    spec_from_file_location,
+)
+from typing import TYPE_CHECKING
+from zipimport import zipimporter
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from importlib.machinery import ModuleSpec
+    from types import ModuleType
+
+__all__ = ["INDEX_FILENAME", "INDEX_MODULE", "IndexFinder"]
+
+INDEX_MODULE = "_cx_freeze_index"
+INDEX_FILENAME = f"{INDEX_MODULE}.dat"
+
+# flags of the entries of the index
+IS_PACKAGE = 1
+IS_EXTENSION = 2
+IN_ZIP = 4
+
+
+class IndexFinder:
+    """A meta path finder for the modules stored in the index.
+
+    The index maps the name of each module to its location, relative to the
+    zip file (IN_ZIP) or to the lib directory, and its flags. Modules that
+    are not in the index are left to the other finders.
+    """
+
+    def __init__(
+        self,
+        index: dict[str, tuple[str, int]],
+        lib_dir: str,
+        library: str | None = None,
+    ) -> None:
+        self.index: dict[str, tuple[str, int]] = index
+        self.lib_dir: str = lib_dir
+        self.library: str | None = library
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Sequence[str] | None = None,  # noqa: ARG002
+        target: ModuleType | None = None,  # noqa: ARG002
+    ) -> ModuleSpec | None:
+        """Return the spec of the module, or None if it is not indexed."""
+        try:
+            location, flags = self.index[fullname]
+        except KeyError:
+            return None
+        if flags & IN_ZIP:
+            if self.library is None:
+                return None
+            # the zip importer of the parent package, as used by PathFinder
+            key = os.sep.join([self.library, *fullname.split(".")[:-1]])
+            importer = sys.path_importer_cache.get(key)
+            if not isinstance(importer, zipimporter):
+                importer = zipimporter(key)
+                sys.path_importer_cache[key] = importer
+            return importer.find_spec(fullname)
+        filename = os.path.join(self.lib_dir, *location.split("/"))
+        if flags & IS_EXTENSION:
+            loader = ExtensionFileLoader(fullname, filename)
+        else:
+            loader = SourcelessFileLoader(fullname, filename)
+        return spec_from_file_location(
+            fullname,
+            filename,
+            loader=loader,
+            submodule_search_locations=(
+                [os.path.dirname(filename)] if flags & IS_PACKAGE else None
+            ),
+        )
+
+
+def install() -> None:
+    """Read the index and install the finder before PathFinder."""
+    loader = globals().get("__loader__")
+    if isinstance(loader, zipimporter):
+        library = loader.archive
+        lib_dir = os.path.dirname(library)
+        filename = os.path.join(library, INDEX_FILENAME)
+    else:
+        library = None
+        lib_dir = os.path.dirname(__file__)
+        filename = os.path.join(lib_dir, INDEX_FILENAME)
+    try:
+        index = marshal.loads(loader.get_data(filename))  # noqa: S302
+    except (AttributeError, OSError, ValueError):
+        return
+    finder = IndexFinder(index, lib_dir, library)
+    try:
+        position = sys.meta_path.index(PathFinder)
+    except ValueError:
+        position = len(sys.meta_path)
+    sys.meta_path.insert(position, finder)
+
+
+if __name__ == INDEX_MODULE:
+    install()
@@ -0,0 +1,233 @@
+"""Internal _importtime module - profile the imports of a frozen application.
+
+This module is included in the frozen application as _cx_freeze_importtime
+and is imported at the end of the init module. If the environment variable
+CXFREEZE_IMPORTTIME is set, it installs ImportProfiler, which records the
+time spent executing each module imported after it, the loader used and
+the bytes read, as well as the distribution of the module, read from the
+metadata written by the freezer.
+
+At exit, the records are written to stderr in the format of
+``python -X importtime``, or to a file in the Chrome trace format if the
+value of the variable is a path ending with ``.json``.
+"""
+
+from __future__ import annotations
+
+import atexit
+import marshal
+import os
+import sys
+from _thread import get_ident
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
+from zipimport import zipimporter
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from importlib.machinery import ModuleSpec
+    from types import ModuleType
+
+__all__ = [
+    "ENVIRONMENT_VARIABLE",
+    "IMPORTTIME_FILENAME",
+    "IMPORTTIME_MODULE",
+    "ImportProfiler",
+]
+
+IMPORTTIME_MODULE = "_cx_freeze_importtime"
+IMPORTTIME_FILENAME = f"{IMPORTTIME_MODULE}.dat"
+ENVIRONMENT_VARIABLE = "CXFREEZE_IMPORTTIME"
+
+LOADER_KINDS = {
+    "zipimporter": "zip",
+    "SourceFileLoader": "filesystem",
+    "SourcelessFileLoader": "filesystem",
+    "ExtensionFileLoader": "extension",
+    "ArchiveFinder": "mmap",
+    "BuiltinImporter": "builtin",
+    "FrozenImporter": "frozen",
+    "LazyLoader": "lazy",
+}
+
+
+def loader_kind(loader: Any) -> str:
+    """Return the kind of the loader: zip, filesystem, extension, etc."""
+    if isinstance(loader, type):  # BuiltinImporter and FrozenImporter
+        name = loader.__name__
+    else:
+        name = type(loader).__name__
+    return LOADER_KINDS.get(name, name)
+
+
+class _TimedLoader:
+    """Measure the execution of a module by its loader."""
+
+    def __init__(
+        self, profiler: ImportProfiler, name: str, loader: Any
+    ) -> None:
+        self.profiler = profiler
+        self.name = name
+        self.loader = loader
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.loader, name)
+
+    def create_module(self, spec: ModuleSpec) -> ModuleType | None:
+        return self.loader.create_module(spec)
+
+    def exec_module(self, module: ModuleType) -> None:
+        # the module sees its own loader, as with LazyLoader
+        module.__spec__.loader = self.loader
+        module.__loader__ = self.loader
+        profiler = self.profiler
+        stack = profiler.enter()
+        start = perf_counter()
+        try:
+            self.loader.exec_module(module)
+        finally:
+            profiler.leave(stack, self.name, self.loader, start)
+
+
+class ImportProfiler:
+    """A meta path finder that records the import time of the modules.
+
+    The spec of a module is found by the finders that follow it in
+    sys.meta_path, and its loader is wrapped to measure the execution of the
+    module. The time of the imports nested in a module is counted in its
+    cumulative time but not in its self time.
+
+    :param metadata: The distribution and the size of each module.
+    """
+
+    def __init__(self, metadata: dict[str, tuple[str, int]]) -> None:
+        self.metadata: dict[str, tuple[str, int]] = metadata
+        self.records: list[dict[str, Any]] = []
+        self.origin: float = perf_counter()
+        # the time of the nested imports, for each thread
+        self._stacks: dict[int, list[float]] = {}
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Sequence[str] | None = None,
+        target: ModuleType | None = None,
+    ) -> ModuleSpec | None:
+        """Return the spec of the module, with a loader that measures it."""
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        if hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(self, fullname, spec.loader)
+        return spec
+
+    def enter(self) -> list[float]:
+        """Start measuring a module and return the stack of the thread."""
+        stack = self._stacks.setdefault(get_ident(), [])
+        stack.append(0.0)
+        return stack
+
+    def leave(
+        self, stack: list[float], name: str, loader: Any, start: float
+    ) -> None:
+        """Record the time of a module."""
+        cumulative = perf_counter() - start
+        nested = stack.pop()
+        if stack:
+            stack[-1] += cumulative
+        distribution, size = self.metadata.get(name, ("", 0))
+        self.records.append(
+            {
+                "name": name,
+                "start": start - self.origin,
+                "self": cumulative - nested,
+                "cumulative": cumulative,
+                "depth": len(stack),
+                "thread": get_ident(),
+                "loader": loader_kind(loader),
+                "bytes": size,
+                "distribution": distribution,
+            }
+        )
+
+    def print_report(self, file: Any = None) -> None:
+        """Print the records in the format of python -X importtime."""
+        file = sys.stderr if file is None else file
+        print(
+            "import time: self [us] | cumulative | loader | bytes "
+            "| distribution | imported package",
+            file=file,
+        )
+        for record in self.records:
+            print(
+                f"import time: {record['self'] * 1e6:9.0f}"
+                f" | {record['cumulative'] * 1e6:10.0f}"
+                f" | {record['loader']:>10} | {record['bytes']:>9}"
+                f" | {record['distribution'] or '-':<16} |"
+                f" {'  ' * record['depth']}{record['name']}",
+                file=file,
+            )
+
+    def to_trace(self) -> dict[str, Any]:
+        """Return the records in the Chrome trace format."""
+        pid = os.getpid()
+        return {
+            "traceEvents": [
+                {
+                    "name": record["name"],
+                    "cat": record["loader"],
+                    "ph": "X",
+                    "ts": record["start"] * 1e6,
+                    "dur": record["cumulative"] * 1e6,
+                    "pid": pid,
+                    "tid": record["thread"],
+                    "args": {
+                        "self_us": record["self"] * 1e6,
+                        "bytes": record["bytes"],
+                        "distribution": record["distribution"],
+                    },
+                }
+                for record in self.records
+            ],
+            "displayTimeUnit": "ms",
+        }
+
+    def report(self, destination: str) -> None:
+        """Stop profiling and write the report to its destination."""
+        if self in sys.meta_path:
+            sys.meta_path.remove(self)
+        if destination.lower().endswith(".json"):
+            import json  # noqa: PLC0415
+
+            with open(destination, "w", encoding="utf-8") as file:
+                json.dump(self.to_trace(), file)
+        else:
+            self.print_report()
+
+
+def install() -> None:
+    """Install the profiler if the environment variable is set."""
+    destination = os.environ.get(ENVIRONMENT_VARIABLE, "")
+    if destination in ("", "0"):
+        return
+    loader = globals().get("__loader__")
+    if isinstance(loader, zipimporter):
+        filename = os.path.join(loader.archive, IMPORTTIME_FILENAME)
+    else:
+        filename = os.path.join(os.path.dirname(__file__), IMPORTTIME_FILENAME)
+    try:
+        metadata = marshal.loads(loader.get_data(filename))  # noqa: S302
+    except (AttributeError, OSError, ValueError):
+        metadata = {}
+    profiler = ImportProfiler(metadata)
+    sys.meta_path.insert(0, profiler)
+    atexit.register(profiler.report, destination)
+
+
+if __name__ == IMPORTTIME_MODULE:
+    install()
@@ -0,0 +1,102 @@
+"""Internal _lazy module - load the selected modules on first use.
+
+This module is included in the frozen application as _cx_freeze_lazy and is
+imported at the end of the init module. It reads the names of the modules
+selected by the freezer and defers their execution until one of their
+attributes is used. On Python 3.15+ the native lazy imports (:pep:`810`) are
+used for the imports at the top level of the modules; on older versions,
+LazyFinder wraps the loaders of the selected modules with LazyLoader.
+"""
+
+from __future__ import annotations
+
+import marshal
+import os
+import sys
+from _frozen_importlib_external import ExtensionFileLoader
+from importlib.util import LazyLoader
+from typing import TYPE_CHECKING
+from zipimport import zipimporter
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+    from importlib.machinery import ModuleSpec
+    from types import ModuleType
+
+__all__ = ["LAZY_FILENAME", "LAZY_MODULE", "LazyFinder"]
+
+LAZY_MODULE = "_cx_freeze_lazy"
+LAZY_FILENAME = f"{LAZY_MODULE}.dat"
+
+
+class LazyFinder:
+    """A meta path finder that makes the selected modules lazy.
+
+    The spec of a module is found by the finders that follow it in
+    sys.meta_path; if the module, or one of its parent packages, was
+    selected, its loader is wrapped with LazyLoader. Extension modules are
+    always loaded eagerly.
+    """
+
+    def __init__(self, names: Iterable[str]) -> None:
+        self.names: frozenset[str] = frozenset(names)
+
+    def is_lazy(self, fullname: str) -> bool:
+        """Return True if the module or one of its packages was selected."""
+        name = fullname
+        while name not in self.names:
+            name, _, child = name.rpartition(".")
+            if not child or not name:
+                return False
+        return True
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Sequence[str] | None = None,
+        target: ModuleType | None = None,
+    ) -> ModuleSpec | None:
+        """Return the spec of the module, with a lazy loader if selected."""
+        if not self.is_lazy(fullname):
+            return None
+        for finder in sys.meta_path:
+            if finder is self or not hasattr(finder, "find_spec"):
+                continue
+            spec = finder.find_spec(fullname, path, target)
+            if spec is not None:
+                break
+        else:
+            return None
+        loader = spec.loader
+        if hasattr(loader, "exec_module") and not isinstance(
+            loader, ExtensionFileLoader
+        ):
+            spec.loader = LazyLoader(loader)
+        return spec
+
+
+def install() -> None:
+    """Read the selected modules and make them lazy."""
+    loader = globals().get("__loader__")
+    if isinstance(loader, zipimporter):
+        filename = os.path.join(loader.archive, LAZY_FILENAME)
+    else:
+        filename = os.path.join(os.path.dirname(__file__), LAZY_FILENAME)
+    try:
+        names = marshal.loads(loader.get_data(filename))  # noqa: S302
+    except (AttributeError, OSError, ValueError):
+        return
+    finder = LazyFinder(names)
+    set_lazy_imports = getattr(sys, "set_lazy_imports", None)
+    set_lazy_imports_filter = getattr(sys, "set_lazy_imports_filter", None)
+    if set_lazy_imports is not None and set_lazy_imports_filter is not None:
+        set_lazy_imports_filter(
+            lambda _importer, name, _fromlist: finder.is_lazy(name)
+        )
+        set_lazy_imports("all")
+    else:
+        sys.meta_path.insert(0, finder)
+
+
+if __name__ == LAZY_MODULE:
+    install()
@@ -0,0 +1,183 @@
+"""Internal _manifest module - the record of an incremental build."""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import shutil
+import sys
+from contextlib import suppress
+from importlib.metadata import PackageNotFoundError, version
+from tempfile import NamedTemporaryFile
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+__all__ = ["BuildManifest"]
+
+# Increase this value when the format of the manifest changes.
+MANIFEST_FORMAT = 1
+
+logger = logging.getLogger(__name__)
+
+
+class BuildManifest:
+    """Record of the files emitted in the build directory.
+
+    Before an incremental build starts, the previous build directory is moved
+    aside. Files whose source has not changed since the previous build (and
+    that were not touched after it) are moved back instead of being copied
+    again, and files that are not emitted anymore are removed together with
+    the previous build directory.
+
+    The manifest is stored next to the build directory, so it is not shipped
+    with the frozen application.
+    """
+
+    def __init__(self, target_dir: Path) -> None:
+        self.target_dir: Path = target_dir
+        self.path: Path = target_dir.with_name(f"{target_dir.name}.manifest")
+        self.previous_dir: Path = target_dir.with_name(
+            f"{target_dir.name}.previous"
+        )
+        self.library: tuple[Path, str] | None = None
+        self._files: dict[Path, Path] = {}
+        self._previous_files: dict[str, list[Any]] = {}
+        self._previous_library: list[Any] | None = None
+        try:
+            cx_freeze_version = version("cx_Freeze")
+        except PackageNotFoundError:
+            cx_freeze_version = ""
+        self._version: str = f"{cx_freeze_version} {sys.version}"
+
+    def prepare(self) -> None:
+        """Move the previous build aside, or clean it if it can't be used."""
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data["format"] != MANIFEST_FORMAT:
+                data = {}
+            elif data["version"] != self._version:
+                # a clean build is required when cx_Freeze or Python changes
+                data = {}
+        except (OSError, ValueError, KeyError, TypeError):
+            data = {}
+        self._previous_files = data.get("files", {})
+        self._previous_library = data.get("library")
+
+        target_dir = self.target_dir
+        if self.previous_dir.is_dir():
+            # the last build was interrupted, use the same previous build
+            if target_dir.is_dir():
+                shutil.rmtree(target_dir)
+        elif target_dir.is_dir():
+            if self._previous_files:
+                target_dir.rename(self.previous_dir)
+            else:
+                shutil.rmtree(target_dir)
+
+    def _relative(self, target: Path) -> str | None:
+        try:
+            return target.relative_to(self.target_dir).as_posix()
+        except ValueError:
+            return None
+
+    def _restore(self, name: str, target: Path, entry: list[Any]) -> bool:
+        previous = self.previous_dir / name
+        try:
+            target_stat = previous.stat()
+        except OSError:
+            return False
+        if entry[-2:] != [target_stat.st_size, target_stat.st_mtime_ns]:
+            return False
+        try:
+            target.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(previous, target)
+        except OSError as exc:
+            logger.debug("Cannot restore %s: %s", target, exc)
+            return False
+        return True
+
+    def restore(self, source: Path, target: Path) -> bool:
+        """Move back the target of an unchanged source, if possible.
+
+        Returns True if the file does not need to be copied.
+        """
+        name = self._relative(target)
+        entry = self._previous_files.get(name) if name else None
+        if entry is None:
+            return False
+        try:
+            source_stat = source.stat()
+        except OSError:
+            return False
+        source_entry = [
+            os.fspath(source),
+            source_stat.st_size,
+            source_stat.st_mtime_ns,
+        ]
+        if entry[:3] != source_entry:
+            return False
+        return self._restore(name, target, entry)
+
+    def restore_library(self, target: Path, digest: str) -> bool:
+        """Move back the zip file if its contents are unchanged."""
+        name = self._relative(target)
+        entry = self._previous_library
+        if name is None or entry is None or entry[:2] != [name, digest]:
+            return False
+        return self._restore(name, target, entry)
+
+    def record(self, source: Path, target: Path) -> None:
+        """Record a file copied (or restored) to the build directory."""
+        self._files[target] = source
+
+    def discard(self, target: Path) -> None:
+        """Do not reuse this file in the next build."""
+        self._files.pop(target, None)
+
+    def save(self) -> None:
+        """Write the manifest and remove the stale outputs."""
+        files: dict[str, list[Any]] = {}
+        for target, source in self._files.items():
+            name = self._relative(target)
+            if name is None:
+                continue
+            with suppress(OSError):
+                source_stat = source.stat()
+                target_stat = target.stat()
+                files[name] = [
+                    os.fspath(source),
+                    source_stat.st_size,
+                    source_stat.st_mtime_ns,
+                    target_stat.st_size,
+                    target_stat.st_mtime_ns,
+                ]
+        data: dict[str, Any] = {
+            "format": MANIFEST_FORMAT,
+            "version": self._version,
+            "files": files,
+        }
+        if self.library:
+            target, digest = self.library
+            name = self._relative(target)
+            with suppress(OSError):
+                target_stat = target.stat()
+                data["library"] = [
+                    name,
+                    digest,
+                    target_stat.st_size,
+                    target_stat.st_mtime_ns,
+                ]
+        with NamedTemporaryFile(
+            "w",
+            encoding="utf-8",
+            dir=self.path.parent,
+            prefix=".tmp-",
+            delete=False,
+        ) as tmp:
+            json.dump(data, tmp, sort_keys=True)
+        os.replace(tmp.name, self.path)
+        # stale outputs
+        shutil.rmtree(self.previous_dir, ignore_errors=True)
@@ -0,0 +1,64 @@
+"""Internal _optional module - find the modules left out by tree shaking.
+
+The submodules that were only included by a blanket include_package, and
+that the application never imports statically, can be stored in a side zip
+file instead of library.zip. This module is included in the frozen
+application as _cx_freeze_optional and is imported at the end of the init
+module, installing OptionalFinder after the other finders, so the side zip
+file is only opened if a module is not found anywhere else.
+"""
+
+from __future__ import annotations
+
+import os
+import sys
+from typing import TYPE_CHECKING
+from zipimport import ZipImportError, zipimporter
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from importlib.machinery import ModuleSpec
+    from types import ModuleType
+
+__all__ = ["OPTIONAL_FILENAME", "OPTIONAL_MODULE", "OptionalFinder"]
+
+OPTIONAL_MODULE = "_cx_freeze_optional"
+OPTIONAL_FILENAME = "optional.zip"
+
+
+class OptionalFinder:
+    """A meta path finder for the modules stored in the side zip file."""
+
+    def __init__(self, archive: str) -> None:
+        self.archive: str = archive
+
+    def find_spec(
+        self,
+        fullname: str,
+        path: Sequence[str] | None = None,  # noqa: ARG002
+        target: ModuleType | None = None,  # noqa: ARG002
+    ) -> ModuleSpec | None:
+        """Return the spec of the module, or None if it is not stored."""
+        # the zip importer of the parent package, as used by PathFinder
+        key = os.sep.join([self.archive, *fullname.split(".")[:-1]])
+        importer = sys.path_importer_cache.get(key)
+        if not isinstance(importer, zipimporter):
+            try:
+                importer = zipimporter(key)
+            except ZipImportError:
+                return None
+            sys.path_importer_cache[key] = importer
+        return importer.find_spec(fullname)
+
+
+def install() -> None:
+    """Install the finder of the side zip file in the lib directory."""
+    loader = globals().get("__loader__")
+    lib_dir = os.path.dirname(getattr(loader, "archive", None) or __file__)
+    archive = os.path.join(lib_dir, OPTIONAL_FILENAME)
+    if os.path.isfile(archive):
+        sys.meta_path.append(OptionalFinder(archive))
+
+
+if __name__ == OPTIONAL_MODULE:
+    install()
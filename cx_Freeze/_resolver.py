@@ -0,0 +1,167 @@
+"""Internal _resolver module - find module specs in the search path."""
+
+from __future__ import annotations
+
+import os
+import sys
+from importlib.machinery import (
+    BYTECODE_SUFFIXES,
+    EXTENSION_SUFFIXES,
+    SOURCE_SUFFIXES,
+    ExtensionFileLoader,
+    FileFinder,
+    ModuleSpec,
+    PathFinder,
+    SourceFileLoader,
+    SourcelessFileLoader,
+)
+from importlib.util import spec_from_file_location
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from importlib.abc import PathEntryFinder
+
+    from cx_Freeze._typing import StrPath
+
+__all__ = ["SpecResolver"]
+
+# the same order used by FileFinder
+LOADERS: list[tuple[type, list[str]]] = [
+    (ExtensionFileLoader, EXTENSION_SUFFIXES),
+    (SourceFileLoader, SOURCE_SUFFIXES),
+    (SourcelessFileLoader, BYTECODE_SUFFIXES),
+]
+
+
+class SpecResolver:
+    """Find the spec of modules like PathFinder, using memoized listings.
+
+    PathFinder keeps the listing of each directory, but it must be
+    invalidated before each search to see the changes made in the file
+    system. This resolver lists each directory of the search path only once,
+    so a directory can be added to the search path at any time without
+    invalidating the others. The directories in which files are created
+    during the freeze process (volatile) are listed on each search.
+
+    Only the entries that the import system searches using a FileFinder are
+    listed; the others (zip files, or entries handled by a custom path hook)
+    are searched using PathFinder.
+    """
+
+    def __init__(self, volatile: Sequence[StrPath] = ()) -> None:
+        self.volatile: list[str] = [os.path.abspath(p) for p in volatile]
+        self._finders: dict[str, PathEntryFinder | None] = {}
+        self._listings: dict[str, tuple[set[str], set[str]] | None] = {}
+
+    def invalidate_caches(self) -> None:
+        """Forget the listings of the directories."""
+        self._finders.clear()
+        self._listings.clear()
+
+    def _is_volatile(self, directory: str) -> bool:
+        """Return True if the directory must not be memoized."""
+        return any(
+            directory == v or directory.startswith(v + os.sep)
+            for v in self.volatile
+        )
+
+    def _path_finder(self, entry: str) -> PathEntryFinder | None:
+        """Return the finder for the entry, as PathFinder gets it."""
+        try:
+            return self._finders[entry]
+        except KeyError:
+            pass
+        finder = sys.path_importer_cache.get(entry)
+        if finder is None:
+            for hook in sys.path_hooks:
+                try:
+                    finder = hook(entry)
+                except ImportError:
+                    continue
+                break
+        if not self._is_volatile(entry):
+            self._finders[entry] = finder
+        return finder
+
+    def _listing(self, directory: str) -> tuple[set[str], set[str]] | None:
+        """Return the names of files and directories in the directory."""
+        try:
+            return self._listings[directory]
+        except KeyError:
+            pass
+        files: set[str] = set()
+        dirs: set[str] = set()
+        try:
+            with os.scandir(directory) as it:
+                for entry in it:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        continue
+                    (dirs if is_dir else files).add(entry.name)
+        except (NotADirectoryError, FileNotFoundError):
+            listing = None
+        except OSError:
+            return None
+        else:
+            listing = (files, dirs)
+        if not self._is_volatile(directory):
+            self._listings[directory] = listing
+        return listing
+
+    def find_spec(
+        self, name: str, path: Sequence[StrPath]
+    ) -> ModuleSpec | None:
+        """Return the spec of the module found in the path, or None."""
+        tail = name.rpartition(".")[2]
+        namespace_path: list[str] = []
+        for entry in path:
+            directory = os.path.abspath(entry)
+            finder = self._path_finder(directory)
+            if finder is None:
+                continue
+            if type(finder) is not FileFinder:
+                spec = PathFinder.find_spec(name, [directory])
+                if spec is None:
+                    continue
+                if spec.loader is not None:
+                    return spec
+                namespace_path.extend(spec.submodule_search_locations or [])
+                continue
+            listing = self._listing(directory)
+            if listing is None:
+                continue
+            files, dirs = listing
+            if tail in dirs:
+                package_dir = os.path.join(directory, tail)
+                package_listing = self._listing(package_dir)
+                package_files = package_listing[0] if package_listing else ()
+                for loader_class, suffixes in LOADERS:
+                    for suffix in suffixes:
+                        if f"__init__{suffix}" in package_files:
+                            filename = os.path.join(
+                                package_dir, f"__init__{suffix}"
+                            )
+                            return spec_from_file_location(
+                                name,
+                                filename,
+                                loader=loader_class(name, filename),
+                                submodule_search_locations=[package_dir],
+                            )
+                namespace_path.append(package_dir)
+            for loader_class, suffixes in LOADERS:
+                for suffix in suffixes:
+                    if f"{tail}{suffix}" in files:
+                        filename = os.path.join(directory, f"{tail}{suffix}")
+                        return spec_from_file_location(
+                            name,
+                            filename,
+                            loader=loader_class(name, filename),
+                            submodule_search_locations=None,
+                        )
+        if namespace_path:
+            spec = ModuleSpec(name, None, is_package=True)
+            spec.submodule_search_locations = namespace_path
+            return spec
+        return None
@@ -0,0 +1,229 @@
+"""Internal _sizereport module - attribute the size of a build."""
+
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+from zipfile import BadZipFile, ZipFile
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterator
+
+    from cx_Freeze._typing import StrPath
+
+__all__ = ["UNATTRIBUTED", "SizeReport", "format_size"]
+
+# the owner of the files that were not recorded while freezing
+UNATTRIBUTED = "<unattributed>"
+
+# zip local file header and central directory entry, without the names
+ZIP_HEADERS_SIZE = 30 + 46
+
+
+def format_size(size: float) -> str:
+    """Return the size in a human readable form."""
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if size < 1024 or unit == "GiB":
+            break
+        size /= 1024
+    return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+
+
+class SizeReport:
+    """The size of each file of the build directory and its owner.
+
+    While freezing, each file is recorded with its owner: the module that
+    caused it to be written, or a tag like <executable>. The members of the
+    zip file and of the module archive are recorded as well, so the bytes of
+    the containers are split between their owners. The analysis only stats
+    the files and reads the directory of the zip file.
+
+    :param target_dir: The build directory.
+    """
+
+    def __init__(self, target_dir: Path) -> None:
+        self.target_dir: Path = target_dir
+        self.files: list[dict[str, Any]] = []
+        self._owners: dict[Path, str] = {}
+        self._members: dict[Path, dict[str, tuple[str, int | None]]] = {}
+
+    def record(self, target: Path, owner: str | None) -> None:
+        """Record the owner of a file, if it has none yet."""
+        self._owners.setdefault(target, owner or UNATTRIBUTED)
+
+    def record_member(
+        self,
+        container: Path,
+        name: str,
+        owner: str | None,
+        size: int | None = None,
+    ) -> None:
+        """Record the owner of a member of a container.
+
+        The size of the members of a zip file is read from the zip file.
+        """
+        members = self._members.setdefault(container, {})
+        members.setdefault(name, (owner or UNATTRIBUTED, size))
+
+    def _walk(self, path: StrPath) -> Iterator[os.DirEntry[str]]:
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    yield from self._walk(entry.path)
+                else:
+                    yield entry
+
+    def _member_sizes(
+        self, container: Path, members: dict[str, tuple[str, int | None]]
+    ) -> Iterator[tuple[str, int]]:
+        """Return the name and size of each member of the container."""
+        if any(size is None for _, size in members.values()):
+            try:
+                with ZipFile(container) as zip_file:
+                    for zinfo in zip_file.infolist():
+                        size = (
+                            zinfo.compress_size
+                            + ZIP_HEADERS_SIZE
+                            + 2 * len(zinfo.filename.encode())
+                            + len(zinfo.extra)
+                            + len(zinfo.comment)
+                        )
+                        yield zinfo.filename, size
+            except (OSError, BadZipFile):
+                return
+        else:
+            for name, (_, size) in members.items():
+                yield name, size or 0
+
+    def analyze(
+        self, describe: Callable[[str], tuple[str, list[str]]]
+    ) -> None:
+        """Attribute each byte of the build directory.
+
+        :param describe: Return the distribution of an owner and the chain of
+            imports that included it.
+        """
+        self.files = []
+        owners = self._owners
+        inodes: set[tuple[int, int]] = set()
+        for entry in self._walk(self.target_dir):
+            path = Path(entry.path)
+            entry_stat = entry.stat(follow_symlinks=False)
+            size = entry_stat.st_size
+            if entry_stat.st_nlink > 1:
+                # the hard links of a file are counted once
+                inode = (entry_stat.st_dev, entry_stat.st_ino)
+                if inode in inodes:
+                    size = 0
+                inodes.add(inode)
+            members = self._members.get(path)
+            if members is not None:
+                for name, member_size in self._member_sizes(path, members):
+                    owner = members.get(name, (UNATTRIBUTED, None))[0]
+                    self._add_file(path, name, member_size, owner, describe)
+                    size -= member_size
+                # the headers and the directory of the container
+                size = max(size, 0)
+            owner = owners.get(path)
+            if owner is None and entry.is_symlink():
+                owner = owners.get(path.resolve())
+            self._add_file(path, None, size, owner or UNATTRIBUTED, describe)
+        self.files.sort(key=lambda file: (-file["size"], file["path"]))
+
+    def _add_file(
+        self,
+        path: Path,
+        member: str | None,
+        size: int,
+        owner: str,
+        describe: Callable[[str], tuple[str, list[str]]],
+    ) -> None:
+        distribution, chain = describe(owner)
+        name = path.relative_to(self.target_dir).as_posix()
+        if member is not None:
+            name = f"{name}/{member}"
+        self.files.append(
+            {
+                "path": name,
+                "size": size,
+                "owner": owner,
+                "distribution": distribution,
+                "chain": chain,
+            }
+        )
+
+    @property
+    def total_size(self) -> int:
+        """The size of the build directory."""
+        return sum(file["size"] for file in self.files)
+
+    def distributions(self) -> list[dict[str, Any]]:
+        """Return the size and number of files of each distribution."""
+        totals: dict[str, list[int]] = {}
+        for file in self.files:
+            total = totals.setdefault(file["distribution"], [0, 0])
+            total[0] += file["size"]
+            total[1] += 1
+        return [
+            {"name": name, "size": size, "files": count}
+            for name, (size, count) in sorted(
+                totals.items(), key=lambda item: (-item[1][0], item[0])
+            )
+        ]
+
+    def tree(self) -> dict[str, Any]:
+        """Return the files grouped by distribution and owner, for treemaps."""
+        groups: dict[str, dict[str, list[dict[str, Any]]]] = {}
+        for file in self.files:
+            owners = groups.setdefault(file["distribution"], {})
+            owners.setdefault(file["owner"], []).append(
+                {"name": file["path"], "value": file["size"]}
+            )
+        return {
+            "name": self.target_dir.name,
+            "children": [
+                {
+                    "name": distribution,
+                    "children": [
+                        {"name": owner, "children": files}
+                        for owner, files in owners.items()
+                    ],
+                }
+                for distribution, owners in groups.items()
+            ],
+        }
+
+    def print_table(self, limit: int = 20) -> None:
+        """Print the size of the distributions and the largest files."""
+        total_size = self.total_size or 1
+        print(f"Size of {self.target_dir}: {format_size(self.total_size)}")
+        print(f"  {'Size':>10} {'%':>5} {'Files':>6}  Distribution")
+        for item in self.distributions()[:limit]:
+            percent = 100 * item["size"] / total_size
+            print(
+                f"  {format_size(item['size']):>10} {percent:>5.1f}"
+                f" {item['files']:>6}  {item['name']}"
+            )
+        print(f"  {'Size':>10}  File (imported by)")
+        for file in self.files[:limit]:
+            chain = " -> ".join(file["chain"]) or file["owner"]
+            print(f"  {format_size(file['size']):>10}  {file['path']}")
+            print(f"  {'':>10}    ({chain})")
+        print()
+
+    def write(self, filename: StrPath) -> None:
+        """Write the report as JSON."""
+        data = {
+            "target_dir": os.fspath(self.target_dir),
+            "total_size": self.total_size,
+            "distributions": self.distributions(),
+            "files": self.files,
+            "tree": self.tree(),
+        }
+        filename = Path(filename)
+        filename.parent.mkdir(parents=True, exist_ok=True)
+        with filename.open("w", encoding="utf-8") as file:
+            json.dump(data, file, indent=1)
+            file.write("\n")
@@ -0,0 +1,67 @@
+"""Internal _spill module - keep the code of the modules out of memory."""
+
+from __future__ import annotations
+
+import marshal
+import os
+import threading
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from pathlib import Path
+    from types import CodeType
+
+__all__ = ["SpillStore"]
+
+
+class SpillStore:
+    """The marshalled code of the modules, stored in a temporary file.
+
+    The code is appended to the file and read back when it is used, so the
+    code objects of the modules found are not kept in memory.
+
+    :param directory: The temporary directory where the file is created.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self._file = directory.joinpath("spilled-code.bin").open("w+b")
+        # the offset and the size of the code of each module
+        self._entries: dict[str, tuple[int, int]] = {}
+        self._lock = threading.Lock()
+        self.size: int = 0
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def put(self, name: str, code: CodeType) -> None:
+        """Store the code of the module."""
+        data = marshal.dumps(code)
+        with self._lock:
+            offset = self._file.seek(0, os.SEEK_END)
+            self._file.write(data)
+        self._entries[name] = (offset, len(data))
+        self.size += len(data)
+
+    def get_bytes(self, name: str) -> bytes | None:
+        """Return the marshalled code of the module, if it is stored."""
+        entry = self._entries.get(name)
+        if entry is None:
+            return None
+        offset, size = entry
+        with self._lock:
+            self._file.seek(offset)
+            return self._file.read(size)
+
+    def get(self, name: str) -> CodeType | None:
+        """Return the code of the module, if it is stored."""
+        data = self.get_bytes(name)
+        if data is None:
+            return None
+        return marshal.loads(data)  # noqa: S302
+
+    def close(self) -> None:
+        """Close the file; the code stored cannot be read anymore."""
+        self._file.close()
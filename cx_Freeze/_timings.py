@@ -0,0 +1,204 @@
+"""Internal _timings module - measure the phases of a freeze."""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+from contextlib import AbstractContextManager, nullcontext
+from functools import wraps
+from pathlib import Path
+from time import perf_counter
+from typing import TYPE_CHECKING, Any, TypeVar
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from cx_Freeze._typing import StrPath
+
+__all__ = ["Timings", "phase", "start", "stop", "timed"]
+
+_T = TypeVar("_T")
+
+# the timings of the running freeze, or None if they are not measured
+_active: Timings | None = None
+_audit_hook_installed = False
+
+
+class _Phase:
+    """A call of a phase, on the stack of its thread."""
+
+    __slots__ = ("children", "name", "start", "subprocesses")
+
+    def __init__(self, name: str) -> None:
+        self.name: str = name
+        self.children: float = 0.0
+        self.subprocesses: int = 0
+        self.start: float = perf_counter()
+
+
+class Timings:
+    """The wall time, calls and subprocesses of each phase of a freeze.
+
+    The total time of a phase includes the phases that it calls, but a
+    recursive call is only counted once; the self time excludes them. The
+    subprocesses are counted in the innermost phase running in the thread
+    that started them.
+
+    :param trace: Record each call, for the Chrome trace format.
+    """
+
+    def __init__(self, trace: bool = False) -> None:
+        self.origin: float = perf_counter()
+        # calls, total time, self time and subprocesses of each phase
+        self.phases: dict[str, list[float]] = {}
+        self.events: list[dict[str, Any]] | None = [] if trace else None
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def _stack(self) -> list[_Phase]:
+        try:
+            return self._local.stack
+        except AttributeError:
+            self._local.stack = []
+            return self._local.stack
+
+    def enter(self, name: str) -> _Phase:
+        """Start a call of a phase."""
+        current = _Phase(name)
+        self._stack().append(current)
+        return current
+
+    def leave(self, current: _Phase) -> None:
+        """End a call of a phase."""
+        end = perf_counter()
+        elapsed = end - current.start
+        stack = self._stack()
+        stack.pop()
+        if stack:
+            stack[-1].children += elapsed
+        recursive = any(caller.name == current.name for caller in stack)
+        with self._lock:
+            values = self.phases.setdefault(current.name, [0, 0.0, 0.0, 0])
+            values[0] += 1
+            if not recursive:
+                values[1] += elapsed
+            values[2] += elapsed - current.children
+            values[3] += current.subprocesses
+            if self.events is not None:
+                self.events.append(
+                    {
+                        "name": current.name,
+                        "ph": "X",
+                        "ts": (current.start - self.origin) * 1e6,
+                        "dur": elapsed * 1e6,
+                        "pid": os.getpid(),
+                        "tid": threading.get_ident(),
+                        "args": {"subprocesses": current.subprocesses},
+                    }
+                )
+
+    def subprocess_started(self) -> None:
+        """Count a subprocess in the innermost phase of the thread."""
+        stack = self._stack()
+        if stack:
+            stack[-1].subprocesses += 1
+        else:
+            with self._lock:
+                values = self.phases.setdefault("(other)", [0, 0.0, 0.0, 0])
+                values[3] += 1
+
+    def print_table(self) -> None:
+        """Print the time of the phases, the slowest first."""
+        print(
+            f"  {'Total [s]':>10} {'Self [s]':>10} {'Calls':>7}"
+            f" {'Subproc':>7}  Phase"
+        )
+        for name, (calls, total, self_time, subprocesses) in sorted(
+            self.phases.items(), key=lambda item: (-item[1][1], item[0])
+        ):
+            print(
+                f"  {total:>10.3f} {self_time:>10.3f} {calls:>7.0f}"
+                f" {subprocesses:>7.0f}  {name}"
+            )
+        print()
+
+    def to_trace(self) -> dict[str, Any]:
+        """Return the calls of the phases in the Chrome trace format."""
+        return {"traceEvents": self.events or [], "displayTimeUnit": "ms"}
+
+    def write_trace(self, filename: StrPath) -> None:
+        """Write the calls of the phases in the Chrome trace format."""
+        filename = Path(filename)
+        filename.parent.mkdir(parents=True, exist_ok=True)
+        with filename.open("w", encoding="utf-8") as file:
+            json.dump(self.to_trace(), file)
+            file.write("\n")
+
+
+def _audit(event: str, _args: tuple[Any, ...]) -> None:
+    if event == "subprocess.Popen" and _active is not None:
+        _active.subprocess_started()
+
+
+def start(timings: Timings) -> None:
+    """Measure the phases with these timings."""
+    global _active, _audit_hook_installed  # noqa: PLW0603
+    if not _audit_hook_installed:
+        # audit hooks cannot be removed, so it is installed only once
+        sys.addaudithook(_audit)
+        _audit_hook_installed = True
+    _active = timings
+
+
+def stop() -> None:
+    """Stop measuring the phases."""
+    global _active  # noqa: PLW0603
+    _active = None
+
+
+class _PhaseContext:
+    """Measure a block of code as a call of a phase."""
+
+    __slots__ = ("_current", "_name", "_timings")
+
+    def __init__(self, timings: Timings, name: str) -> None:
+        self._timings: Timings = timings
+        self._name: str = name
+        self._current: _Phase | None = None
+
+    def __enter__(self) -> None:
+        self._current = self._timings.enter(self._name)
+
+    def __exit__(self, *exc_info: object) -> None:
+        if self._current is not None:
+            self._timings.leave(self._current)
+            self._current = None
+
+
+def phase(name: str) -> AbstractContextManager[None]:
+    """Return a context manager that measures a block as a phase."""
+    if _active is None:
+        return nullcontext()
+    return _PhaseContext(_active, name)
+
+
+def timed(name: str) -> Callable[[Callable[..., _T]], Callable[..., _T]]:
+    """Measure each call of the decorated function as a call of a phase."""
+
+    def decorator(func: Callable[..., _T]) -> Callable[..., _T]:
+        @wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> _T:
+            timings = _active
+            if timings is None:
+                return func(*args, **kwargs)
+            current = timings.enter(name)
+            try:
+                return func(*args, **kwargs)
+            finally:
+                timings.leave(current)
+
+        return wrapper
+
+    return decorator
@@ -5,7 +5,7 @@ from __future__ import annotations
 from collections.abc import Sequence
 from os import PathLike
 from pathlib import Path, PurePath
-from typing import TypeAlias
+from typing import Any, TypeAlias
 
 from cx_Freeze.module import Module
 
@@ -13,6 +13,10 @@ StrPath: TypeAlias = str | PathLike[str]
 
 DeferredList: TypeAlias = list[tuple[Module, Module, list[str]]]
 
+ImportsList: TypeAlias = list[tuple[str, tuple[Any, ...], bool]]
+
+ScanResults: TypeAlias = tuple[tuple[str, tuple[Any, ...]], ...]
+
 IncludesList: TypeAlias = Sequence[StrPath | tuple[StrPath, StrPath | None]]
 
 InternalIncludesList: TypeAlias = list[tuple[Path, PurePath]]
@@ -23,7 +27,9 @@ HANDLE: TypeAlias = int | None
 __all__ = [
     "HANDLE",
     "DeferredList",
+    "ImportsList",
     "IncludesList",
     "InternalIncludesList",
+    "ScanResults",
     "StrPath",
 ]
@@ -0,0 +1,231 @@
+"""Internal _zip module - write zip files compressing entries in parallel."""
+
+from __future__ import annotations
+
+import zlib
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import PurePath
+from stat import S_IFREG
+from typing import TYPE_CHECKING, Any
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile, ZipInfo
+
+if TYPE_CHECKING:
+    import sys
+    from collections.abc import Callable, Iterable, Iterator
+    from types import TracebackType
+
+    from cx_Freeze._typing import StrPath
+
+    if sys.version_info >= (3, 11):
+        from typing import Self
+    else:
+        from typing_extensions import Self
+
+__all__ = ["STORED_SUFFIXES", "ZipWriter"]
+
+# Payloads that are already compressed are stored, not deflated again.
+STORED_SUFFIXES = frozenset(
+    {
+        ".7z",
+        ".bz2",
+        ".dll",
+        ".dylib",
+        ".egg",
+        ".gif",
+        ".gz",
+        ".jar",
+        ".jpeg",
+        ".jpg",
+        ".mp3",
+        ".mp4",
+        ".npz",
+        ".ogg",
+        ".png",
+        ".pyd",
+        ".so",
+        ".webp",
+        ".whl",
+        ".xz",
+        ".zip",
+        ".zst",
+    }
+)
+
+# Files are read and compressed in chunks of this size.
+CHUNK_SIZE = 1 << 20
+
+
+def _read_chunks(filename: StrPath) -> Iterator[bytes]:
+    """Read the file in chunks, when the entry is written."""
+    with open(filename, "rb") as file:
+        while chunk := file.read(CHUNK_SIZE):
+            yield chunk
+
+
+class ZipWriter:
+    """Write a zip file, compressing its entries in worker threads.
+
+    The entries are written in the order they are added, so the contents of
+    the zip file do not depend on the number of jobs. Entries whose suffix
+    is in STORED_SUFFIXES, or that would not get smaller, are stored. The
+    files are compressed in chunks, and the stored ones are copied when they
+    are written, so a file is never read whole in memory. The headers and the
+    central directory are written by ZipFile.
+
+    :param filename: The zip file to create.
+    :param compress_type: ZIP_DEFLATED or ZIP_STORED.
+    :param compress_level: The zlib compression level (0-9), or None for
+        the default level.
+    :param jobs: The number of worker threads; 1 to compress the entries in
+        the calling thread.
+    :param date_time: If set, the date and time of the files added with
+        write, whose permissions are also normalized.
+    """
+
+    def __init__(
+        self,
+        filename: StrPath,
+        compress_type: int = ZIP_DEFLATED,
+        compress_level: int | None = None,
+        jobs: int = 1,
+        date_time: tuple[int, int, int, int, int, int] | None = None,
+    ) -> None:
+        self.compress_type: int = compress_type
+        self.compress_level: int = (
+            zlib.Z_DEFAULT_COMPRESSION
+            if compress_level is None
+            else compress_level
+        )
+        self.jobs: int = jobs
+        self.date_time = date_time
+        self._zip = ZipFile(filename, "w")
+        self.filelist: list[ZipInfo] = self._zip.filelist
+        self._executor: ThreadPoolExecutor | None = None
+        if jobs > 1:
+            self._executor = ThreadPoolExecutor(
+                jobs, thread_name_prefix="cxfreeze-zip"
+            )
+        self._queue: deque[Future[tuple[ZipInfo, Iterable[bytes]]]] = deque()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self._abort()
+
+    def write(self, filename: StrPath, arcname: str) -> None:
+        """Add the file to the zip file, with the given name."""
+        self._submit(self._compress_file, filename, arcname)
+
+    def writestr(self, zinfo: ZipInfo, data: bytes) -> None:
+        """Add the data to the zip file, as described by zinfo."""
+        self._submit(self._compress, zinfo, data)
+
+    def close(self) -> None:
+        """Write the pending entries and the central directory."""
+        try:
+            while self._queue:
+                self._write_entry(*self._queue.popleft().result())
+        finally:
+            self._abort()
+
+    def _abort(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(cancel_futures=True)
+            self._executor = None
+        self._queue.clear()
+        self._zip.close()
+
+    def _submit(
+        self, func: Callable[..., tuple[ZipInfo, Iterable[bytes]]], *args: Any
+    ) -> None:
+        if self._executor is None:
+            self._write_entry(*func(*args))
+            return
+        self._queue.append(self._executor.submit(func, *args))
+        # limit the memory used by the entries waiting to be written
+        while len(self._queue) > self.jobs * 4 or self._queue[0].done():
+            self._write_entry(*self._queue.popleft().result())
+            if not self._queue:
+                break
+
+    def _deflate(self, zinfo: ZipInfo) -> bool:
+        """Return True if the entry is to be deflated."""
+        return (
+            zinfo.compress_type == ZIP_DEFLATED
+            and PurePath(zinfo.filename).suffix.lower() not in STORED_SUFFIXES
+        )
+
+    def _compress_file(
+        self, filename: StrPath, arcname: str
+    ) -> tuple[ZipInfo, Iterable[bytes]]:
+        zinfo = ZipInfo.from_file(filename, arcname, strict_timestamps=False)
+        zinfo.compress_type = self.compress_type
+        zinfo.flag_bits &= ~0x08  # sizes are known, no data descriptor
+        if self.date_time is not None:
+            zinfo.date_time = self.date_time
+            mode = 0o755 if (zinfo.external_attr >> 16) & 0o111 else 0o644
+            zinfo.external_attr = (S_IFREG | mode) << 16
+        crc = file_size = compress_size = 0
+        compressed: list[bytes] = []
+        compressor = None
+        if self._deflate(zinfo):
+            compressor = zlib.compressobj(
+                self.compress_level, zlib.DEFLATED, -15
+            )
+        for chunk in _read_chunks(filename):
+            crc = zlib.crc32(chunk, crc)
+            file_size += len(chunk)
+            if compressor is not None:
+                compressed.append(compressor.compress(chunk))
+                compress_size += len(compressed[-1])
+        zinfo.CRC = crc
+        zinfo.file_size = file_size
+        if compressor is not None:
+            compressed.append(compressor.flush())
+            compress_size += len(compressed[-1])
+            if compress_size < file_size:
+                zinfo.compress_size = compress_size
+                return zinfo, compressed
+        zinfo.compress_type = ZIP_STORED
+        zinfo.compress_size = file_size
+        return zinfo, _read_chunks(filename)
+
+    def _compress(
+        self, zinfo: ZipInfo, data: bytes
+    ) -> tuple[ZipInfo, Iterable[bytes]]:
+        zinfo.file_size = len(data)
+        zinfo.CRC = zlib.crc32(data)
+        zinfo.flag_bits &= ~0x08  # sizes are known, no data descriptor
+        if self._deflate(zinfo):
+            compressor = zlib.compressobj(
+                self.compress_level, zlib.DEFLATED, -15
+            )
+            compressed = compressor.compress(data) + compressor.flush()
+            if len(compressed) < len(data):
+                zinfo.compress_size = len(compressed)
+                return zinfo, [compressed]
+        zinfo.compress_type = ZIP_STORED
+        zinfo.compress_size = len(data)
+        return zinfo, [data]
+
+    def _write_entry(self, zinfo: ZipInfo, chunks: Iterable[bytes]) -> None:
+        # the payload is already compressed, so it is written directly after
+        # the header and the entry is recorded as ZipFile would do it
+        fp = self._zip.fp
+        zinfo.header_offset = fp.tell()
+        fp.write(zinfo.FileHeader())
+        for chunk in chunks:
+            fp.write(chunk)
+        self._zip.filelist.append(zinfo)
+        self._zip.NameToInfo[zinfo.filename] = zinfo
+        self._zip.start_dir = fp.tell()
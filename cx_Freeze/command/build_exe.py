@@ -121,6 +121,97 @@ class build_exe(Command):
             None,
             "create a zip file with no compression (See also --zip-filename)",
         ),
+        (
+            "compress-level=",
+            None,
+            "compression level of the zip file, from 0 (no compression) to "
+            "9 (best compression); files already compressed are stored "
+            "[default: 6]",
+        ),
+        (
+            "archive-format=",
+            None,
+            "format of the archive of the modules: zip, or mmap to store "
+            "the modules of the application in an uncompressed archive "
+            "mapped in memory [default: zip]",
+        ),
+        (
+            "tree-shaking=",
+            None,
+            "leave out the submodules that are only included by a blanket "
+            "include_package and never imported statically: off, archive to "
+            "move them to a side zip file loaded on demand, or drop "
+            "[default: off]",
+        ),
+        (
+            "lazy-imports=",
+            None,
+            "comma-separated list of modules and packages loaded lazily by "
+            "the frozen application, when one of their attributes is used",
+        ),
+        (
+            "invalidation-mode=",
+            None,
+            "header of the compiled modules: timestamp, checked-hash or "
+            "unchecked-hash (PEP 552) [default: timestamp, or unchecked-hash "
+            "in reproducible builds]",
+        ),
+        (
+            "import-index",
+            None,
+            "install an index of the modules used to find them when the "
+            "frozen application starts",
+        ),
+        (
+            "import-profiler",
+            None,
+            "install a profiler of the imports in the frozen application, "
+            "enabled by setting CXFREEZE_IMPORTTIME when it is run",
+        ),
+        (
+            "timings",
+            None,
+            "show the wall time, calls and subprocesses of each phase of "
+            "the freeze, and of each hook",
+        ),
+        (
+            "trace-file=",
+            None,
+            "write the calls of the phases of the freeze to this file, in "
+            "the Chrome trace format",
+        ),
+        (
+            "deduplicate=",
+            None,
+            "replace the copied files that have the same contents by links: "
+            "hardlink, symlink or off [default: off]",
+        ),
+        (
+            "defer-compile",
+            None,
+            "find the imports in the bytecode cached at the optimization "
+            "level and compile the modules when they are written",
+        ),
+        (
+            "stream-modules",
+            None,
+            "store the code of the modules in a temporary file once they are "
+            "scanned, instead of keeping it in memory until they are written",
+        ),
+        (
+            "graph-output=",
+            None,
+            "write the dependency graph of the modules and binary files, "
+            "with the reason of each dependency, to this file: GraphML if "
+            "the suffix is .graphml, otherwise JSON",
+        ),
+        (
+            "size-report=",
+            None,
+            "write a report of the size of the build to this file (JSON), "
+            "attributing each file to a distribution and to the imports "
+            "that included it",
+        ),
         (
             "optimize=",
             "O",
@@ -158,11 +249,55 @@ class build_exe(Command):
             "with one of the following values: 15, 16 or 17 "
             "(version 15 includes UCRT for Windows 8.1 and below)",
         ),
+        (
+            "cache-dir=",
+            None,
+            "directory of the persistent cache of analyzed modules "
+            "[default: user cache directory]",
+        ),
+        (
+            "no-cache",
+            None,
+            "do not use the persistent cache of analyzed modules",
+        ),
+        (
+            "clear-cache",
+            None,
+            "clear the persistent cache of analyzed modules before building",
+        ),
+        (
+            "jobs=",
+            "j",
+            "number of parallel jobs used to compile modules, copy files "
+            "and resolve their dependencies; 0 to use the number of CPUs "
+            "[default: 1]",
+        ),
+        (
+            "incremental",
+            None,
+            "reuse the unchanged files of the previous build, copying only "
+            "the changed files and removing the stale ones",
+        ),
+        (
+            "reproducible",
+            None,
+            "create the same files on every build, using SOURCE_DATE_EPOCH "
+            "as the timestamp [default: enabled if SOURCE_DATE_EPOCH is set]",
+        ),
     ]
     boolean_options: ClassVar[list[str]] = [
         "no-compress",
         "include-msvcr",
         "silent",
+        "no-cache",
+        "clear-cache",
+        "incremental",
+        "reproducible",
+        "import-index",
+        "import-profiler",
+        "timings",
+        "defer-compile",
+        "stream-modules",
     ]
 
     def add_to_path(self, name: str) -> None:
@@ -225,6 +360,7 @@ class build_exe(Command):
             "zip_includes",
             "zip_exclude_packages",
             "zip_include_packages",
+            "lazy_imports",
         ]
         self.excludes = []
         self.includes = []
@@ -240,13 +376,33 @@ class build_exe(Command):
         self.zip_includes = []
         self.zip_exclude_packages = ["*"]
         self.zip_include_packages = []
+        self.lazy_imports = []
 
+        self.archive_format = None
         self.build_exe = None
+        self.cache_dir = None
+        self.clear_cache = False
+        self.compress_level = None
+        self.graph_output = None
+        self.import_profiler = False
+        self.timings = False
+        self.trace_file = None
+        self.deduplicate = None
+        self.defer_compile = False
+        self.stream_modules = False
+        self.size_report = None
+        self.tree_shaking = None
         self.include_msvcr = None
         self.include_msvcr_version = None
+        self.incremental = False
+        self.invalidation_mode = None
+        self.jobs = None
+        self.no_cache = False
         self.no_compress = False
+        self.import_index = False
         self.optimize = sys.flags.optimize
         self.path: list[str] = []
+        self.reproducible = None
         self.silent = None
         self.silent_level = None
         self.zip_filename = None
@@ -307,6 +463,53 @@ class build_exe(Command):
             )
         elif self.no_compress is False:
             self.zip_filename = "library.zip"
+        if self.compress_level is not None:
+            self.compress_level = int(self.compress_level)
+            if not 0 <= self.compress_level <= 9:
+                msg = "the compression level must be a number between 0 and 9"
+                raise OptionError(msg)
+
+        # cache and incremental build options
+        self.no_cache = bool(self.no_cache)
+        self.clear_cache = bool(self.clear_cache)
+        self.incremental = bool(self.incremental)
+        self.import_index = bool(self.import_index)
+        self.import_profiler = bool(self.import_profiler)
+        self.timings = bool(self.timings)
+        self.defer_compile = bool(self.defer_compile)
+        self.stream_modules = bool(self.stream_modules)
+        if self.archive_format is not None:
+            self.archive_format = self.archive_format.lower()
+            if self.archive_format not in ("zip", "mmap"):
+                msg = "the archive format must be one of: zip, mmap"
+                raise OptionError(msg)
+        if self.tree_shaking is not None:
+            self.tree_shaking = self.tree_shaking.lower()
+            if self.tree_shaking not in ("off", "archive", "drop"):
+                msg = (
+                    "the tree shaking mode must be one of: off, archive, drop"
+                )
+                raise OptionError(msg)
+        if self.deduplicate is not None:
+            self.deduplicate = self.deduplicate.lower()
+            if self.deduplicate not in ("off", "hardlink", "symlink"):
+                msg = (
+                    "the deduplicate mode must be one of: off, hardlink, "
+                    "symlink"
+                )
+                raise OptionError(msg)
+        if self.invalidation_mode is not None:
+            self.invalidation_mode = self.invalidation_mode.lower()
+            if self.invalidation_mode not in (
+                "timestamp",
+                "checked-hash",
+                "unchecked-hash",
+            ):
+                msg = (
+                    "the invalidation mode must be one of: timestamp, "
+                    "checked-hash, unchecked-hash"
+                )
+                raise OptionError(msg)
 
         # include-msvcr is used on Windows and some MSYS2 environments
         if IS_UCRT:
@@ -357,6 +560,26 @@ class build_exe(Command):
             include_msvcr=self.include_msvcr or False,
             include_msvcr_version=self.include_msvcr_version,
             zip_filename=self.zip_filename,
+            cache=(not self.no_cache),
+            cache_dir=self.cache_dir,
+            clear_cache=self.clear_cache,
+            incremental=self.incremental,
+            jobs=self.jobs,
+            compress_level=self.compress_level,
+            reproducible=self.reproducible or None,
+            invalidation_mode=self.invalidation_mode,
+            import_index=self.import_index,
+            archive_format=self.archive_format,
+            graph_output=self.graph_output,
+            size_report=self.size_report,
+            tree_shaking=self.tree_shaking,
+            lazy_imports=self.lazy_imports,
+            import_profiler=self.import_profiler,
+            timings=self.timings,
+            trace_file=self.trace_file,
+            deduplicate=self.deduplicate,
+            defer_compile=self.defer_compile,
+            stream_modules=self.stream_modules,
         )
 
         freezer.freeze()
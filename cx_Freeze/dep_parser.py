@@ -5,6 +5,7 @@ Creates an abstraction to parse binary files.
 
 from __future__ import annotations
 
+import glob
 import os
 import re
 import shutil
@@ -14,11 +15,14 @@ import sys
 from abc import ABC, abstractmethod
 from contextlib import suppress
 from ctypes.util import find_library
+from functools import cache, lru_cache
 from pathlib import Path
 from tempfile import TemporaryDirectory
 from typing import TYPE_CHECKING, cast
 
 from cx_Freeze._compat import PLATFORM
+from cx_Freeze._elf import ELFCLASS64, ELFFile
+from cx_Freeze._timings import timed
 from cx_Freeze.exception import PlatformError
 
 if TYPE_CHECKING:
@@ -30,20 +34,105 @@ if TYPE_CHECKING:
 # but LIEF can be disabled with:
 # set CX_FREEZE_BIND=imagehlp
 
-# In Linux, to get dependencies, the default is to use ldd in x64 platforms
+# In Linux, to get dependencies, the default is to use ldd in x64 platforms;
+# elsewhere, or with CX_FREEZE_BIND=patchelf, the dynamic section of the ELF
+# files is read and the libraries are resolved like ld.so does
 LDD_DISABLED = (
     os.environ.get(
         "CX_FREEZE_BIND", "" if PLATFORM.endswith("x86_64") else "patchelf"
     )
     == "patchelf"
 )
+
+# In Linux, an rpath that fits in the space of the previous one can be written
+# in place, without calling patchelf, with:
+# export CX_FREEZE_RPATH_INPLACE=1
+RPATH_INPLACE = os.environ.get("CX_FREEZE_RPATH_INPLACE", "0") not in ("", "0")
 PE_EXT = (".exe", ".dll", ".pyd")
+
+# ctypes.util.find_library runs ldconfig or the compiler on each call
+_find_library = lru_cache(maxsize=None)(find_library)
 MAGIC_ELF = b"\x7fELF"
 NON_ELF_EXT = [".a", ".c", ".gif", ".h", ".html", ".jar", ".jpeg", ".jpg"]
 NON_ELF_EXT += [".json", ".png", ".pxd", ".py", ".pyc", ".pyi", ".pyx"]
 NON_ELF_EXT += [".txt", ".xml"]
 
 
+@cache
+def _ld_so_cache() -> dict[str, list[str]]:
+    """Return the libraries in the cache of ld.so, by soname."""
+    libraries: dict[str, list[str]] = {}
+    ldconfig = shutil.which("ldconfig") or shutil.which(
+        "ldconfig", path="/sbin:/usr/sbin"
+    )
+    if ldconfig is None:
+        return libraries
+    env = os.environ.copy()
+    env["LC_ALL"] = "C"
+    process = subprocess.run(
+        [ldconfig, "-p"],
+        check=False,
+        capture_output=True,
+        encoding="utf_8",
+        errors="surrogateescape",
+        env=env,
+    )
+    for line in process.stdout.splitlines():
+        match = re.match(r"\s+(\S+) \(.*\) => (.+)$", line)
+        if match:
+            libraries.setdefault(match.group(1), []).append(match.group(2))
+    return libraries
+
+
+def _ld_so_conf(filename: str = "/etc/ld.so.conf") -> list[str]:
+    """Return the directories listed in the configuration of ld.so."""
+    directories: list[str] = []
+    with suppress(OSError), open(filename, encoding="utf_8") as file:
+        for line in file:
+            line = line.partition("#")[0].strip()  # noqa: PLW2901
+            if line.startswith("include"):
+                pattern = line.removeprefix("include").strip()
+                pattern = os.path.join(os.path.dirname(filename), pattern)
+                for name in sorted(glob.glob(pattern)):
+                    directories.extend(_ld_so_conf(name))
+            elif line and not line.startswith("hwcap"):
+                directories.extend(re.split(r"[\s,:]+", line))
+    return directories
+
+
+@cache
+def _ld_so_dirs(elf_class: int) -> list[str]:
+    """Return the directories searched by ld.so after its cache."""
+    directories = _ld_so_conf()
+    multiarch = getattr(sys.implementation, "_multiarch", None)
+    if multiarch:
+        directories += [f"/lib/{multiarch}", f"/usr/lib/{multiarch}"]
+    if elf_class == ELFCLASS64:
+        directories += ["/lib64", "/usr/lib64"]
+    directories += ["/lib", "/usr/lib"]
+    return list(dict.fromkeys(directories))
+
+
+@cache
+def _interpreter_name() -> str | None:
+    """Return the name of the dynamic loader, which ldd does not list."""
+    try:
+        interpreter = ELFFile(sys.executable).interpreter
+    except (OSError, ValueError):
+        return None
+    return os.path.basename(interpreter) if interpreter else None
+
+
+@cache
+def _elf_arch(filename: str) -> tuple[int, int] | None:
+    """Return the class and the machine of the ELF file, or None."""
+    try:
+        elf = ELFFile(filename)
+    except (OSError, ValueError):
+        return None
+    return elf.elf_class, elf.machine
+
+
 class Parser(ABC):
     """`Parser` interface."""
 
@@ -87,6 +176,7 @@ class Parser(ABC):
                 return library.resolve()
         return None
 
+    @timed("get dependent files")
     def get_dependent_files(self, filename: StrPath) -> set[Path]:
         """Return the file's dependencies using platform-specific tools."""
         filename = Path(filename).resolve()
@@ -295,7 +385,7 @@ class ELFParser(Parser):
     ) -> Path | None:
         library = super().find_library(name, search_path)
         if library is None:
-            filename = find_library(name)
+            filename = _find_library(name)
             if filename:
                 library = super().find_library(filename, search_path)
         return library
@@ -357,79 +447,173 @@ class ELFParser(Parser):
             print(process.stderr, end="")
         return dependent_files
 
-    def _get_dependent_files_patchelf(self, filename: Path) -> set[Path]:
-        libraries: list[str] = self.get_needed(filename)
-        rpath: list[Path] = self.get_resolved_rpath(filename) or []
+    def _get_dependent_files_elf(self, filename: Path) -> set[Path]:
+        try:
+            elf = ELFFile(filename)
+        except (OSError, ValueError):
+            return set()
+        # the order used by ld.so: DT_RPATH (if there is no DT_RUNPATH),
+        # LD_LIBRARY_PATH, DT_RUNPATH, its cache and the default directories
+        directories: list[StrPath] = []
+        if not elf.runpath:
+            directories += self._resolve_rpath(filename, elf.rpath)
+        library_path = os.environ.get("LD_LIBRARY_PATH", "")
+        directories += [p for p in library_path.split(":") if p]
+        directories += self._resolve_rpath(filename, elf.runpath)
+        arch = (elf.elf_class, elf.machine)
 
         dependent_files: set[Path] = set()
-        search_path = cast(
-            "list[StrPath]", rpath + self.search_path + [filename.parent]
-        )
-        for name in libraries:
-            library = self.find_library(name, search_path)
+        for name in elf.needed:
+            if name == _interpreter_name():
+                continue
+            library = self._find_needed(name, arch, directories, filename)
             if library:
                 dependent_files.add(library)
+                if name in self._warnings:
+                    self._warnings[name] = False
             elif name not in self._warnings:
                 self._warnings[name] = True
         return dependent_files
 
+    def _find_needed(
+        self,
+        name: str,
+        arch: tuple[int, int],
+        directories: list[StrPath],
+        filename: Path,
+    ) -> Path | None:
+        """Return the library that ld.so would load for a DT_NEEDED entry."""
+        if "/" in name:
+            library = Path(name)
+            return library if _elf_arch(os.fspath(library)) == arch else None
+        candidates = [os.path.join(d, name) for d in directories]
+        candidates += _ld_so_cache().get(name, [])
+        candidates += [os.path.join(d, name) for d in _ld_so_dirs(arch[0])]
+        for candidate in candidates:
+            if _elf_arch(candidate) == arch:
+                return Path(candidate)
+        # not found by ld.so, like ldd, search the paths used by cx_Freeze
+        search_path = cast(
+            "list[StrPath]", [*self.search_path, filename.parent]
+        )
+        return self.find_library(name, search_path)
+
     if LDD_DISABLED:
-        _get_dependent_files = _get_dependent_files_patchelf
+        _get_dependent_files = _get_dependent_files_elf
     else:
         _get_dependent_files = _get_dependent_files_ldd
 
     def get_needed(self, filename: StrPath) -> list[str]:
         """Get the DT_NEEDED entry of the dynamic table."""
-        libraries: list[str] = []
-        with suppress(subprocess.CalledProcessError):
-            libraries.extend(
-                self.run_patchelf(["--print-needed", filename]).split()
-            )
-        return libraries
+        with suppress(OSError, ValueError):
+            return ELFFile(filename).needed
+        return []
 
     def get_resolved_rpath(self, filename: StrPath) -> list[Path] | None:
         """Get the resolved rpath of the executable."""
-        rpath = self.get_rpath(filename)
+        return self._resolve_rpath(filename, self.get_rpath(filename)) or None
+
+    @staticmethod
+    def _resolve_rpath(filename: StrPath, rpath: str | None) -> list[Path]:
         if rpath:
             origin = Path(filename).parent.as_posix()
             rpath_list = rpath.replace("$ORIGIN", origin).split(":")
             return [Path(p).resolve() for p in rpath_list]
-        return None
+        return []
 
     def get_rpath(self, filename: StrPath) -> str:
         """Get the rpath of the executable."""
-        with suppress(subprocess.CalledProcessError):
-            return self.run_patchelf(["--print-rpath", filename]).strip()
+        with suppress(OSError, ValueError):
+            elf = ELFFile(filename)
+            # like patchelf, DT_RUNPATH has precedence over DT_RPATH
+            return elf.runpath or elf.rpath or ""
         return ""
 
+    def get_soname(self, filename: StrPath) -> str | None:
+        """Get the DT_SONAME entry of the dynamic table."""
+        with suppress(OSError, ValueError):
+            return ELFFile(filename).soname
+        return None
+
     def replace_needed(
         self, filename: StrPath, so_name: str, new_so_name: str
     ) -> None:
         """Replace DT_NEEDED entry in the dynamic table."""
-        self._set_write_mode(filename)
-        self.run_patchelf(["--replace-needed", so_name, new_so_name, filename])
+        self.update_dynamic(filename, replace_needed={so_name: new_so_name})
 
     def set_rpath(self, filename: StrPath, rpath: str) -> None:
         """Set the rpath of the executable."""
+        self.update_dynamic(filename, rpath=rpath)
+
+    def set_soname(self, filename: StrPath, new_so_name: str) -> None:
+        """Set DT_SONAME entry in the dynamic table."""
+        self.update_dynamic(filename, soname=new_so_name)
+
+    def update_dynamic(
+        self,
+        filename: StrPath,
+        *,
+        rpath: str | None = None,
+        replace_needed: dict[str, str] | None = None,
+        soname: str | None = None,
+    ) -> None:
+        """Apply all the changes to the dynamic table at once.
+
+        The entries that already have the requested values are skipped, and
+        the remaining changes are made with a single call to patchelf.
+        """
+        try:
+            elf = ELFFile(filename)
+        except (OSError, ValueError):
+            elf = None
+        if rpath is not None:
+            rpath_list = rpath.split(":")
+            for i, rp in enumerate(rpath_list):
+                if rp == "$ORIGIN/.":
+                    rpath_list[i] = "$ORIGIN"
+            rpath = ":".join(rpath_list)
+            if elf and rpath == (elf.runpath or elf.rpath or ""):
+                rpath = None
+        needed = {
+            so_name: new_so_name
+            for so_name, new_so_name in (replace_needed or {}).items()
+            if so_name != new_so_name
+            and (elf is None or so_name in elf.needed)
+        }
+        if elf and soname == elf.soname:
+            soname = None
+        if rpath is None and not needed and soname is None:
+            return
+
         self._set_write_mode(filename)
-        rpath_list = rpath.split(":")
-        for i, rp in enumerate(rpath_list):
-            if rp == "$ORIGIN/.":
-                rpath_list[i] = "$ORIGIN"
-        rpath = ":".join(rpath_list)
-        if rpath == self.get_rpath(filename):
+        if (
+            RPATH_INPLACE
+            and elf
+            and rpath is not None
+            and not needed
+            and soname is None
+            and elf.set_rpath(rpath)
+        ):
+            if self._silent < 1:
+                print(f"set rpath {rpath!r} in place: {filename}")
             return
+        args: list[StrPath] = []
+        if rpath is not None:
+            args += ["--set-rpath", rpath]
+        for so_name, new_so_name in needed.items():
+            args += ["--replace-needed", so_name, new_so_name]
+        if soname is not None:
+            args += ["--set-soname", soname]
         try:
-            self.run_patchelf(["--set-rpath", rpath, filename])
+            self.run_patchelf([*args, filename])
         except subprocess.CalledProcessError:
+            if rpath is None:
+                raise
+            if len(args) > 2:
+                self.run_patchelf([*args[2:], filename])
             self.run_patchelf(["--remove-rpath", filename])
             self.run_patchelf(["--add-rpath", rpath, filename])
 
-    def set_soname(self, filename: StrPath, new_so_name: str) -> None:
-        """Set DT_SONAME entry in the dynamic table."""
-        self._set_write_mode(filename)
-        self.run_patchelf(["--set-soname", new_so_name, filename])
-
     def run_patchelf(self, args: Sequence[StrPath]) -> str:
         cmd = list(map(str, [self._patchelf, *args]))
         process = subprocess.run(
@@ -7,11 +7,21 @@ import inspect
 import json
 import linecache
 import logging
+import marshal
+import multiprocessing
 import os
+import struct
 import sys
 import traceback
+from collections import deque
+from concurrent.futures import (
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
 from contextlib import suppress
-from functools import cached_property
+from functools import cached_property, partial
 from importlib import import_module
 from importlib.machinery import (
     BYTECODE_SUFFIXES,
@@ -30,6 +40,7 @@ from importlib.metadata import (
     distributions,
     packages_distributions,
 )
+from importlib.util import MAGIC_NUMBER, cache_from_source, source_hash
 from pathlib import Path
 from pkgutil import resolve_name
 from sysconfig import get_config_var
@@ -40,9 +51,15 @@ from typing import TYPE_CHECKING
 from cx_Freeze._bytecode import (
     code_object_replace,
     code_object_replace_package,
+    code_object_set_package,
+    module_package,
     scan_code,
 )
-from cx_Freeze._compat import IS_WINDOWS, SOABI
+from cx_Freeze._compat import IS_LINUX, IS_WINDOWS, SOABI
+from cx_Freeze._graph import ImportGraph
+from cx_Freeze._resolver import SpecResolver
+from cx_Freeze._spill import SpillStore
+from cx_Freeze._timings import phase, timed
 from cx_Freeze.common import process_path_specs, resource_path
 from cx_Freeze.hooks.unused_modules import (
     DEFAULT_EXCLUDES,
@@ -51,17 +68,21 @@ from cx_Freeze.hooks.unused_modules import (
 from cx_Freeze.module import ConstantsModule, Module
 
 if TYPE_CHECKING:
-    from collections.abc import Mapping, Sequence
+    from collections.abc import Iterable, Iterator, Mapping, Sequence
     from importlib.abc import Loader
 
+    from cx_Freeze._cache import ModuleCache
     from cx_Freeze._typing import (
         DeferredList,
+        ImportsList,
         IncludesList,
         InternalIncludesList,
         StrPath,
     )
 
 ALL_SUFFIXES = SOURCE_SUFFIXES + BYTECODE_SUFFIXES + EXTENSION_SUFFIXES
+# the number of deferred modules compiled ahead of the writer, per job
+COMPILE_AHEAD = 4
 
 
 __all__ = ["ModuleFinder"]
@@ -85,6 +106,10 @@ class ModuleFinder:
         zip_include_packages: Sequence[str] | None = None,
         zip_include_all_packages: bool = False,
         zip_includes: IncludesList | None = None,
+        module_cache: ModuleCache | None = None,
+        jobs: int = 1,
+        defer_compile: bool = False,
+        stream_modules: bool = False,
     ) -> None:
         self.included_files: InternalIncludesList = process_path_specs(
             include_files
@@ -103,16 +128,48 @@ class ModuleFinder:
         self.aliases: dict[str, str] = {}
         self.excluded_dependent_files: set[Path] = set()
         self._bad_modules: dict[str, set[str]] = {}
+        self._hook_module: Module | None = None
+        # the sets of names shared between modules, see Module.share_names
+        self._shared_names: dict[frozenset[str], frozenset[str]] = {}
+        self.graph: ImportGraph = ImportGraph()
         # add the unused modules in the current platform
         self._modules: dict[str, Module | None] = dict.fromkeys(
             set(excludes or []) | DEFAULT_EXCLUDES
         )
         self._tmp_dir = TemporaryDirectory(prefix="cxfreeze-")
         self.cache_path = Path(self._tmp_dir.name)
+        # files are created in cache_path while the modules are searched
+        self._resolver = SpecResolver(volatile=[self.cache_path])
         self.lib_files: dict[Path, str] = {}
+        self.module_cache: ModuleCache | None = module_cache
+        self.jobs: int = jobs
+        self.defer_compile: bool = defer_compile
+        # the code of the modules scanned, when they are streamed
+        self._spill: SpillStore | None = None
+        if stream_modules:
+            self._spill = SpillStore(self.cache_path)
+        self._executor: Executor | None = None
+        self._prefetched: dict[
+            str, Future[tuple[str, bytes, ImportsList] | None]
+        ] = {}
 
     def cleanup(self) -> None:
+        self._stop_prefetch()
+        if self._spill is not None:
+            logger.debug(
+                "Spilled code: %d modules, %d bytes",
+                len(self._spill),
+                self._spill.size,
+            )
+            self._spill.close()
         self._tmp_dir.cleanup()
+        if self.module_cache is not None:
+            logger.debug(
+                "Module cache: %d hits, %d misses",
+                self.module_cache.hits,
+                self.module_cache.misses,
+            )
+            self.module_cache.prune()
 
     def _add_module(
         self,
@@ -140,9 +197,9 @@ class ModuleFinder:
                 and module.name not in self.zip_exclude_packages
             ) or module.name in self.zip_include_packages:
                 module.in_file_system = 0
-        if module.path is None and path is not None:
-            module.path = list(map(Path, path))
-        if module.file is None and filename is not None:
+        if not module.is_package and path is not None:
+            module.path = path
+        if module.file_name is None and filename is not None:
             module.file = filename
         if module.finder is None:
             module.finder = self
@@ -157,7 +214,7 @@ class ModuleFinder:
     def _determine_parent(self, caller: Module | None) -> Module | None:
         """Determine the parent to use when searching packages."""
         if caller is not None:
-            if caller.path is not None:
+            if caller.is_package:
                 return caller
             return self._get_parent_by_name(caller.name)
         return None
@@ -168,6 +225,7 @@ class ModuleFinder:
         package_module: Module,
         from_list: list[str],
         deferred_imports: DeferredList,
+        reason: str = "import",
     ) -> None:
         """Ensure that the from list is satisfied.
 
@@ -183,7 +241,11 @@ class ModuleFinder:
                 if name in package_module.global_names:
                     continue
                 sub_module_name = f"{package_module.name}.{name}"
-                self._import_module(sub_module_name, deferred_imports, caller)
+                sub_module = self._import_module(
+                    sub_module_name, deferred_imports, caller
+                )
+                if sub_module is not None:
+                    self._add_edge(caller, sub_module.name, reason)
 
     def _get_parent_by_name(self, name: str) -> Module | None:
         """Return the parent module given the name of a module."""
@@ -202,6 +264,7 @@ class ModuleFinder:
         """Import all sub modules to the given package."""
         if module.path is None:
             return
+        names: list[str] = []
         for path in module.path:
             for fullname in path.iterdir():
                 if fullname.is_dir():
@@ -227,21 +290,27 @@ class ModuleFinder:
                         continue
                     if name == "__init__":
                         continue
+                names.append(name)
 
-                sub_module_name = f"{module.name}.{name}"
-                sub_module = self._internal_import_module(
-                    sub_module_name, deferred_imports
-                )
-                if sub_module is None:
-                    if sub_module_name not in self._modules:
-                        msg = f"No module named {sub_module_name!r}"
-                        raise ImportError(msg, name=sub_module_name)
-                else:
-                    module.global_names.add(name)
-                    if sub_module.path and recursive:
-                        self._import_all_sub_modules(
-                            sub_module, deferred_imports, recursive
-                        )
+        if self.jobs > 1:
+            for name in names:
+                self._prefetch(f"{module.name}.{name}")
+        for name in names:
+            sub_module_name = f"{module.name}.{name}"
+            sub_module = self._internal_import_module(
+                sub_module_name, deferred_imports
+            )
+            if sub_module is None:
+                if sub_module_name not in self._modules:
+                    msg = f"No module named {sub_module_name!r}"
+                    raise ImportError(msg, name=sub_module_name)
+            else:
+                module.global_names.add(name)
+                self.graph.add_edge(module.name, sub_module.name, "package")
+                if sub_module.is_package and recursive:
+                    self._import_all_sub_modules(
+                        sub_module, deferred_imports, recursive
+                    )
 
     def _import_deferred_imports(
         self, deferred_imports: DeferredList, skip_in_import: bool = False
@@ -297,7 +366,7 @@ class ModuleFinder:
         # is searched for the named module
         elif relative_import_index > 0:
             parent = caller
-            if parent and parent.path is not None:
+            if parent and parent.is_package:
                 relative_import_index -= 1
             while parent is not None and relative_import_index > 0:
                 parent = self._get_parent_by_name(parent.name)
@@ -322,6 +391,12 @@ class ModuleFinder:
 
         return module
 
+    def _add_edge(self, caller: Module | None, name: str, reason: str) -> None:
+        """Record the import of the module in the import graph."""
+        if caller is None and self._hook_module is not None:
+            caller, reason = self._hook_module, "hook"
+        self.graph.add_edge(caller.name if caller else None, name, reason)
+
     def _internal_import_module(
         self, name: str, deferred_imports: DeferredList
     ) -> Module | None:
@@ -376,6 +451,8 @@ class ModuleFinder:
             logger.debug("Module [%s] cannot be imported", name)
             self._modules[name] = None
             return None
+        if parent_module is not None:
+            self.graph.add_edge(name, parent_module.name, "parent")
         return module
 
     def _find_editable_spec(
@@ -412,13 +489,9 @@ class ModuleFinder:
         spec: ModuleSpec | None = None
         module: Module | None = None
 
-        # It's recommended to clear the caches first.
-        if parent is None:
-            PathFinder.invalidate_caches()
-
         # Find modules to load
         try:
-            spec = PathFinder.find_spec(name, path)
+            spec = self._resolver.find_spec(name, path)
         except (KeyError, ModuleNotFoundError):
             if parent:
                 # some packages use a directory with vendor modules without
@@ -470,24 +543,44 @@ class ModuleFinder:
                     self._load_module_code_libraries(module)
         return module
 
+    @timed("load module code")
     def _load_module_code(
         self, module: Module, deferred_imports: DeferredList
     ) -> bool:
         loader: Loader | None = module.loader
         name: str = module.name
+        filename: str | None = None
+        cached: tuple[CodeType | None, ImportsList | None] | None = None
+        scanned: CodeType | None = None
 
         if isinstance(loader, ExtensionFileLoader):
             logger.debug("Adding module [%s] [EXTENSION]", name)
+            filename = loader.get_filename(name)
+            cached = self._get_cached(filename)
         elif isinstance(loader, (SourceFileLoader, SourcelessFileLoader)):
             filename = loader.get_filename(name)
+            cached = self._get_prefetched(name, filename)
+            if cached is None:
+                cached = self._get_cached(filename)
             try:
-                if (
+                if cached is not None:
+                    logger.debug("Adding module [%s] [CACHED]", name)
+                    module.code = cached[0]
+                elif (
                     isinstance(loader, SourcelessFileLoader)
                     or self.optimize == sys.flags.optimize
                 ):
                     # Load Python bytecode
                     logger.debug("Adding module [%s] [BYTECODE]", name)
                     module.code = loader.get_code(name)
+                elif self.defer_compile and (
+                    scanned := _load_cached_bytecode(filename, self.optimize)
+                ):
+                    # The bytecode cached at the optimization level is used
+                    # to find the imports; the source is compiled when the
+                    # code is used
+                    logger.debug("Adding module [%s] [DEFERRED]", name)
+                    module.defer_code(partial(self._compile_deferred, module))
                 else:
                     # Load & compile Python source code
                     logger.debug("Adding module [%s] [SOURCE]", name)
@@ -521,42 +614,361 @@ class ModuleFinder:
             module.in_import = False
             return False
 
+        if scanned is not None:
+            return self._load_module_code_deferred(
+                module, deferred_imports, scanned
+            )
+
         # Run custom hook for the module
+        original_code = module.code
         if module.hook:
-            module.hook(self)
+            self._run_hook(module)
 
         # Make changes in code object
         module.code = code_object_replace_package(module)
+
+        # Scan the module code for import statements; the imports of the
+        # original code (or of the stub file, for extension modules) are
+        # reused from the cache
+        imports: ImportsList | None = None
+        if module.code is original_code and cached is not None:
+            imports = cached[1]
+        if imports is None:
+            if module.code is not None:
+                imports = self._scan_imports(module.code)
+            elif module.stub_code is not None:
+                imports = self._scan_imports(module.stub_code)
+            else:
+                imports = []
+            if module.code is original_code:
+                self._put_cached(filename, original_code, imports)
+            elif cached is None:
+                self._put_cached(filename, original_code, None)
         if self.replace_paths:
             module.code = self._replace_paths_in_code(module)
-
-        # Scan the module code for import statements
-        self._scan_code(module, deferred_imports)
-        if module.code is None and module.stub_code is not None:
-            self._scan_code(module, deferred_imports, code=module.stub_code)
+        reason = "import" if module.code is not None else "stub"
+        self._scan_code(
+            module, deferred_imports, imports=imports, reason=reason
+        )
         # using lazy loader
-        if module.root.lazy and module.stub_code:
-            self._scan_code(module, deferred_imports, code=module.stub_code)
+        if module.root.lazy and module.code and module.stub_code:
+            self._scan_code(
+                module, deferred_imports, code=module.stub_code, reason="stub"
+            )
+
+        self._spill_code(module)
+        module.share_names(self._shared_names)
+        module.in_import = False
+        return True
 
+    def _load_module_code_deferred(
+        self, module: Module, deferred_imports: DeferredList, scanned: CodeType
+    ) -> bool:
+        """Scan the cached bytecode of a module compiled when used.
+
+        The bytecode is cached at the optimization level of the build, so it
+        has the imports of the final code. If the hook of the module uses its
+        code, it is compiled and scanned now.
+        """
+        if module.hook:
+            self._run_hook(module)
+        reason = "import"
+        if not module.code_deferred:
+            module.code = code_object_replace_package(module)
+            scanned = module.code
+            if self.replace_paths:
+                module.code = self._replace_paths_in_code(module)
+            if scanned is None:
+                scanned = module.stub_code
+                reason = "stub"
+        if scanned is not None:
+            self._scan_code(module, deferred_imports, scanned, reason=reason)
+        # using lazy loader
+        if module.root.lazy and reason == "import" and module.stub_code:
+            self._scan_code(
+                module, deferred_imports, code=module.stub_code, reason="stub"
+            )
+        self._spill_code(module)
+        module.share_names(self._shared_names)
         module.in_import = False
         return True
 
+    @timed("compile deferred")
+    def _compile_deferred(self, module: Module) -> CodeType | None:
+        """Compile the source of a module at the optimization level.
+
+        Once the module is scanned, the changes made to its code by the
+        finder are applied as well.
+        """
+        loader = module.loader
+        if not isinstance(loader, SourceFileLoader):
+            return None
+        source = loader.get_source(module.name)
+        if source is None:
+            return None
+        code = loader.source_to_code(
+            source, loader.get_filename(module.name), _optimize=self.optimize
+        )
+        if module.in_import:
+            return code
+        module.code = code
+        module.code = code_object_replace_package(module)
+        if self.replace_paths:
+            module.code = self._replace_paths_in_code(module)
+        return module.code
+
+    def compile_deferred(
+        self, modules: Iterable[Module]
+    ) -> Iterator[tuple[Module, Future[bytes] | None]]:
+        """Compile the modules whose code is deferred, in the workers.
+
+        The modules are yielded in order, each with the future of its code if
+        it is compiled by a worker. Each worker compiles the source of a module
+        at the optimization level and returns its marshalled code, so the code
+        objects are not kept by the finder. At most COMPILE_AHEAD modules per
+        job are compiled ahead of the module yielded, and nothing is submitted
+        if only one job is used.
+        """
+        if self.jobs == 1:
+            for module in modules:
+                yield module, None
+            return
+        window = self.jobs * COMPILE_AHEAD
+        pending: deque[tuple[Module, Future[bytes] | None]] = deque()
+        submitted = 0
+        try:
+            for module in modules:
+                future = self._submit_compile(module)
+                pending.append((module, future))
+                if future is not None:
+                    submitted += 1
+                # yield the modules that are not compiled by the workers and,
+                # when the window is full, wait for the first compiled one
+                while pending and (
+                    pending[0][1] is None or submitted >= window
+                ):
+                    item = pending.popleft()
+                    if item[1] is not None:
+                        submitted -= 1
+                    yield item
+            while pending:
+                yield pending.popleft()
+        finally:
+            for _, future in pending:
+                if future is not None:
+                    future.cancel()
+
+    def _submit_compile(self, module: Module) -> Future[bytes] | None:
+        """Submit the compilation of the deferred module to the workers."""
+        loader = module.loader
+        if (
+            not module.code_deferred
+            or not isinstance(loader, SourceFileLoader)
+            or self.spilled_code(module) is not None
+        ):
+            return None
+        # the same file name as the code compiled by _compile_deferred
+        source = loader.get_filename(module.name)
+        filename = source
+        if self.replace_paths:
+            filename = os.fspath(
+                self._replace_paths_in_filename(module, Path(source))
+            )
+        return self._get_executor().submit(
+            _compile_source,
+            source,
+            filename,
+            self.optimize,
+            module_package(module),
+        )
+
+    def _spill_code(self, module: Module) -> None:
+        """Store the code of the scanned module in the spill file.
+
+        The code object is dropped, and loaded again if it is used.
+        """
+        if self._spill is None or module.code_deferred:
+            return
+        code = module.code
+        if code is None:
+            return
+        self._spill.put(module.name, code)
+        module.defer_code(partial(self._spill.get, module.name))
+
+    def release_code(self, module: Module) -> None:
+        """Drop the code of the module once it is written.
+
+        When the modules are streamed, the code object is stored in the spill
+        file again, so it is only loaded if it is used later.
+        """
+        self._spill_code(module)
+
+    def spilled_code(self, module: Module) -> bytes | None:
+        """Return the marshalled code of the module, if it is streamed.
+
+        None is returned if the code was used since, as it may be changed.
+        """
+        if self._spill is None or not module.code_deferred:
+            return None
+        return self._spill.get_bytes(module.name)
+
+    def peek_code(self, module: Module) -> CodeType | None:
+        """Return the code of the module, without keeping a spilled one."""
+        data = self.spilled_code(module)
+        if data is not None:
+            return marshal.loads(data)  # noqa: S302
+        return module.code
+
+    def _get_cached(
+        self, filename: str
+    ) -> tuple[CodeType | None, ImportsList | None] | None:
+        """Return the code and imports of the file from the module cache."""
+        if self.module_cache is None or filename.startswith(
+            os.fspath(self.cache_path)
+        ):
+            return None
+        return self.module_cache.get(filename, self.optimize)
+
+    def _put_cached(
+        self,
+        filename: str | None,
+        code: CodeType | None,
+        imports: ImportsList | None,
+    ) -> None:
+        """Store the code and imports of the file in the module cache."""
+        if (
+            self.module_cache is None
+            or filename is None
+            or filename.startswith(os.fspath(self.cache_path))
+        ):
+            return
+        self.module_cache.put(filename, self.optimize, code, imports)
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            # compile in worker processes, unless the GIL is disabled
+            if IS_LINUX and getattr(sys, "_is_gil_enabled", lambda: True)():
+                self._executor = ProcessPoolExecutor(
+                    self.jobs, mp_context=multiprocessing.get_context("fork")
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    self.jobs, thread_name_prefix="cxfreeze-finder"
+                )
+        return self._executor
+
+    def _stop_prefetch(self) -> None:
+        """Stop the workers, discarding the modules not used."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+        self._prefetched.clear()
+
+    def _prefetch(self, name: str) -> None:
+        """Compile and scan the module in a worker, ahead of its import.
+
+        Only the first component of the name that is not imported yet is
+        prefetched, because the path of the submodules is unknown until their
+        parent is imported. The module is still searched and added by the
+        caller, so the result is used only when it comes from the same file.
+        """
+        path: Sequence[StrPath] = self.path
+        parent_name = ""
+        for part in name.split("."):
+            fullname = f"{parent_name}.{part}" if parent_name else part
+            if fullname in self.aliases:
+                return
+            if fullname not in self._modules:
+                break
+            parent = self._modules[fullname]
+            if parent is None or parent.path is None or not parent.has_code:
+                # excluded, missing, module or namespace package
+                return
+            path = parent.path
+            parent_name = fullname
+        else:
+            return
+        if fullname in self._prefetched:
+            return
+        self._prefetched[fullname] = self._get_executor().submit(
+            _compile_module,
+            fullname,
+            [os.path.normpath(p) for p in path],
+            self.optimize,
+            self.module_cache,
+            self.defer_compile,
+        )
+
+    def _prefetch_imports(self, module: Module, imports: ImportsList) -> None:
+        """Prefetch the modules imported by the module."""
+        for opc, args, _ in imports:
+            if "import" not in opc:
+                continue
+            name, relative_import_index, _ = args
+            if relative_import_index > 0:
+                # new style relative import
+                parent_name = module.name
+                if not module.is_package:
+                    parent_name = parent_name.rpartition(".")[0]
+                for _ in range(relative_import_index - 1):
+                    parent_name = parent_name.rpartition(".")[0]
+                if not parent_name:
+                    continue
+                name = f"{parent_name}.{name}" if name else parent_name
+            elif relative_import_index < 0 or not isinstance(name, str):
+                continue
+            if name and name not in module.exclude_names:
+                self._prefetch(name)
+
+    def _get_prefetched(
+        self, name: str, filename: str
+    ) -> tuple[CodeType | None, ImportsList | None] | None:
+        """Return the code and imports of the module compiled by a worker."""
+        future = self._prefetched.pop(name, None)
+        if future is None or future.cancel():
+            # a module waiting for a worker is compiled by the caller
+            return None
+        try:
+            result = future.result()
+        except Exception as exc:  # noqa: BLE001
+            logger.debug("Prefetch of [%s] failed: %s", name, exc)
+            return None
+        if result is None or result[0] != filename:
+            return None
+        code = marshal.loads(result[1])  # noqa: S302
+        imports = result[2]
+        self._put_cached(filename, code, imports)
+        return code, imports
+
     def _load_module_code_builtins(
         self, module: Module, deferred_imports: DeferredList
     ) -> Module | None:
         # Run custom hook for the module
         if module.hook:
-            module.hook(self)
+            self._run_hook(module)
         # Scan the module code for import statements
         self._scan_code(module, deferred_imports)
+        module.share_names(self._shared_names)
         module.in_import = False
         return module
 
+    def _run_hook(self, module: Module) -> None:
+        """Run the hook, as the caller of the modules that it includes."""
+        hook_module, self._hook_module = self._hook_module, module
+        try:
+            with phase(f"hook {module.name}"):
+                module.hook(self)
+        finally:
+            self._hook_module = hook_module
+
     def _load_module_code_libraries(self, module: Module) -> None:
         """Add dynamic libraries (dependencies) of the package."""
         if module is module.root:
             for source, target in module.libs():
                 self.lib_files.setdefault(source, target)
+                self.graph.add_edge(
+                    module.name, os.fspath(source.resolve()), "libs"
+                )
                 # use include_files on windows
                 if IS_WINDOWS:
                     self.include_files(source, target)
@@ -634,14 +1046,30 @@ class ModuleFinder:
         if code is None:
             return None
 
-        # Prepare the new filename.
-        original_filename = Path(code.co_filename)
+        new_filename = self._replace_paths_in_filename(
+            module, Path(code.co_filename)
+        )
+
+        # Run on subordinate code objects from function & class definitions.
+        consts = list(code.co_consts)
+        for i, const in enumerate(consts):
+            if isinstance(const, type(code)):
+                consts[i] = self._replace_paths_in_code(module.root, const)
+
+        return code_object_replace(
+            code, co_consts=consts, co_filename=os.fspath(new_filename)
+        )
+
+    def _replace_paths_in_filename(
+        self, module: Module, original_filename: Path
+    ) -> Path:
+        """Return the filename of the code of the module, as directed."""
         top_level_module: Module = module.root
         for search_value, replace_value in self.replace_paths:
             if search_value == "*":
                 if top_level_module.file is None:
                     continue
-                if top_level_module.path:
+                if top_level_module.is_package:
                     search_dir = top_level_module.file.parent.parent
                 else:
                     search_dir = top_level_module.file.parent
@@ -653,57 +1081,62 @@ class ModuleFinder:
                 break
         else:
             new_filename = original_filename
+        return new_filename
 
-        # Run on subordinate code objects from function & class definitions.
-        consts = list(code.co_consts)
-        for i, const in enumerate(consts):
-            if isinstance(const, type(code)):
-                consts[i] = self._replace_paths_in_code(
-                    top_level_module, const
-                )
-
-        return code_object_replace(
-            code, co_consts=consts, co_filename=os.fspath(new_filename)
-        )
-
+    @timed("scan code")
     def _scan_code(
         self,
         module: Module,
         deferred_imports: DeferredList,
         code: CodeType | None = None,
-        top_level: bool = True,
+        imports: ImportsList | None = None,
+        reason: str = "import",
     ) -> None:
         """Scan code, looking for imported modules.
 
         Also, keeping track of the constants that have been created in order
-        to better tell which modules are truly missing.
+        to better tell which modules are truly missing. The import statements
+        are recorded in the import graph with the given reason.
         """
-        if code is None:
-            code = module.code
-        if code is None:
-            return
+        if imports is None:
+            if code is None:
+                code = module.code
+            if code is None:
+                return
+            imports = self._scan_imports(code)
+        if self.jobs > 1:
+            self._prefetch_imports(module, imports)
 
         imported_module = None
-        for opc, args in scan_code(code):
+        for opc, args, top_level in imports:
             # import statement: attempt to import module
             if "import" in opc:
                 name, relative_import_index, from_list = args
+                edge_reason = reason
                 if opc in ("__import__", "import_module"):
                     logger.debug("Scan code detected %s(%r)", opc, name)
+                    edge_reason = opc
                 if name not in module.exclude_names:
                     imported_module = self._import_module(
                         name, deferred_imports, module, relative_import_index
                     )
+                    if imported_module is not None:
+                        self._add_edge(
+                            module, imported_module.name, edge_reason
+                        )
+                    elif module.name in self._bad_modules.get(name, ()):
+                        self._add_edge(module, name, edge_reason)
                     if imported_module is not None and (
                         from_list
                         and from_list != ("*",)
-                        and imported_module.path is not None
+                        and imported_module.is_package
                     ):
                         self._ensure_from_list(
                             module,
                             imported_module,
                             from_list,
                             deferred_imports,
+                            reason=edge_reason,
                         )
 
             # import * statement: copy all global names
@@ -715,16 +1148,24 @@ class ModuleFinder:
                 (name,) = args
                 module.global_names.add(name)
 
-        # Scan the code objects from function & class definitions
-        if code.co_consts:
-            for constant in code.co_consts:
-                if isinstance(constant, CodeType):
-                    self._scan_code(
-                        module,
-                        deferred_imports,
-                        code=constant,
-                        top_level=False,
-                    )
+    @staticmethod
+    def _scan_imports(
+        code: CodeType,
+        top_level: bool = True,
+        imports: ImportsList | None = None,
+    ) -> ImportsList:
+        """Return the imports and stored names found in the code.
+
+        The code objects from function & class definitions are also scanned,
+        after the top level code.
+        """
+        if imports is None:
+            imports = []
+        imports.extend((opc, args, top_level) for opc, args in scan_code(code))
+        for constant in code.co_consts:
+            if isinstance(constant, CodeType):
+                ModuleFinder._scan_imports(constant, False, imports)
+        return imports
 
     def add_alias(self, name: str, alias_for: str) -> None:
         """Add an alias for a particular module.
@@ -822,6 +1263,53 @@ class ModuleFinder:
             imports.update(dists)
         return imports
 
+    def import_graph(self) -> ImportGraph:
+        """Return the import graph, with the modules found as its nodes.
+
+        Each node has the kind of the module and the size of its file; the
+        extension modules are linked to their binary files.
+        """
+        graph = self.graph
+        for name, module in self._modules.items():
+            if module is None:  # excluded
+                continue
+            if module.name != name:
+                graph.add_node(name, kind="alias", size=0)
+                graph.add_edge(name, module.name, "alias")
+                continue
+            file = module.file
+            if name in self.builtin_modules:
+                kind = "builtin"
+                file = None
+            elif module in self.namespaces:
+                kind = "namespace"
+            elif isinstance(module.loader, ExtensionFileLoader):
+                kind = "extension"
+            elif module.is_package:
+                kind = "package"
+            else:
+                kind = "module"
+            size = 0
+            if file is not None:
+                with suppress(OSError):
+                    size = file.stat().st_size
+            graph.add_node(
+                name,
+                kind=kind,
+                size=size,
+                file=os.fspath(file) if file is not None else None,
+            )
+            if kind == "extension" and file is not None:
+                graph.add_edge(name, os.fspath(file.resolve()), "extension")
+        # the missing modules of relative imports
+        linked = {(source, target) for source, target, _ in graph.edges}
+        for name, callers in self._bad_modules.items():
+            graph.add_node(name, kind="missing", size=0)
+            for caller in callers:
+                if (caller, name) not in linked:
+                    graph.add_edge(caller, name, "import")
+        return graph
+
     def include_file_as_module(
         self, path: StrPath, name: str | None = None
     ) -> Module | None:
@@ -832,6 +1320,7 @@ class ModuleFinder:
         deferred_imports: DeferredList = []
         module = self._load_module_from_file(name, path, deferred_imports)
         if module is not None:
+            self._add_edge(None, module.name, "script")
             parent = self._get_parent_by_name(name)
             if parent is not None:
                 parent.global_names.add(module.name)
@@ -861,6 +1350,8 @@ class ModuleFinder:
         # Include the module.
         deferred_imports: DeferredList = []
         module = self._import_module(name, deferred_imports, caller)
+        if module is not None:
+            self._add_edge(caller, module.name, "includes")
         self._import_deferred_imports(deferred_imports, skip_in_import=True)
         return module
 
@@ -878,11 +1369,21 @@ class ModuleFinder:
         # Include the package.
         deferred_imports: DeferredList = []
         module = self._import_module(name, deferred_imports, caller)
-        if module and module.path:
+        if module is not None:
+            self._add_edge(caller, module.name, "packages")
+        if module and module.is_package:
             self._import_all_sub_modules(module, deferred_imports)
         self._import_deferred_imports(deferred_imports, skip_in_import=True)
         return module
 
+    def invalidate_caches(self) -> None:
+        """Forget the listings of the directories in the search path.
+
+        Hooks that create modules in the search path, outside of cache_path,
+        should call this method before importing them.
+        """
+        self._resolver.invalidate_caches()
+
     @cached_property
     def modules(self) -> list[Module]:
         """Sorted list of modules expected in the frozen executable."""
@@ -902,6 +1403,7 @@ class ModuleFinder:
                 if module.file and module.file.name == "frozen"
             }
         valid_modules -= builtin
+        self._stop_prefetch()
         return sorted(valid_modules, key=lambda module: module.name)
 
     @property
@@ -942,3 +1444,101 @@ def fake_frame(filename: str, lineno: int) -> FrameType:
     code = compile(source, filename, "exec")
     exec(code, {"inspect": inspect}, res)  # noqa:S102
     return res["f"]
+
+
+def _load_cached_bytecode(filename: str, optimize: int) -> CodeType | None:
+    """Return the code cached in __pycache__ at the optimization level.
+
+    None is returned if there is no cached bytecode at this level, or if it
+    is out of date.
+    """
+    try:
+        cached = cache_from_source(filename, optimization=optimize or "")
+        with open(cached, "rb") as file:
+            data = file.read()
+        if not _is_up_to_date(data, filename):
+            return None
+        code = marshal.loads(memoryview(data)[16:])  # noqa: S302
+    except (EOFError, NotImplementedError, OSError, TypeError, ValueError):
+        return None
+    return code if isinstance(code, CodeType) else None
+
+
+def _is_up_to_date(data: bytes, filename: str) -> bool:
+    """Return True if the pyc data matches the source, as imports check it."""
+    if len(data) < 16 or data[:4] != MAGIC_NUMBER:
+        return False
+    flags = int.from_bytes(data[4:8], "little")
+    if flags & 0b01:
+        # hash based (PEP 552), the unchecked ones are not checked
+        if not flags & 0b10:
+            return True
+        with open(filename, "rb") as file:
+            return source_hash(file.read()) == data[8:16]
+    source_stat = os.stat(filename)
+    return data[8:16] == struct.pack(
+        "<LL",
+        int(source_stat.st_mtime) & 0xFFFF_FFFF,
+        source_stat.st_size & 0xFFFF_FFFF,
+    )
+
+
+def _compile_source(
+    source: str, filename: str, optimize: int, package: str | None
+) -> bytes:
+    """Compile the source of a module and marshal it; runs in a worker."""
+    with open(source, "rb") as file:
+        data = file.read()
+    code = compile(
+        data, filename, "exec", dont_inherit=True, optimize=optimize
+    )
+    return marshal.dumps(code_object_set_package(code, package))
+
+
+def _compile_module(
+    name: str,
+    path: list[str],
+    optimize: int,
+    module_cache: ModuleCache | None,
+    defer_compile: bool = False,
+) -> tuple[str, bytes, ImportsList] | None:
+    """Search, compile and scan a Python module; runs in a worker.
+
+    Returns the filename, the marshalled code object and the imports of the
+    module, or None if the module is not a Python module, is in the module
+    cache, is compiled when used or cannot be compiled (the error is
+    reported by ModuleFinder).
+    """
+    try:
+        spec = PathFinder.find_spec(name, path)
+    except Exception:  # noqa: BLE001
+        spec = None
+    loader = spec.loader if spec else None
+    if not isinstance(loader, (SourceFileLoader, SourcelessFileLoader)):
+        return None
+    filename = loader.get_filename(name)
+    if module_cache is not None and module_cache.contains(filename, optimize):
+        return None
+    if (
+        defer_compile
+        and isinstance(loader, SourceFileLoader)
+        and optimize != sys.flags.optimize
+        and _load_cached_bytecode(filename, optimize) is not None
+    ):
+        return None
+    code: CodeType | None = None
+    with suppress(ImportError, SyntaxError):
+        if (
+            isinstance(loader, SourcelessFileLoader)
+            or optimize == sys.flags.optimize
+        ):
+            code = loader.get_code(name)
+        else:
+            source = loader.get_source(name)
+            if source is not None:
+                code = loader.source_to_code(
+                    source, filename, _optimize=optimize
+                )
+    if code is None:
+        return None
+    return filename, marshal.dumps(code), ModuleFinder._scan_imports(code)  # noqa: SLF001
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import hashlib
 import marshal
 import os
 import shutil
@@ -11,16 +12,31 @@ import sys
 import sysconfig
 import time
 from abc import abstractmethod
-from contextlib import suppress
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import ExitStack, suppress
 from functools import cached_property
-from importlib.util import MAGIC_NUMBER
+from importlib.machinery import SOURCE_SUFFIXES, SourceFileLoader
+from importlib.util import MAGIC_NUMBER, source_hash
 from pathlib import Path
 from pkgutil import resolve_name
+from py_compile import PycInvalidationMode
+from types import CodeType
 from typing import TYPE_CHECKING, Any, cast
 from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile, ZipInfo
 
 from setuptools import Distribution
 
+from cx_Freeze import (
+    _archive,
+    _dedupe,
+    _importindex,
+    _importtime,
+    _lazy,
+    _optional,
+    _timings,
+)
+from cx_Freeze._bytecode import scan_code
+from cx_Freeze._cache import ModuleCache
 from cx_Freeze._compat import (
     ABI_THREAD,
     BUILD_EXE_DIR,
@@ -31,8 +47,13 @@ from cx_Freeze._compat import (
     IS_WINDOWS,
     PYTHON_VERSION,
 )
+from cx_Freeze._graph import ROOT
 from cx_Freeze._license import frozen_license
+from cx_Freeze._manifest import BuildManifest
 from cx_Freeze._metadata import DistributionCache
+from cx_Freeze._sizereport import SizeReport, format_size
+from cx_Freeze._timings import Timings, timed
+from cx_Freeze._zip import ZipWriter
 from cx_Freeze.common import process_path_specs, resource_path
 from cx_Freeze.dep_parser import ELFParser, Parser, PEParser
 from cx_Freeze.exception import OptionError
@@ -40,7 +61,7 @@ from cx_Freeze.finder import ModuleFinder
 from cx_Freeze.module import ConstantsModule, Module
 
 if TYPE_CHECKING:
-    from collections.abc import Mapping, Sequence
+    from collections.abc import Callable, Iterable, Mapping, Sequence
 
     from cx_Freeze._typing import IncludesList, InternalIncludesList, StrPath
     from cx_Freeze.executable import Executable
@@ -64,6 +85,9 @@ elif IS_MACOS:
 
 __all__ = ["Freezer"]
 
+# 1980-01-01 00:00:00 UTC, the earliest date supported by zip files
+ZIP_EPOCH = 315532800
+
 WARNING_PIP_FREEZE_CORE_IN_CONDA_PYTHON = """WARNING:
 
     It is not recommended to use freeze-core installed using pip in the conda \
@@ -90,6 +114,9 @@ have full write access to built executable.
 class Freezer:
     """Freezer base class."""
 
+    # the reason of the edges between binary files in the import graph
+    _dependency_reason: str
+
     def __new__(
         cls, *args: Any, **kwargs
     ) -> WinFreezer | DarwinFreezer | LinuxFreezer:
@@ -127,6 +154,26 @@ class Freezer:
         zip_include_packages: Sequence[str] | None = None,
         zip_exclude_packages: Sequence[str] | None = None,
         zip_filename: StrPath | None = None,
+        cache: bool = True,
+        cache_dir: StrPath | None = None,
+        clear_cache: bool = False,
+        incremental: bool = False,
+        jobs: int = 1,
+        compress_level: int | None = None,
+        reproducible: bool | None = None,
+        invalidation_mode: PycInvalidationMode | str | None = None,
+        import_index: bool = False,
+        archive_format: str | None = None,
+        graph_output: StrPath | None = None,
+        size_report: StrPath | None = None,
+        tree_shaking: str | None = None,
+        lazy_imports: list[str] | None = None,
+        import_profiler: bool = False,
+        timings: bool = False,
+        trace_file: StrPath | None = None,
+        deduplicate: str | None = None,
+        defer_compile: bool = False,
+        stream_modules: bool = False,
     ) -> None:
         executables = self._validate_executables(executables)
         self.executables: list[Executable] = executables
@@ -141,11 +188,15 @@ class Freezer:
         self.packages: set[str] = set(packages or [])
         self.replace_paths: list[tuple[str, str]] = list(replace_paths or [])
         self.compress: bool = True if compress is None else compress
+        self.compress_level: int | None = self._validate_compress_level(
+            compress_level
+        )
         self.optimize: int = int(optimize or 0)
         self.path: list[str] = self._validate_path(path)
         # include-msvcr is used on Windows and some MSYS2 environments
         self.include_msvcr: bool = IS_UCRT and bool(include_msvcr)
         self.include_msvcr_version: str | None = include_msvcr_version
+        self.incremental: bool = bool(incremental)
         self.target_dir = target_dir
         self.default_bin_includes: list[str] = self._default_bin_includes()
         self.default_bin_excludes: list[str] = self._default_bin_excludes()
@@ -171,6 +222,38 @@ class Freezer:
         )
         self.silent = int(silent or 0)
         self.metadata: Any = metadata
+        self.jobs: int = self._validate_jobs(jobs)
+        self.defer_compile: bool = bool(defer_compile)
+        self.stream_modules: bool = bool(stream_modules)
+        self.source_date_epoch: int | None = self._validate_reproducible(
+            reproducible
+        )
+        self.reproducible: bool = self.source_date_epoch is not None
+        self.invalidation_mode: PycInvalidationMode = (
+            self._validate_invalidation_mode(invalidation_mode)
+        )
+        self.import_index: bool = bool(import_index)
+        self.archive_format: str = self._validate_archive_format(
+            archive_format
+        )
+        self.graph_output: Path | None = (
+            Path(graph_output) if graph_output else None
+        )
+        self.size_report: Path | None = (
+            Path(size_report) if size_report else None
+        )
+        self.tree_shaking: str = self._validate_tree_shaking(tree_shaking)
+        self._optional_modules: set[str] = set()
+        self._tree_shaking_saving: tuple[int, int] | None = None
+        self.lazy_imports: list[str] = list(lazy_imports or [])
+        self.import_profiler: bool = bool(import_profiler)
+        self.timings: bool = bool(timings)
+        self.trace_file: Path | None = Path(trace_file) if trace_file else None
+        self.deduplicate: str = self._validate_deduplicate(deduplicate)
+        self._deduplicate_saving: tuple[int, int] | None = None
+        self._timings: Timings | None = None
+        if self.timings or self.trace_file is not None:
+            self._timings = Timings(trace=self.trace_file is not None)
 
         self.zip_exclude_packages: list[str] = ["*"]
         self.zip_include_packages: list[str] = []
@@ -184,10 +267,28 @@ class Freezer:
             zip_filename = Path(zip_filename).with_suffix(".zip").name
             self.zip_filename = self.target_dir / "lib" / zip_filename
 
+        self.module_cache: ModuleCache | None = None
+        if cache:
+            self.module_cache = ModuleCache(cache_dir)
+            if clear_cache:
+                self.module_cache.clear()
+
         self._symlinks: set[tuple[Path, Path, bool]] = set()
         self.files_copied: set[Path] = set()
+        self._executor: ThreadPoolExecutor | None = None
+        self._pending: dict[Path, Future[None]] = {}
         self._warnings: dict[str, bool] = {}
-        self.finder: ModuleFinder = self._get_module_finder()
+        # the owner of the files being copied, for the size report
+        self._owner: str | None = None
+        self._size_report: SizeReport | None = None
+        if self._timings is None:
+            self.finder: ModuleFinder = self._get_module_finder()
+        else:
+            _timings.start(self._timings)
+            try:
+                self.finder = self._get_module_finder()
+            finally:
+                _timings.stop()
         self._check_installation()
 
     @property
@@ -203,13 +304,18 @@ class Freezer:
         if os.fspath(path) in self.path:
             msg = "the build_exe directory cannot be used as search path"
             raise OptionError(msg)
-        if path.is_dir():
-            # starts in a clean directory
-            try:
+        self._manifest: BuildManifest | None = None
+        try:
+            if self.incremental:
+                # reuse the unchanged files of the previous build
+                self._manifest = BuildManifest(path)
+                self._manifest.prepare()
+            elif path.is_dir():
+                # starts in a clean directory
                 shutil.rmtree(path)
-            except OSError:
-                msg = "the build_exe directory cannot be cleaned"
-                raise OptionError(msg) from None
+        except OSError:
+            msg = "the build_exe directory cannot be cleaned"
+            raise OptionError(msg) from None
         self._targetdir: Path = path
 
     def _add_license(self) -> None:
@@ -239,6 +345,7 @@ class Freezer:
             if dist.installer == "pip":
                 print(WARNING_PIP_FREEZE_CORE_IN_CONDA_PYTHON, file=sys.stderr)
 
+    @timed("copy file")
     def _copy_file(
         self,
         source: Path,
@@ -257,23 +364,97 @@ class Freezer:
         if source == target:
             return
         self._create_directory(target.parent)
-        if self.silent < 1:
-            print(f"copying {source} -> {target}")
-        shutil.copyfile(source, target)
-        if include_mode:
-            shutil.copymode(source, target)
-            shutil.copystat(source, target)
-        else:
-            try:
+        # executables are always copied, because the resources are updated
+        if include_mode or not self._restore_file(source, target):
+            if self.silent < 1:
+                print(f"copying {source} -> {target}")
+            if include_mode:
+                shutil.copyfile(source, target)
+                shutil.copymode(source, target)
                 shutil.copystat(source, target)
-            except OSError:
-                if self.silent < 3:
-                    print("WARNING: unable to copy file metadata:", target)
+            else:
+                self._submit(target, self._copy_file_data, source, target)
+        if self._manifest is not None and not include_mode:
+            self._manifest.record(source, target)
+        if self._size_report is not None:
+            self._size_report.record(target, self._owner)
         self.files_copied.add(target)
 
         # handle post-copy tasks, including copying dependencies
         self._post_copy_hook(source, target, copy_dependent_files)
 
+    def _copy_file_data(self, source: Path, target: Path) -> None:
+        shutil.copyfile(source, target)
+        try:
+            shutil.copystat(source, target)
+        except OSError:
+            if self.silent < 3:
+                print("WARNING: unable to copy file metadata:", target)
+
+    def _submit(
+        self,
+        target: Path,
+        func: Callable[..., Any],
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
+        """Run a task that writes the target file.
+
+        If the number of jobs is greater than one, the task runs in a worker
+        thread, after the previous tasks submitted for the same target.
+        """
+        if self.jobs == 1:
+            func(*args, **kwargs)
+            return
+        self._pending[target] = self._get_executor().submit(
+            self._run_task, self._pending.get(target), func, *args, **kwargs
+        )
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                self.jobs, thread_name_prefix="cxfreeze"
+            )
+        return self._executor
+
+    @staticmethod
+    def _run_task(
+        previous: Future[None] | None,
+        func: Callable[..., Any],
+        *args: Any,
+        **kwargs: Any,
+    ) -> None:
+        if previous is not None:
+            previous.result()
+        func(*args, **kwargs)
+
+    def _wait_pending(self, cancel: bool = False) -> None:
+        """Wait for the completion of the tasks running in worker threads.
+
+        :param cancel: Whether the tasks not started are cancelled, without
+            waiting for the results of the others.
+        """
+        if self._executor is None:
+            return
+        try:
+            if not cancel:
+                for future in self._pending.values():
+                    future.result()
+        finally:
+            self._executor.shutdown(cancel_futures=cancel)
+            self._executor = None
+            self._pending.clear()
+
+    def _restore_file(self, source: Path, target: Path) -> bool:
+        """Reuse the file of the previous build, if building incrementally."""
+        if self._manifest is None or not self._manifest.restore(
+            source, target
+        ):
+            return False
+        if self.silent < 1:
+            print(f"unchanged {source} -> {target}")
+        return True
+
     def _copy_package_data(self, module: Module, target_dir: Path) -> None:
         """Copy any non-Python files to the target directory."""
         if module.file is None:
@@ -325,6 +506,12 @@ class Freezer:
         excludes = set()
         for exclude in self.finder.excluded_submodules(module_name):
             excludes.add(exclude.removeprefix(module_name))
+        if self.tree_shaking == "drop":
+            excludes.update(
+                name.removeprefix(module_name)
+                for name in self._optional_modules
+                if name.startswith(f"{module_name}.")
+            )
         copy_tree(source_dir, target_dir, excludes)
 
     def _pre_copy_hook(self, source: Path, target: Path) -> tuple[Path, Path]:
@@ -363,9 +550,14 @@ class Freezer:
     def _freeze_executable(self, exe: Executable) -> None:
         finder: ModuleFinder = self.finder
         finder.include_file_as_module(exe.main_script, exe.main_module_name)
-        finder.include_file_as_module(exe.init_script, exe.init_module_name)
+        init_module = finder.include_file_as_module(
+            exe.init_script, exe.init_module_name
+        )
+        if init_module is not None and self._startup_modules:
+            self._add_startup_imports(init_module)
 
         # copy the executable and its dependencies
+        self._owner = "<executable>"
         target_path = self.target_dir / exe.target_name
         self._get_top_dependencies(exe.base)
         self._copy_file(
@@ -378,6 +570,37 @@ class Freezer:
         # Add license and resources like version metadata and icon
         self._add_license()
         self._add_resources(exe)
+        self._owner = None
+
+    @property
+    def _startup_modules(self) -> dict[str, str]:
+        """The modules that install finders, imported at the end of init."""
+        modules: dict[str, str] = {}
+        if self.import_index:
+            modules[_importindex.INDEX_MODULE] = _importindex.__file__
+        if self.archive_format == "mmap":
+            modules[_archive.ARCHIVE_MODULE] = _archive.__file__
+        if self.tree_shaking == "archive":
+            modules[_optional.OPTIONAL_MODULE] = _optional.__file__
+        if self.lazy_imports:
+            modules[_lazy.LAZY_MODULE] = _lazy.__file__
+        # the last one installed is the first finder used
+        if self.import_profiler:
+            modules[_importtime.IMPORTTIME_MODULE] = _importtime.__file__
+        return modules
+
+    def _add_startup_imports(self, module: Module) -> None:
+        """Import the startup modules at the end of the init module."""
+        loader = module.loader
+        if module.code is None or not isinstance(loader, SourceFileLoader):
+            return
+        source = loader.get_source(module.name) or ""
+        imports = "".join(f"import {name}\n" for name in self._startup_modules)
+        module.code = loader.source_to_code(
+            f"{source}\n{imports}",
+            module.code.co_filename,  # the path is already replaced
+            _optimize=self.optimize,
+        )
 
     @abstractmethod
     def _get_top_dependencies(self, source: StrPath) -> None:
@@ -431,6 +654,7 @@ class Freezer:
         ]
         return self._validate_bin_path(bin_path)
 
+    @timed("module finder")
     def _get_module_finder(self) -> ModuleFinder:
         finder = ModuleFinder(
             self.constants_module,
@@ -443,7 +667,17 @@ class Freezer:
             zip_include_packages=self.zip_include_packages,
             zip_include_all_packages=self.zip_include_all_packages,
             zip_includes=self.zip_includes,
+            module_cache=self.module_cache,
+            jobs=self.jobs,
+            defer_compile=self.defer_compile,
+            stream_modules=self.stream_modules,
         )
+        if self.reproducible:
+            # the modules created while freezing use a temporary path
+            finder.replace_paths = [
+                *finder.replace_paths,
+                (os.fspath(finder.cache_path), ""),
+            ]
         for name in self.includes:
             finder.include_module(name)
         for name in self.packages:
@@ -456,6 +690,8 @@ class Freezer:
             startup = resource_path("initscripts/__startup__.py")
             if startup:
                 finder.include_file_as_module(startup)
+        for name, path in self._startup_modules.items():
+            finder.include_file_as_module(path, name)
         return finder
 
     def _post_freeze_hook(self) -> None:
@@ -543,6 +779,92 @@ class Freezer:
         dist = Distribution(attrs={"executables": executables})
         return dist.executables  # ty: ignore[unresolved-attribute]
 
+    @staticmethod
+    def _validate_compress_level(compress_level: int | None) -> int | None:
+        if compress_level is None:
+            return None
+        compress_level = int(compress_level)
+        if not 0 <= compress_level <= 9:
+            msg = "the compression level must be a number between 0 and 9"
+            raise OptionError(msg)
+        return compress_level
+
+    @staticmethod
+    def _validate_reproducible(reproducible: bool | None) -> int | None:
+        """Return the timestamp used in reproducible builds, if enabled.
+
+        Reproducible builds are enabled by default when SOURCE_DATE_EPOCH is
+        set; without it, the timestamp is the minimum supported by zip files.
+        """
+        source_date_epoch = os.environ.get("SOURCE_DATE_EPOCH")
+        if reproducible is None:
+            reproducible = bool(source_date_epoch)
+        if not reproducible:
+            return None
+        if not source_date_epoch:
+            return ZIP_EPOCH
+        try:
+            return max(int(source_date_epoch), ZIP_EPOCH)
+        except ValueError:
+            msg = "SOURCE_DATE_EPOCH must be an integer (seconds since epoch)"
+            raise OptionError(msg) from None
+
+    def _validate_invalidation_mode(
+        self, invalidation_mode: PycInvalidationMode | str | None
+    ) -> PycInvalidationMode:
+        if invalidation_mode is None:
+            if self.reproducible:
+                return PycInvalidationMode.UNCHECKED_HASH
+            return PycInvalidationMode.TIMESTAMP
+        if isinstance(invalidation_mode, PycInvalidationMode):
+            return invalidation_mode
+        try:
+            return PycInvalidationMode[
+                invalidation_mode.upper().replace("-", "_")
+            ]
+        except KeyError:
+            choices = ", ".join(
+                mode.name.lower().replace("_", "-")
+                for mode in PycInvalidationMode
+            )
+            msg = f"the invalidation mode must be one of: {choices}"
+            raise OptionError(msg) from None
+
+    @staticmethod
+    def _validate_archive_format(archive_format: str | None) -> str:
+        archive_format = (archive_format or "zip").lower()
+        if archive_format not in ("zip", "mmap"):
+            msg = "the archive format must be one of: zip, mmap"
+            raise OptionError(msg)
+        return archive_format
+
+    @staticmethod
+    def _validate_tree_shaking(tree_shaking: str | None) -> str:
+        tree_shaking = (tree_shaking or "off").lower()
+        if tree_shaking not in ("off", "archive", "drop"):
+            msg = "the tree shaking mode must be one of: off, archive, drop"
+            raise OptionError(msg)
+        return tree_shaking
+
+    @staticmethod
+    def _validate_deduplicate(deduplicate: str | None) -> str:
+        deduplicate = (deduplicate or "off").lower()
+        if deduplicate not in _dedupe.DEDUPLICATE_MODES:
+            choices = ", ".join(_dedupe.DEDUPLICATE_MODES)
+            msg = f"the deduplicate mode must be one of: {choices}"
+            raise OptionError(msg)
+        return deduplicate
+
+    @staticmethod
+    def _validate_jobs(jobs: int | None) -> int:
+        jobs = 1 if jobs is None else int(jobs)
+        if jobs < 0:
+            msg = "the number of jobs must be a positive number (or zero)"
+            raise OptionError(msg)
+        if jobs == 0:
+            jobs = os.cpu_count() or 1
+        return jobs
+
     @staticmethod
     def _validate_path(path: list[StrPath] | None) -> list[str]:
         """Return valid search path for modules.
@@ -638,6 +960,211 @@ class Freezer:
         self.zip_exclude_packages = zip_exclude_packages
         self.zip_include_all_packages = zip_include_all_packages
 
+    def _find_optional_modules(self) -> set[str]:
+        """Return the modules that are only reached through include_package.
+
+        The modules reached from the scripts, the includes and the packages
+        options (including all their submodules) are required, following the
+        edges of the import graph except the submodules added by a blanket
+        include_package, as done by many hooks. The other modules included
+        are optional. Using the archive mode, only the modules that are
+        stored in the zip file can be optional.
+        """
+        successors: dict[str, list[tuple[str, str]]] = {}
+        for source, target, reason in self.finder.graph.edges:
+            successors.setdefault(source, []).append((target, reason))
+        modules = self.finder.modules
+        roots = [
+            target
+            for target, reason in successors.get(ROOT, ())
+            if reason in ("script", "includes")
+        ]
+        # the codecs are imported by name
+        for package in [*self.packages, "encodings"]:
+            prefix = f"{package}."
+            roots.extend(
+                module.name
+                for module in modules
+                if module.name == package or module.name.startswith(prefix)
+            )
+
+        def reach(nodes: list[str], follow_packages: bool) -> set[str]:
+            seen = set(nodes)
+            while nodes:
+                for target, reason in successors.get(nodes.pop(), ()):
+                    if target in seen:
+                        continue
+                    if follow_packages or reason != "package":
+                        seen.add(target)
+                        nodes.append(target)
+            return seen
+
+        required = reach(roots, follow_packages=False)
+        included = reach([ROOT], follow_packages=True)
+        return {
+            module.name
+            for module in modules
+            if module.name in included
+            and module.name not in required
+            and (
+                self.tree_shaking == "drop"
+                or (module.has_code and module.in_file_system == 0)
+            )
+        }
+
+    def _bootstrap_modules(self) -> set[str]:
+        """Return the names of the modules needed to install the finders.
+
+        These are the modules imported, directly or not, by the init modules,
+        the startup modules and the standard library, which is also used to
+        start the interpreter (the imports of the modules embedded in the
+        base executable are not known, so the whole library is kept).
+        """
+        modules = {module.name: module for module in self.finder.modules}
+        pending = [exe.init_module_name for exe in self.executables]
+        pending += [*self._startup_modules, "__startup__"]
+        pending.append(self.constants_module.module_name)
+        pending += [
+            name
+            for name in modules
+            if name.partition(".")[0] in sys.stdlib_module_names
+        ]
+        names: set[str] = set()
+        while pending:
+            name = pending.pop()
+            module = modules.get(name)
+            if module is None or name in names:
+                continue
+            names.add(name)
+            if module.parent is not None:
+                pending.append(module.parent.name)
+            code = self.finder.peek_code(module)
+            codes = [code] if code is not None else []
+            while codes:
+                code = codes.pop()
+                codes += [c for c in code.co_consts if isinstance(c, CodeType)]
+                for opc, args in scan_code(code):
+                    if "import" not in opc or not isinstance(args[0], str):
+                        continue
+                    name, level, from_list = args
+                    if level > 0:
+                        # relative import
+                        package = module.name.split(".")
+                        if module.path is None:
+                            package.pop()
+                        if level > 1:
+                            del package[1 - level :]
+                        name = ".".join([*package, name] if name else package)
+                    pending.append(name)
+                    pending += [f"{name}.{item}" for item in from_list or ()]
+        return names
+
+    def _library_digest(self) -> hashlib._Hash:
+        """Return a digest of the contents to be written to the zip file.
+
+        It is updated with each entry as the zip file is written. The
+        timestamps that change on every build are not taken into account, so
+        the zip file of the previous build can be reused.
+        """
+        digest = hashlib.sha256(MAGIC_NUMBER)
+        options = (
+            self.compress,
+            self.compress_level,
+            self.invalidation_mode,
+            self.optimize,
+            self.replace_paths,
+        )
+        digest.update(repr(options).encode())
+        return digest
+
+    def _update_library_digest(
+        self,
+        digest: hashlib._Hash,
+        module: Module,
+        zinfo: ZipInfo,
+        data: bytes,
+    ) -> None:
+        """Update the digest of the zip file with the entry of a module."""
+        digest.update(f"\0{zinfo.filename}\0".encode())
+        file = module.file
+        if module.name == self.constants_module.module_name:
+            values = self.constants_module.values
+            for name in sorted(values):
+                if name not in ("BUILD_TIMESTAMP", "SOURCE_TIMESTAMP"):
+                    digest.update(f"{name}={values[name]!r}\0".encode())
+        elif file is not None and file.is_relative_to(self.finder.cache_path):
+            # the code refers to a temporary path that is not reproducible
+            digest.update(file.read_bytes())
+        elif file is not None and file.is_file():
+            # the marshalled code of a module loaded from the module cache
+            # can differ from a compiled one, so use the source file stat
+            file_stat = file.stat()
+            digest.update(
+                f"{file}\0{file_stat.st_size}\0{file_stat.st_mtime_ns}".encode()
+            )
+        else:
+            # skip the pyc header
+            digest.update(data[16:])
+
+    def _pyc_data(
+        self, module: Module, compiled: Future[bytes] | None = None
+    ) -> tuple[bytes, int]:
+        """Return the pyc data of the module and its timestamp.
+
+        The header uses the timestamp of the source or the hash of the source
+        (PEP 552), according to the invalidation mode. In reproducible builds
+        the code is marshalled after a round trip, because the marshalled data
+        of a code object depends on its origin.
+
+        :param compiled: The marshalled code compiled by a worker, if any; it
+            is compiled by the caller if the worker failed.
+        """
+        code = None
+        if compiled is not None:
+            with suppress(Exception):
+                code = compiled.result()
+        if code is None:
+            code = self.finder.spilled_code(module)
+        if code is None:
+            code = marshal.dumps(module.code)
+        if self.reproducible:
+            # the version 2 of the format has no references between objects,
+            # so the code is the same whether it was compiled by a worker
+            code = marshal.dumps(marshal.loads(code), 2)  # noqa: S302
+            code = marshal.dumps(marshal.loads(code))  # noqa: S302
+        file = module.file
+        file_stat = None
+        with suppress(OSError):
+            if file is not None:
+                file_stat = file.stat()
+        if self.source_date_epoch is not None:
+            mtime = self.source_date_epoch
+        elif file_stat is not None:
+            mtime = int(file_stat.st_mtime)
+        else:
+            mtime = int(time.time())
+        mtime &= 0xFFFF_FFFF
+
+        if self.invalidation_mode == PycInvalidationMode.TIMESTAMP:
+            # starting with Python 3.3 the pyc file format contains the
+            # source size; it is not actually used for anything except
+            # determining if the file is up to date so we can safely set
+            # this value to zero
+            size = file_stat.st_size & 0xFFFF_FFFF if file_stat else 0
+            header = MAGIC_NUMBER + struct.pack("<iLL", 0, mtime, size)
+            return header + code, mtime
+
+        flags = 0b01
+        if self.invalidation_mode == PycInvalidationMode.CHECKED_HASH:
+            flags |= 0b10
+        source = code
+        if file is not None and file.suffix in SOURCE_SUFFIXES:
+            with suppress(OSError):
+                source = file.read_bytes()
+        header = MAGIC_NUMBER + struct.pack("<I", flags) + source_hash(source)
+        return header + code, mtime
+
+    @timed("write modules")
     def _write_modules(self) -> None:
         filename: Path = self.target_dir / "lib" / "library.zip"
         finder: ModuleFinder = self.finder
@@ -654,7 +1181,9 @@ class Freezer:
 
         # BUILD_CONSTANTS
         finder.include_file_as_module(
-            self.constants_module.create(cache_path, finder.modules)
+            self.constants_module.create(
+                cache_path, finder.modules, self.source_date_epoch
+            )
         )
         # Clear the cache, as a new module was added.
         del finder.modules
@@ -664,12 +1193,62 @@ class Freezer:
 
         # Prepare zip file
         compress_type = ZIP_DEFLATED if self.compress else ZIP_STORED
-        with ZipFile(
-            filename, "w", compress_type, strict_timestamps=False
-        ) as outfile:
-            files_to_copy: list[tuple[Module, Path]] = []
-
-            for module in finder.modules:
+        zip_files: list[tuple[Path, str]] = []
+        # the name and the owner of the entries of the zip file
+        zip_members: list[tuple[str, str]] = []
+        files_to_copy: list[tuple[Module, Path]] = []
+        # the location of each module for the import index
+        index: dict[str, tuple[str, int]] = {}
+        in_zip = _importindex.IN_ZIP if self.zip_filename is not None else 0
+        optional: set[str] = set()
+        if self.tree_shaking != "off":
+            self._optional_modules = self._find_optional_modules()
+            if self.tree_shaking == "archive":
+                optional = self._optional_modules
+        # the modules that are not needed to install the finder of the archive
+        # are moved from the zip file to the archive
+        bootstrap: set[str] = set()
+        if self.archive_format == "mmap":
+            bootstrap = self._bootstrap_modules()
+        saving = [0, 0]
+        # the size of the data of each module, for the import profiler
+        sizes: dict[str, int] = {}
+        date_time = None
+        if self.source_date_epoch is not None:
+            date_time = time.gmtime(self.source_date_epoch)[:6]
+
+        # the entries are written to the zip file as they are produced; when
+        # building incrementally, the zip file is written to a temporary file
+        # that is discarded if its contents are the same as in the previous
+        # build, whose zip file is reused
+        digest = None
+        zip_path = filename
+        if self._manifest is not None and self.zip_filename is not None:
+            digest = self._library_digest()
+            zip_path = filename.with_name(f".tmp-{filename.name}")
+        # the side zip file is created on first use
+        optional_file: ZipWriter | None = None
+        optional_zip = target_lib_dir / _optional.OPTIONAL_FILENAME
+        archive: _archive.ArchiveWriter | None = None
+        archive_path = target_lib_dir / _archive.ARCHIVE_FILENAME
+        with ExitStack() as stack:
+            outfile = stack.enter_context(
+                ZipWriter(
+                    zip_path,
+                    compress_type,
+                    self.compress_level,
+                    self.jobs,
+                    date_time=date_time,
+                )
+            )
+            if self.archive_format == "mmap":
+                archive = stack.enter_context(
+                    _archive.ArchiveWriter(archive_path)
+                )
+                if self._size_report is not None:
+                    self._size_report.record(archive_path, "<metadata>")
+            # the deferred modules are compiled by the workers, a few ahead
+            for module, compiled in finder.compile_deferred(finder.modules):
                 # determine if the module should be written to the file system;
                 # a number of packages make the assumption that files that they
                 # require will be found in a location relative to where they
@@ -678,6 +1257,21 @@ class Freezer:
                 include_in_file_system = module.in_file_system
                 mod_name = module.name
                 mod_name_parts = mod_name.split(".")
+                self._owner = mod_name
+
+                # the modules left out by tree shaking are not written at all
+                if (
+                    self.tree_shaking == "drop"
+                    and mod_name in self._optional_modules
+                ):
+                    saving[0] += 1
+                    if module.has_code:
+                        saving[1] += len(self._pyc_data(module, compiled)[0])
+                    elif module.file is not None:
+                        with suppress(OSError):
+                            saving[1] += module.file.stat().st_size
+                    finder.release_code(module)
+                    continue
 
                 # if the module refers to a package, check to see if this
                 # package should be written to the file system
@@ -705,7 +1299,7 @@ class Freezer:
                 # directory because shared libraries cannot be loaded from a
                 # zip file
                 if (
-                    module.code is None
+                    not module.has_code
                     and module.file is not None
                     and include_in_file_system == 0
                 ):
@@ -726,28 +1320,21 @@ class Freezer:
                     else:
                         parts.pop()
                         parts.append(module.file.name)
+                        index[mod_name] = (
+                            ".".join(parts),
+                            _importindex.IS_EXTENSION,
+                        )
                     target = target_lib_dir / ".".join(parts)
                     files_to_copy.append((module, target))
 
-                # starting with Python 3.3 the pyc file format contains the
-                # source size; it is not actually used for anything except
-                # determining if the file is up to date so we can safely set
-                # this value to zero
-                if module.code is not None:
-                    if module.file is not None and module.file.exists():
-                        file_stat = module.file.stat()
-                        mtime = int(file_stat.st_mtime) & 0xFFFF_FFFF
-                        size = file_stat.st_size & 0xFFFFFFFF
-                    else:
-                        mtime = int(time.time()) & 0xFFFF_FFFF
-                        size = 0
-                    header = MAGIC_NUMBER + struct.pack("<iLL", 0, mtime, size)
-                    data = header + marshal.dumps(module.code)
+                if module.has_code:
+                    data, mtime = self._pyc_data(module, compiled)
+                    sizes[mod_name] = len(data)
 
                 # if the module should be written to the file system, do so
                 if include_in_file_system >= 1 and module.file is not None:
                     parts = mod_name_parts.copy()
-                    if module.code is None:
+                    if not module.has_code:
                         # if a module init is distributed as compiled like
                         # __init__.pyd, its name should be preserved.
                         if not module.file.name.startswith("__init__."):
@@ -757,6 +1344,7 @@ class Freezer:
                         self._copy_file(
                             module.file, target_name, copy_dependent_files=True
                         )
+                        flags = _importindex.IS_EXTENSION
                     else:
                         if module.path is not None:
                             parts.append("__init__")
@@ -764,10 +1352,22 @@ class Freezer:
                         target_name = target_name.with_suffix(".pyc")
                         self._create_directory(target_name.parent)
                         target_name.write_bytes(data)
+                        if self._size_report is not None:
+                            self._size_report.record(target_name, mod_name)
+                        flags = 0
+                    if module.path is not None:
+                        flags |= _importindex.IS_PACKAGE
+                    index[mod_name] = (
+                        target_name.relative_to(target_lib_dir).as_posix(),
+                        flags,
+                    )
 
                 # otherwise, write to the zip file
-                elif module.code is not None:
-                    zip_time = time.localtime(mtime)[:6]
+                elif module.has_code:
+                    if self.reproducible:
+                        zip_time = time.gmtime(mtime)[:6]
+                    else:
+                        zip_time = time.localtime(mtime)[:6]
                     if zip_time[0] < 1980:
                         zip_time = (1980, 1, 1, 0, 0, 0)
                     target_name = "/".join(mod_name_parts)
@@ -775,27 +1375,119 @@ class Freezer:
                         target_name += "/__init__"
                     zinfo = ZipInfo(target_name + ".pyc", zip_time)
                     zinfo.compress_type = compress_type
-                    outfile.writestr(zinfo, data)
+                    if mod_name in optional:
+                        # moved to a side zip file
+                        if optional_file is None:
+                            optional_file = stack.enter_context(
+                                ZipWriter(
+                                    optional_zip,
+                                    compress_type,
+                                    self.compress_level,
+                                    self.jobs,
+                                    date_time=date_time,
+                                )
+                            )
+                            if self._size_report is not None:
+                                self._size_report.record(
+                                    optional_zip, "<metadata>"
+                                )
+                        optional_file.writestr(zinfo, data)
+                        if self._size_report is not None:
+                            self._size_report.record_member(
+                                optional_zip, zinfo.filename, mod_name
+                            )
+                        saving[0] += 1
+                        saving[1] += len(data)
+                    elif archive is not None and mod_name not in bootstrap:
+                        # without the pyc header
+                        archive.add(
+                            mod_name,
+                            memoryview(data)[16:],
+                            _archive.IS_PACKAGE if module.path else 0,
+                        )
+                        if self._size_report is not None:
+                            self._size_report.record_member(
+                                archive_path,
+                                mod_name,
+                                mod_name,
+                                len(data) - 16,
+                            )
+                    else:
+                        outfile.writestr(zinfo, data)
+                        zip_members.append((zinfo.filename, mod_name))
+                        if digest is not None:
+                            self._update_library_digest(
+                                digest, module, zinfo, data
+                            )
+                        flags = in_zip
+                        if module.path:
+                            flags |= _importindex.IS_PACKAGE
+                        index[mod_name] = (zinfo.filename, flags)
+                # the code of the written module is not kept in memory
+                finder.release_code(module)
+            self._owner = None
+
+            if self.tree_shaking != "off":
+                self._tree_shaking_saving = (saving[0], saving[1])
+
+            if self.import_index:
+                index_path = cache_path / _importindex.INDEX_FILENAME
+                index_path.write_bytes(marshal.dumps(index))
+                zip_files.append((index_path, index_path.name))
+
+            if self.lazy_imports:
+                lazy_path = cache_path / _lazy.LAZY_FILENAME
+                lazy_path.write_bytes(marshal.dumps(sorted(self.lazy_imports)))
+                zip_files.append((lazy_path, lazy_path.name))
+
+            if self.import_profiler:
+                metadata_path = cache_path / _importtime.IMPORTTIME_FILENAME
+                metadata_path.write_bytes(
+                    marshal.dumps(self._import_metadata(sizes))
+                )
+                zip_files.append((metadata_path, metadata_path.name))
 
             # put the distribution files metadata in the zip file
             pos = len(cache_path.as_posix()) + 1
-            for name in cache_path.rglob("*.dist-info/*"):
+            for name in sorted(cache_path.rglob("*.dist-info/*")):
                 if name.is_dir():
                     continue
-                outfile.write(name, name.as_posix()[pos:])
+                zip_files.append((name, name.as_posix()[pos:]))
 
             # write any files to the zip file that were requested specially
             for source_path, target_path in finder.zip_includes:
                 if source_path.is_dir():
-                    for source_filename in source_path.rglob("*"):
+                    for source_filename in sorted(source_path.rglob("*")):
                         if source_filename.is_dir():
                             continue
                         target = target_path.joinpath(
                             source_filename.relative_to(source_path)
                         )
-                        outfile.write(source_filename, target.as_posix())
+                        zip_files.append((source_filename, target.as_posix()))
                 else:
-                    outfile.write(source_path, target_path.as_posix())
+                    zip_files.append((source_path, target_path.as_posix()))
+
+            for source_path, arcname in zip_files:
+                outfile.write(source_path, arcname)
+                if digest is not None:
+                    digest.update(f"\0{arcname}\0".encode())
+                    digest.update(source_path.read_bytes())
+
+        restored = False
+        if (
+            digest is not None
+            and self._manifest is not None
+            and self.zip_filename is not None
+        ):
+            restored = self._manifest.restore_library(
+                self.zip_filename, digest.hexdigest()
+            )
+            if restored:
+                zip_path.unlink()
+                if self.silent < 1:
+                    print(f"unchanged {self.zip_filename}")
+            else:
+                zip_path.replace(filename)
 
         # Copy Python extension modules from the list built above.
         orig_path = os.environ["PATH"]
@@ -808,65 +1500,258 @@ class Freezer:
                         [os.fspath(p) for p in module.parent.path]
                     )
                     os.environ["PATH"] = path
+                self._owner = module.name
                 self._copy_file(module.file, target, copy_dependent_files=True)
             finally:
                 os.environ["PATH"] = orig_path
+                self._owner = None
+
+        if self._size_report is not None:
+            self._record_library(
+                self._size_report, target_lib_dir, zip_members, zip_files
+            )
 
         # put all files in the file system or keep them in a zip file
         if self.zip_filename is None:
-            with ZipFile(filename) as outfile:
-                outfile.extractall(target_lib_dir)
+            with ZipFile(filename) as zip_file:
+                zip_file.extractall(target_lib_dir)
             filename.unlink()
         else:
-            if self.zip_filename.name != filename.name:
+            if not restored and self.zip_filename.name != filename.name:
                 # zip_filename differs from default
                 filename.rename(self.zip_filename)
+            if self._manifest is not None and digest is not None:
+                self._manifest.library = (
+                    self.zip_filename,
+                    digest.hexdigest(),
+                )
             library_data = self.target_dir / "lib" / "library.dat"
             library_data.write_bytes(self.zip_filename.name.encode())
+            if self._size_report is not None:
+                self._size_report.record(library_data, "<metadata>")
+
+    def _record_library(
+        self,
+        report: SizeReport,
+        target_lib_dir: Path,
+        zip_members: list[tuple[str, str]],
+        zip_files: list[tuple[Path, str]],
+    ) -> None:
+        """Record the owners of the entries of the zip file."""
+        members = list(zip_members)
+        for _, arcname in zip_files:
+            if (
+                arcname
+                in (
+                    _importindex.INDEX_FILENAME,
+                    _lazy.LAZY_FILENAME,
+                    _importtime.IMPORTTIME_FILENAME,
+                )
+                or ".dist-info/" in arcname
+            ):
+                members.append((arcname, "<metadata>"))
+            else:
+                members.append((arcname, "<zip_includes>"))
+        if self.zip_filename is None:
+            for name, owner in members:
+                report.record(target_lib_dir / name, owner)
+        else:
+            # the directory of the zip file is metadata
+            report.record(self.zip_filename, "<metadata>")
+            for name, owner in members:
+                report.record_member(self.zip_filename, name, owner)
 
     def freeze(self) -> None:
         """Do the freeze."""
+        if self._timings is None:
+            self._freeze()
+            return
+        _timings.start(self._timings)
+        try:
+            with _timings.phase("freeze"):
+                self._freeze()
+        finally:
+            _timings.stop()
+        if self.trace_file is not None:
+            self._timings.write_trace(self.trace_file)
+            if self.silent < 1:
+                print(f"writing trace file {self.trace_file}")
+
+    def _freeze(self) -> None:
         finder: ModuleFinder = self.finder
+        completed = False
+        try:
+            if self.size_report is not None:
+                self._size_report = SizeReport(self.target_dir)
+
+            # Add the executables to target
+            executables = []
+            for executable in self.executables:
+                self._freeze_executable(executable)
+                executables.append(executable.target_name)
+            finder.add_constant(
+                "__EXECUTABLES__", os.pathsep.join(executables)
+            )
 
-        # Add the executables to target
-        executables = []
-        for executable in self.executables:
-            self._freeze_executable(executable)
-            executables.append(executable.target_name)
-        finder.add_constant("__EXECUTABLES__", os.pathsep.join(executables))
-
-        # Write the modules
-        self._write_modules()
-
-        # Include user-defined files and hooks-defined files
-        target_dir = self.target_dir
-        excluded_dependent_files = finder.excluded_dependent_files
-        for source_path, target_path in finder.included_files:
-            copy_dependent_files = source_path not in excluded_dependent_files
-            if source_path.is_dir():
-                # Copy directories by recursing into them.
-                # Can't use shutil.copytree because we may need dependencies
-                target_base = target_dir / target_path
-                for name in source_path.rglob("*"):
-                    if name.is_dir():
-                        continue
-                    if any(
-                        parent
-                        for parent in name.parents
-                        if parent.name in (".git", ".svn", "CVS")
-                    ):
-                        continue
-                    fulltarget = target_base / name.relative_to(source_path)
-                    self._create_directory(fulltarget.parent)
-                    self._copy_file(name, fulltarget, copy_dependent_files)
-            else:
-                # Copy regular files.
-                fulltarget = target_dir / target_path
-                self._copy_file(source_path, fulltarget, copy_dependent_files)
+            # Write the modules
+            self._write_modules()
+
+            # Include user-defined files and hooks-defined files
+            target_dir = self.target_dir
+            excluded_dependent_files = finder.excluded_dependent_files
+            self._owner = "<include_files>"
+            for source_path, target_path in finder.included_files:
+                copy_dependent_files = (
+                    source_path not in excluded_dependent_files
+                )
+                if source_path.is_dir():
+                    # Copy directories by recursing into them. Can't use
+                    # shutil.copytree because we may need dependencies
+                    target_base = target_dir / target_path
+                    for name in source_path.rglob("*"):
+                        if name.is_dir():
+                            continue
+                        if any(
+                            parent
+                            for parent in name.parents
+                            if parent.name in (".git", ".svn", "CVS")
+                        ):
+                            continue
+                        fulltarget = target_base / name.relative_to(
+                            source_path
+                        )
+                        self._create_directory(fulltarget.parent)
+                        self._copy_file(name, fulltarget, copy_dependent_files)
+                else:
+                    # Copy regular files.
+                    fulltarget = target_dir / target_path
+                    self._copy_file(
+                        source_path, fulltarget, copy_dependent_files
+                    )
+            self._owner = None
+
+            # wait for the files being copied and patched
+            self._wait_pending()
+
+            if self.graph_output is not None:
+                self._write_graph(self.graph_output)
+
+            # do any platform-specific post-Freeze work
+            with _timings.phase("post freeze hook"):
+                self._post_freeze_hook()
+            # and for the files copied by the hook
+            self._wait_pending()
+            if self.deduplicate != "off":
+                self._deduplicate_files()
+            if self._size_report is not None and self.size_report is not None:
+                self._write_size_report(self._size_report, self.size_report)
+            if self.source_date_epoch is not None:
+                self._set_reproducible_times(self.source_date_epoch)
+            if self._manifest is not None:
+                self._manifest.save()
+            self.finder.cleanup()
+            completed = True
+        finally:
+            # the tasks not started are cancelled if the freeze failed
+            self._wait_pending(cancel=not completed)
+
+    @timed("deduplicate")
+    def _deduplicate_files(self) -> None:
+        """Replace the copied files that have the same contents by links."""
+        executables = {
+            self.target_dir / exe.target_name for exe in self.executables
+        }
+        groups = _dedupe.find_duplicates(
+            self.files_copied - executables, self.jobs
+        )
+        replaced, saved = _dedupe.link_duplicates(groups, self.deduplicate)
+        if self._manifest is not None and self.deduplicate == "symlink":
+            # the file linked to can change while the link is unchanged
+            for target in replaced:
+                self._manifest.discard(target)
+        if self.silent < 1:
+            for target in replaced:
+                print(f"deduplicated {target}")
+        self._deduplicate_saving = (len(replaced), saved)
+
+    def _write_graph(self, filename: Path) -> None:
+        """Write the graph of the modules and of the binary files."""
+        graph = self.finder.import_graph()
+        dependent_files: dict[Path, set[Path]] = self.dependent_files  # ty: ignore[unresolved-attribute]
+        for source, dependents in dependent_files.items():
+            for dependent in dependents:
+                graph.add_edge(
+                    os.fspath(source),
+                    os.fspath(dependent),
+                    self._dependency_reason,
+                )
+        binary_reasons = {"extension", "libs", self._dependency_reason}
+        for source, target, reason in list(graph.edges):
+            if reason not in binary_reasons:
+                continue
+            for name in (source, target):
+                if name in graph.nodes or not os.path.isabs(name):
+                    continue
+                try:
+                    size = os.stat(name).st_size
+                except OSError:
+                    size = 0
+                graph.add_node(name, kind="binary", size=size, file=name)
+        graph.write(filename)
+        if self.silent < 1:
+            print(f"writing import graph {filename}")
 
-        # do any platform-specific post-Freeze work
-        self._post_freeze_hook()
-        self.finder.cleanup()
+    @staticmethod
+    def _distribution_name(module: Module) -> str:
+        """Return the name of the distribution of a module."""
+        if module.distribution is not None:
+            return module.distribution.name
+        if module.name.split(".")[0] in sys.stdlib_module_names:
+            return "<python>"
+        return "<application>"
+
+    def _import_metadata(
+        self, sizes: dict[str, int]
+    ) -> dict[str, tuple[str, int]]:
+        """Return the distribution and the size of the data of each module."""
+        metadata: dict[str, tuple[str, int]] = {}
+        for module in self.finder.modules:
+            size = sizes.get(module.name)
+            if size is None:
+                size = 0
+                if module.file is not None:
+                    with suppress(OSError):
+                        size = module.file.stat().st_size
+            metadata[module.name] = (self._distribution_name(module), size)
+        return metadata
+
+    def _write_size_report(self, report: SizeReport, filename: Path) -> None:
+        """Attribute the size of the build to the distributions."""
+        chains = self.finder.graph.import_chains()
+        modules = {module.name: module for module in self.finder.modules}
+
+        def describe(owner: str) -> tuple[str, list[str]]:
+            module = modules.get(owner)
+            if module is None:
+                return owner, []
+            return self._distribution_name(module), chains.get(owner, [])
+
+        report.analyze(describe)
+        report.write(filename)
+        if self.silent < 1:
+            print(f"writing size report {filename}")
+
+    def _set_reproducible_times(self, timestamp: int) -> None:
+        """Set the modification time of the files in the build directory."""
+        times = (timestamp, timestamp)
+        follow = os.utime not in os.supports_follow_symlinks
+        for root, dirs, files in os.walk(self.target_dir):
+            for name in [*files, *dirs]:
+                path = os.path.join(root, name)
+                if follow and os.path.islink(path):
+                    continue
+                os.utime(path, times, follow_symlinks=follow)
+        os.utime(self.target_dir, times)
 
     def print_report(self) -> None:
         """Display report.
@@ -888,6 +1773,29 @@ class Freezer:
                 print(f" {module.name:<25} {module.file or ''}")
         if self.silent < 2:
             self.finder.report_missing_modules()
+        if self.silent < 2 and self._tree_shaking_saving is not None:
+            count, size = self._tree_shaking_saving
+            if self.tree_shaking == "drop":
+                action = "dropped"
+            else:
+                action = f"moved to lib/{_optional.OPTIONAL_FILENAME}"
+            print(
+                f"Tree shaking: {count} optional modules "
+                f"({format_size(size)}) {action}\n"
+            )
+        if self.silent < 2 and self._deduplicate_saving is not None:
+            count, size = self._deduplicate_saving
+            kind = (
+                "hard links" if self.deduplicate == "hardlink" else "symlinks"
+            )
+            print(
+                f"Deduplication: {count} duplicate files "
+                f"({format_size(size)}) replaced by {kind}\n"
+            )
+        if self.silent < 2 and self._size_report is not None:
+            self._size_report.print_table()
+        if self.silent < 2 and self.timings and self._timings is not None:
+            self._timings.print_table()
         if self.silent < 3:
             # Display a list of dependencies that weren't found
             names = {name for name, value in self._warnings.items() if value}
@@ -904,6 +1812,8 @@ class Freezer:
 class WinFreezer(Freezer, PEParser):
     """Freezer base class for Windows OS."""
 
+    _dependency_reason = "PE import"
+
     def __init__(self, *args: Any, **kwargs) -> None:
         Freezer.__init__(self, *args, **kwargs)
         PEParser.__init__(
@@ -1167,6 +2077,8 @@ class WinFreezer(Freezer, PEParser):
 class DarwinFreezer(Freezer, Parser):
     """Freezer base class for macOS."""
 
+    _dependency_reason = "LC_LOAD_DYLIB"
+
     def __init__(self, *args: Any, **kwargs) -> None:
         Freezer.__init__(self, *args, **kwargs)
         Parser.__init__(
@@ -1283,6 +2195,7 @@ class DarwinFreezer(Freezer, Parser):
                     reference=reference,
                 )
 
+    @timed("copy file")
     def _copy_file_recursion(
         self,
         source: Path,
@@ -1313,12 +2226,17 @@ class DarwinFreezer(Freezer, Parser):
         if source == target:
             return
         self._create_directory(target.parent)
-        if self.silent < 1:
-            print(f"copying {source} -> {target}")
-        shutil.copyfile(source, target)
-        shutil.copystat(source, target)
-        if include_mode:
-            shutil.copymode(source, target)
+        if include_mode or not self._restore_file(source, target):
+            if self.silent < 1:
+                print(f"copying {source} -> {target}")
+            shutil.copyfile(source, target)
+            shutil.copystat(source, target)
+            if include_mode:
+                shutil.copymode(source, target)
+        if self._manifest is not None and not include_mode:
+            self._manifest.record(source, target)
+        if self._size_report is not None:
+            self._size_report.record(target, self._owner)
         self.files_copied.add(target)
 
         # handle post-copy tasks, including copying dependencies
@@ -1329,6 +2247,7 @@ class DarwinFreezer(Freezer, Parser):
             reference=reference,
         )
 
+    @timed("get dependent files")
     def get_dependent_files(
         self, filename: StrPath, darwinFile: DarwinFile | None = None
     ) -> set[Path]:
@@ -1363,6 +2282,8 @@ class DarwinFreezer(Freezer, Parser):
 class LinuxFreezer(Freezer, ELFParser):
     """Freezer base class for Linux and Posix OSes."""
 
+    _dependency_reason = "DT_NEEDED"
+
     def __init__(self, *args: Any, **kwargs) -> None:
         Freezer.__init__(self, *args, **kwargs)
         ELFParser.__init__(
@@ -1408,6 +2329,31 @@ class LinuxFreezer(Freezer, ELFParser):
             if IS_CONDA:
                 self.finder.include_files(src, tgt)
 
+    def _prefetch_dependent_files(self, sources: Iterable[Path]) -> None:
+        """Resolve the dependencies of the files concurrently, in advance."""
+        if self.jobs == 1:
+            return
+        sources = [
+            source
+            for source in {source.resolve() for source in sources}
+            if source not in self.dependent_files
+        ]
+        if len(sources) < 2:
+            return
+        executor = self._get_executor()
+        for source, dependent_files in zip(
+            sources,
+            executor.map(self._get_dependent_files_of, sources),
+            strict=True,
+        ):
+            if dependent_files is not None:
+                self.dependent_files[source] = dependent_files
+
+    def _get_dependent_files_of(self, source: Path) -> set[Path] | None:
+        if not self._is_binary(source):
+            return None
+        return self._get_dependent_files(source)
+
     def _post_copy_hook(
         self,
         source: Path,
@@ -1422,11 +2368,15 @@ class LinuxFreezer(Freezer, ELFParser):
         source_dir = source.parent
         target_dir = target.parent
         lib_files = self.finder.lib_files
-        fix_rpath = set()
+        fix_rpath: dict[str, None] = {}
         fix_needed = {}
-        for dependent in self.get_dependent_files(source):
-            if not self._should_copy_file(dependent):
-                continue
+        dependent_files = [
+            dependent
+            for dependent in self.get_dependent_files(source)
+            if self._should_copy_file(dependent)
+        ]
+        self._prefetch_dependent_files(dependent_files)
+        for dependent in dependent_files:
             dependent_source = dependent.resolve()
             dependent_name = dependent_source.name
             lib_file = lib_files.get(dependent_source)
@@ -1451,23 +2401,32 @@ class LinuxFreezer(Freezer, ELFParser):
                     # copied to another location and is relative to the source
                     dependent_target = target_dir / dependent_name
                     relative = Path(dependent_name)
-                    for file in self.files_copied:
-                        if file.name == dependent_name:
-                            try:
-                                relative = file.relative_to(target_dir)
-                                dependent_target = file
-                            except ValueError:
-                                relative = Path(
-                                    os.path.relpath(file, target_dir)
-                                )
-                            break
-            fix_rpath.add(f"$ORIGIN/{relative.parent.as_posix()}")
+                    file = min(
+                        (
+                            file
+                            for file in self.files_copied
+                            if file.name == dependent_name
+                        ),
+                        default=None,
+                    )
+                    if file is not None:
+                        try:
+                            relative = file.relative_to(target_dir)
+                            dependent_target = file
+                        except ValueError:
+                            relative = Path(os.path.relpath(file, target_dir))
+            fix_rpath[f"$ORIGIN/{relative.parent.as_posix()}"] = None
             self._copy_file(
                 dependent_source, dependent_target, copy_dependent_files
             )
             if dependent.name != dependent_name:
                 fix_needed.setdefault(dependent.name, dependent_name)
-        if fix_rpath:
-            self.set_rpath(target, ":".join(fix_rpath))
-        for needed_old, needed_new in fix_needed.items():
-            self.replace_needed(target, needed_old, needed_new)
+        if fix_rpath or fix_needed:
+            # a single call to patchelf per file
+            self._submit(
+                target,
+                self.update_dynamic,
+                target,
+                rpath=":".join(fix_rpath) if fix_rpath else None,
+                replace_needed=fix_needed,
+            )
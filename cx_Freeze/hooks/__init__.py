@@ -537,7 +537,7 @@ def load_win32api(finder: ModuleFinder, module: Module) -> None:
 def load_win32com(finder: ModuleFinder, module: Module) -> None:
     """Manipulate the search path at runtime to include win32comext."""
     if module.file and module.path:
-        module.path.append(module.file.parent.parent / "win32comext")
+        module.path = [*module.path, module.file.parent.parent / "win32comext"]
 
 
 def load_win32file(finder: ModuleFinder, module: Module) -> None:
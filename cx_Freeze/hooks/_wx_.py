@@ -34,7 +34,7 @@ class Hook(ModuleHook):
         occurs first.
         """
         if module.file and module.path:
-            module.path.insert(0, module.file.parent / "kwargs")
+            module.path = [module.file.parent / "kwargs", *module.path]
 
     def wx_lib_wxcairo(self, _finder: ModuleFinder, module: Module) -> None:
         """Ignore optional package."""
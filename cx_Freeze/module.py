@@ -3,10 +3,12 @@
 from __future__ import annotations
 
 import ast
+import os
 import socket
+import sys
 from contextlib import suppress
 from datetime import datetime, timezone
-from functools import cached_property, partial
+from functools import partial
 from importlib.machinery import EXTENSION_SUFFIXES
 from keyword import iskeyword
 from pathlib import Path
@@ -27,9 +29,47 @@ if TYPE_CHECKING:
 
 __all__ = ["ConstantsModule", "Module", "ModuleHook"]
 
+# the sets of names of a module are shared with the modules having the same
+# names, as frozensets, until they are changed
+_NO_NAMES: frozenset[str] = frozenset()
+
+# marks the cached values not computed yet
+_NOT_CACHED: Any = object()
+
 
 class Module:
-    """The Module class."""
+    """The Module class.
+
+    Tens of thousands of modules can be found, so the names are interned,
+    the paths are stored as interned strings, and the sets of names are
+    shared between modules once they are scanned (see share_names).
+    """
+
+    __slots__ = (
+        "_code",
+        "_deferred_code",
+        "_exclude_names",
+        "_file_dir",
+        "_file_name",
+        "_global_names",
+        "_ignore_names",
+        "_in_file_system",
+        "_path",
+        "_root_dir",
+        "_stub_code",
+        "distribution",
+        "error_exc",
+        "error_msg",
+        "finder",
+        "hook",
+        "in_import",
+        "lazy",
+        "loader",
+        "name",
+        "parent",
+        "root",
+        "source_is_zip_file",
+    )
 
     def __init__(
         self,
@@ -38,13 +78,19 @@ class Module:
         filename: StrPath | None = None,
         parent: Module | None = None,
     ) -> None:
-        self.name: str = name
-        self.path: list[Path] | None = list(map(Path, path)) if path else None
-        self._file: Path | None = self._file_validate(filename)
+        self.name: str = sys.intern(name)
+        self._path: tuple[str, ...] | None = None
+        self._file_dir: str | None = None
+        self._file_name: str | None = None
+        self._root_dir: Path | None = _NOT_CACHED
+        self._stub_code: CodeType | None = _NOT_CACHED
+        self.path = path or None
+        self.file = filename
         self.parent: Module | None = parent
         self.root: Module = parent.root if parent else self
 
-        self.code: CodeType | None = None
+        self._code: CodeType | None = None
+        self._deferred_code: Callable[[], CodeType | None] | None = None
         self.finder: ModuleFinder | None = None
         self.distribution: DistributionCache | None = None
         self.error_exc: BaseException | None = None
@@ -53,9 +99,9 @@ class Module:
         self.lazy: bool = False
         self.loader: Loader | None = None
 
-        self.exclude_names: set[str] = set()
-        self.global_names: set[str] = set()
-        self.ignore_names: set[str] = set()
+        self._exclude_names: set[str] | frozenset[str] = _NO_NAMES
+        self._global_names: set[str] | frozenset[str] = _NO_NAMES
+        self._ignore_names: set[str] | frozenset[str] = _NO_NAMES
         self.in_import: bool = True
         self.source_is_zip_file: bool = False
         self._in_file_system: Literal[0, 1, 2] = 1
@@ -69,27 +115,128 @@ class Module:
         if self.file is not None:
             parts.append(f"file={self.file.as_posix()!r}")
         if self.path is not None:
-            parts.append(f"path={self.path}")
+            parts.append(f"path={list(self.path)}")
         if self.parent is not None:
             parts.append(f"parent.name={self.parent.name!r}")
         join_parts = ", ".join(parts)
         return f"<Module {join_parts}>"
 
+    @property
+    def code(self) -> CodeType | None:
+        """The code object of the module.
+
+        A deferred code object is created on first use.
+        """
+        if self._deferred_code is not None:
+            deferred_code, self._deferred_code = self._deferred_code, None
+            self._code = deferred_code()
+        return self._code
+
+    @code.setter
+    def code(self, code: CodeType | None) -> None:
+        self._deferred_code = None
+        self._code = code
+
+    @property
+    def code_deferred(self) -> bool:
+        """Whether the code object is not created yet."""
+        return self._deferred_code is not None
+
+    @property
+    def has_code(self) -> bool:
+        """Whether the module has a code object, without creating it."""
+        return self._deferred_code is not None or self._code is not None
+
+    def defer_code(self, deferred_code: Callable[[], CodeType | None]) -> None:
+        """Create the code object with this function, on first use."""
+        self._code = None
+        self._deferred_code = deferred_code
+
     @property
     def file(self) -> Path | None:
         """Module filename."""
-        return self._file
+        if self._file_name is None:
+            return None
+        return Path(self._file_dir, self._file_name)
 
     @file.setter
     def file(self, filename: StrPath | None) -> None:
-        self._file = self._file_validate(filename)
-
-    def _file_validate(self, filename: StrPath | None) -> Path | None:
-        if hasattr(self, "_file"):
-            del self.stub_code  # clear the cache
+        self._stub_code = _NOT_CACHED  # clear the cache
         if not filename:
+            self._file_dir = self._file_name = None
+            return
+        # the modules of a package share the string of its directory
+        file_dir, file_name = os.path.split(os.fspath(filename))
+        self._file_dir = sys.intern(file_dir)
+        self._file_name = sys.intern(file_name)
+
+    @property
+    def file_name(self) -> str | None:
+        """The name of the file of the module, without its directory."""
+        return self._file_name
+
+    @property
+    def is_package(self) -> bool:
+        """Whether the module is a package, without creating its path."""
+        return self._path is not None
+
+    @property
+    def path(self) -> tuple[Path, ...] | None:
+        """The search path of a package, or None for a module.
+
+        The path is immutable; assign a new sequence to change it, like
+        ``module.path = [*module.path, directory]``.
+        """
+        if self._path is None:
             return None
-        return Path(filename)
+        return tuple(map(Path, self._path))
+
+    @path.setter
+    def path(self, path: Sequence[StrPath] | None) -> None:
+        if path is None:
+            self._path = None
+        else:
+            self._path = tuple(sys.intern(os.fspath(p)) for p in path)
+
+    @property
+    def exclude_names(self) -> set[str]:
+        """The names of the modules not imported by the module."""
+        names = self._exclude_names
+        if isinstance(names, frozenset):
+            names = self._exclude_names = set(names)
+        return names
+
+    @property
+    def global_names(self) -> set[str]:
+        """The global names defined in the module."""
+        names = self._global_names
+        if isinstance(names, frozenset):
+            names = self._global_names = set(names)
+        return names
+
+    @property
+    def ignore_names(self) -> set[str]:
+        """The names of the missing modules not reported for the module."""
+        names = self._ignore_names
+        if isinstance(names, frozenset):
+            names = self._ignore_names = set(names)
+        return names
+
+    def share_names(
+        self, shared: dict[frozenset[str], frozenset[str]]
+    ) -> None:
+        """Share the sets of names with the modules having the same names.
+
+        The sets are stored as frozensets, looked up in shared, and are
+        copied again when they are used.
+        """
+        for attr in ("_exclude_names", "_global_names", "_ignore_names"):
+            names = getattr(self, attr)
+            if not names:
+                setattr(self, attr, _NO_NAMES)
+            elif isinstance(names, set):
+                frozen = frozenset(names)
+                setattr(self, attr, shared.setdefault(frozen, frozen))
 
     @property
     def in_file_system(self) -> Literal[0, 1, 2]:
@@ -102,7 +249,7 @@ class Module:
         """
         if self.parent is not None:
             return self.parent.in_file_system
-        if self.path is None:
+        if self._path is None:
             return 0
         return self._in_file_system
 
@@ -110,8 +257,13 @@ class Module:
     def in_file_system(self, value: Literal[0, 1, 2]) -> None:
         self._in_file_system = value
 
-    @cached_property
+    @property
     def root_dir(self) -> Path | None:
+        if self._root_dir is _NOT_CACHED:
+            self._root_dir = self._get_root_dir()
+        return self._root_dir
+
+    def _get_root_dir(self) -> Path | None:
         file = self.root.file
         if file is None:
             # Attempt finding implicit namespace package in path
@@ -122,9 +274,14 @@ class Module:
             return None
         return file.parent
 
-    @cached_property
+    @property
     def stub_code(self) -> CodeType | None:
-        filename = self._file
+        if self._stub_code is _NOT_CACHED:
+            self._stub_code = self._get_stub_code()
+        return self._stub_code
+
+    def _get_stub_code(self) -> CodeType | None:
+        filename = self.file
         if filename is None:
             return None
 
@@ -232,7 +389,7 @@ class Module:
             if module_path is None:
                 if self.file is None:
                     return
-                module_path = [self.file.parent]
+                module_path = (self.file.parent,)
             for name in self.libs_dirs():
                 for module_dir in module_path:
                     for source in module_dir.parent.joinpath(name).iterdir():
@@ -254,7 +411,7 @@ class Module:
         if module_path is None:
             if self.file is None:
                 return []
-            module_path = [self.file.parent]
+            module_path = (self.file.parent,)
 
         names = {
             f"../{self.name}.libs",  # numpy >=1.26.0, scipy >=1.9.2
@@ -387,12 +544,22 @@ class ConstantsModule:
                     raise OptionError(msg)
                 self.values[name] = value
 
-    def create(self, tmp_path: Path, modules: list[Module]) -> Path:
+    def create(
+        self,
+        tmp_path: Path,
+        modules: list[Module],
+        source_date_epoch: int | None = None,
+    ) -> Path:
         """Create the constants module.
 
         It consists of declaration statements for each of the values.
+        In reproducible builds (source_date_epoch is set), the build time is
+        source_date_epoch, the source time is limited to it and the build
+        host is not recorded.
         """
         today = datetime.now(tz=timezone.utc)
+        if source_date_epoch is not None:
+            today = datetime.fromtimestamp(source_date_epoch, tz=timezone.utc)
         source_timestamp = 0
         for module in modules:
             if (
@@ -403,9 +570,14 @@ class ConstantsModule:
                 continue
             timestamp = module.file.stat().st_mtime
             source_timestamp = max(source_timestamp, timestamp)
+        if source_date_epoch is not None:
+            source_timestamp = min(source_timestamp, source_date_epoch)
         stamp = datetime.fromtimestamp(source_timestamp, tz=timezone.utc)
         self.values["BUILD_TIMESTAMP"] = today.strftime(self.time_format)
-        self.values["BUILD_HOST"] = socket.gethostname().split(".")[0]
+        if source_date_epoch is None:
+            self.values["BUILD_HOST"] = socket.gethostname().split(".")[0]
+        else:
+            self.values["BUILD_HOST"] = ""
         self.values["SOURCE_TIMESTAMP"] = stamp.strftime(self.time_format)
         parts = []
         for name in sorted(self.values.keys()):
@@ -0,0 +1,133 @@
+"""Tests for cx_Freeze._archive."""
+
+from __future__ import annotations
+
+import marshal
+import os
+from importlib.resources import files
+from importlib.util import module_from_spec
+from typing import TYPE_CHECKING
+from zipfile import ZipFile
+
+import pytest
+
+from cx_Freeze._archive import (
+    IS_PACKAGE,
+    ArchiveFinder,
+    ArchiveWriter,
+    write_archive,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+    from pathlib import Path
+
+MODULES = {
+    "pkg": ("NAME = 'pkg'", IS_PACKAGE),
+    "pkg.mod": ("NAME = 'pkg.mod'", 0),
+    "mod": ("NAME = 'mod'\n" * 100, 0),
+    "ação": ("NAME = 'ação'", 0),
+}
+
+
+def create_archive(filename: Path) -> None:
+    """Create an archive with the modules."""
+    write_archive(
+        filename,
+        (
+            (name, marshal.dumps(compile(source, name, "exec")), flags)
+            for name, (source, flags) in MODULES.items()
+        ),
+    )
+
+
+def test_archive(tmp_path: Path) -> None:
+    """Test finding and loading the modules of the archive."""
+    filename = tmp_path / "library.mar"
+    create_archive(filename)
+    finder = ArchiveFinder(os.fspath(filename))
+    for name, (_, flags) in MODULES.items():
+        spec = finder.find_spec(name)
+        assert spec is not None, name
+        assert spec.loader is finder
+        module = module_from_spec(spec)
+        finder.exec_module(module)
+        assert name == module.NAME
+        assert finder.is_package(name) is bool(flags & IS_PACKAGE)
+        assert finder.get_source(name) is None
+        if flags & IS_PACKAGE:
+            location = os.path.join(filename, name)
+            assert spec.submodule_search_locations == [location]
+            assert spec.origin == os.path.join(location, "__init__.pyc")
+        else:
+            assert spec.submodule_search_locations is None
+    assert finder.find_spec("missing") is None
+    assert finder.find_spec("pkg.missing") is None
+    with pytest.raises(ImportError):
+        finder.is_package("missing")
+
+
+def test_archive_zip_data(tmp_path: Path) -> None:
+    """Test the modules located in the zip file that stores their data."""
+    filename = tmp_path / "library.mar"
+    create_archive(filename)
+    zip_filename = os.fspath(tmp_path / "library.zip")
+    with ZipFile(zip_filename, "w") as zip_file:
+        zip_file.writestr("pkg/data.txt", "pkg data")
+        zip_file.writestr("data.txt", "top-level data")
+    finder = ArchiveFinder(os.fspath(filename), zip_filename)
+    spec = finder.find_spec("pkg")
+    assert spec is not None
+    location = os.path.join(zip_filename, "pkg")
+    assert spec.origin == os.path.join(location, "__init__.pyc")
+    assert spec.submodule_search_locations == [location]
+    assert finder.get_filename("pkg.mod") == f"{location}{os.sep}mod.pyc"
+    data_path = os.path.join(location, "data.txt")
+    assert finder.get_data(data_path) == b"pkg data"
+    assert finder.get_resource_reader("mod") is None
+    module = module_from_spec(spec)
+    finder.exec_module(module)
+    assert files(module).joinpath("data.txt").read_text() == "pkg data"
+    assert not files(module).joinpath("missing.txt").is_file()
+
+
+def test_archive_empty(tmp_path: Path) -> None:
+    """Test an archive without modules."""
+    filename = tmp_path / "library.mar"
+    write_archive(filename, [])
+    finder = ArchiveFinder(os.fspath(filename))
+    assert finder.find_spec("mod") is None
+
+
+def test_archive_writer(tmp_path: Path) -> None:
+    """Test the modules added out of order, as they are written."""
+    filename = tmp_path / "library.mar"
+    with ArchiveWriter(filename) as writer:
+        for name, (source, flags) in reversed(MODULES.items()):
+            data = marshal.dumps(compile(source, name, "exec"))
+            writer.add(name, memoryview(data), flags)
+    finder = ArchiveFinder(os.fspath(filename))
+    for name in MODULES:
+        assert finder.get_code(name) is not None, name
+    assert finder.get_code("missing") is None
+
+
+def test_archive_writer_error(tmp_path: Path) -> None:
+    """Test that an archive is not left behind if writing it fails."""
+    filename = tmp_path / "library.mar"
+
+    def entries() -> Iterator[tuple[str, bytes, int]]:
+        yield "mod", marshal.dumps(compile("", "mod", "exec")), 0
+        raise RuntimeError
+
+    with pytest.raises(RuntimeError):
+        write_archive(filename, entries())
+    assert not filename.exists()
+
+
+def test_archive_invalid(tmp_path: Path) -> None:
+    """Test a file that is not an archive."""
+    filename = tmp_path / "library.mar"
+    filename.write_bytes(b"PK\005\006" + b"\0" * 18)
+    with pytest.raises(ValueError, match="invalid module archive"):
+        ArchiveFinder(os.fspath(filename))
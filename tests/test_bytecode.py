@@ -0,0 +1,40 @@
+"""Tests for cx_Freeze._bytecode."""
+
+from __future__ import annotations
+
+from types import CodeType
+
+from cx_Freeze._bytecode import scan_code
+
+SOURCE = """\
+import os
+from . import sibling
+from .pkg import name as alias
+from json import *
+__import__("mod_call")
+VALUE = 1
+
+
+def function():
+    import inner
+"""
+
+
+def test_scan_code() -> None:
+    """Test the results of the scan, in the order of the bytecode."""
+    code = compile(SOURCE, "sample.py", "exec", dont_inherit=True)
+    assert list(scan_code(code)) == [
+        ("import", ("os", 0, None)),
+        ("store", ("os",)),
+        ("import", ("", 1, ("sibling",))),
+        ("store", ("sibling",)),
+        ("import", ("pkg", 1, ("name",))),
+        ("store", ("alias",)),
+        ("import", ("json", 0, ("*",))),
+        ("star", ()),
+        ("__import__", ("mod_call", -1, [])),
+        ("store", ("VALUE",)),
+        ("store", ("function",)),
+    ]
+    function = next(c for c in code.co_consts if isinstance(c, CodeType))
+    assert list(scan_code(function)) == [("import", ("inner", 0, None))]
@@ -0,0 +1,111 @@
+"""Tests for cx_Freeze._cache."""
+
+from __future__ import annotations
+
+import os
+import sys
+from importlib.machinery import EXTENSION_SUFFIXES
+from typing import TYPE_CHECKING
+
+from cx_Freeze import Freezer
+from cx_Freeze._cache import ModuleCache
+
+if TYPE_CHECKING:
+    from .conftest import TempPackage
+
+SOURCE = """
+hello.py
+    import module
+    module.show()
+module/__init__.py
+    def show() -> None:
+        print("Hello from cx_Freeze")
+"""
+
+
+def test_module_cache(tmp_package: TempPackage) -> None:
+    """Test the module cache entries."""
+    tmp_package.create(SOURCE)
+    filename = tmp_package.path / "hello.py"
+    code = compile(filename.read_text(), filename, "exec")
+    imports = [("import", ("module", 0, None), True)]
+
+    cache = ModuleCache(tmp_package.path / "cache")
+    assert cache.get(filename, 0) is None
+    cache.put(filename, 0, code, imports)
+    assert cache.get(filename, 0) == (code, imports)
+    # different optimization level
+    assert cache.get(filename, 2) is None
+    # the source file is changed
+    stat = filename.stat()
+    os.utime(filename, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert cache.get(filename, 0) is None
+    assert cache.hits == 1
+    assert cache.misses == 3
+
+    cache.clear()
+    cache.put(filename, 0, code, imports)
+    assert cache.get(filename, 0) is not None
+    cache.clear()
+    assert cache.get(filename, 0) is None
+
+
+def test_module_cache_stub(tmp_package: TempPackage) -> None:
+    """Test that the entry of an extension module depends on its stub."""
+    tmp_package.create(SOURCE)
+    filename = tmp_package.path / f"ext{EXTENSION_SUFFIXES[0]}"
+    filename.write_bytes(b"\0" * 64)
+    imports = [("import", ("module", 0, None), True)]
+
+    cache = ModuleCache(tmp_package.path / "cache")
+    cache.put(filename, 0, None, imports)
+    assert cache.get(filename, 0) == (None, imports)
+    # a stub file is added
+    stub_file = tmp_package.path / "ext.pyi"
+    stub_file.write_text("import module\n")
+    assert cache.get(filename, 0) is None
+    cache.put(filename, 0, None, imports)
+    assert cache.get(filename, 0) == (None, imports)
+    # only the stub file is changed
+    stub_file.write_text("import module\nimport sys\n")
+    assert cache.get(filename, 0) is None
+
+
+def test_module_cache_prune(tmp_package: TempPackage) -> None:
+    """Test the eviction of the least recently used entries."""
+    tmp_package.create(SOURCE)
+    cache = ModuleCache(tmp_package.path / "cache", max_size=1)
+    filename = tmp_package.path / "hello.py"
+    cache.put(filename, 0, None, [])
+    cache.prune()
+    assert cache.get(filename, 0) is None
+
+
+def test_freezer_module_cache(tmp_package: TempPackage) -> None:
+    """Test a warm rebuild using the module cache."""
+    tmp_package.create(SOURCE)
+    cache_dir = tmp_package.path / "cache"
+
+    for _ in range(2):
+        freezer = Freezer(
+            executables=["hello.py"],
+            path=[tmp_package.path, *sys.path],
+            silent=True,
+            cache_dir=cache_dir,
+        )
+        freezer.freeze()
+    assert freezer.module_cache is not None
+    assert freezer.module_cache.hits > 0
+
+    executable = tmp_package.executable("hello")
+    assert executable.is_file()
+    result = tmp_package.run(executable)
+    result.stdout.fnmatch_lines("Hello from cx_Freeze")
+
+
+def test_freezer_no_cache(tmp_package: TempPackage) -> None:
+    """Test freezer without the module cache."""
+    tmp_package.create(SOURCE)
+    freezer = Freezer(executables=["hello.py"], silent=True, cache=False)
+    assert freezer.module_cache is None
+    assert freezer.finder.module_cache is None
@@ -0,0 +1,79 @@
+"""Tests for cx_Freeze._dedupe."""
+
+from __future__ import annotations
+
+import os
+from typing import TYPE_CHECKING
+
+import pytest
+
+from cx_Freeze._dedupe import find_duplicates, link_duplicates
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+DATA = bytes(range(256)) * 32
+
+
+def create_files(tmp_path: Path) -> list[Path]:
+    """Create duplicates, a file of the same size and small duplicates."""
+    files = {
+        "a/lib.so": DATA,
+        "b/lib.so": DATA,
+        "c/renamed.so": DATA,
+        "same_size.bin": DATA[::-1],
+        "small1.txt": b"small",
+        "small2.txt": b"small",
+    }
+    paths = []
+    for name, data in files.items():
+        path = tmp_path / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(data)
+        paths.append(path)
+    return paths
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_find_duplicates(tmp_path: Path, jobs: int) -> None:
+    """Test the groups of files with the same contents."""
+    paths = create_files(tmp_path)
+    assert find_duplicates(paths, jobs) == [
+        [
+            tmp_path / "a/lib.so",
+            tmp_path / "b/lib.so",
+            tmp_path / "c/renamed.so",
+        ]
+    ]
+
+
+def test_find_duplicates_links(tmp_path: Path) -> None:
+    """Test that the files already linked are not duplicates."""
+    paths = create_files(tmp_path)
+    os.link(paths[0], tmp_path / "hardlink.so")
+    (tmp_path / "symlink.so").symlink_to(paths[0])
+    paths += [tmp_path / "hardlink.so", tmp_path / "symlink.so"]
+    groups = find_duplicates(paths)
+    assert len(groups) == 1
+    assert tmp_path / "hardlink.so" not in groups[0]
+    assert tmp_path / "symlink.so" not in groups[0]
+
+
+@pytest.mark.parametrize("mode", ["hardlink", "symlink"])
+def test_link_duplicates(tmp_path: Path, mode: str) -> None:
+    """Test the duplicates replaced by links."""
+    paths = create_files(tmp_path)
+    replaced, saved = link_duplicates(find_duplicates(paths), mode)
+    assert replaced == [tmp_path / "b/lib.so", tmp_path / "c/renamed.so"]
+    assert saved == 2 * len(DATA)
+    kept = tmp_path / "a/lib.so"
+    for path in replaced:
+        assert path.read_bytes() == DATA
+        if mode == "hardlink":
+            assert path.samefile(kept)
+            assert not path.is_symlink()
+        else:
+            assert os.readlink(path) == os.path.join("..", "a", "lib.so")
+    assert not list(tmp_path.rglob("*.dedupe"))
+    # the links are not duplicates of the file anymore
+    assert find_duplicates(paths) == []
@@ -7,6 +7,8 @@ import shutil
 import stat
 import sys
 import sysconfig
+from importlib.util import find_spec
+from pathlib import Path
 from typing import TYPE_CHECKING
 
 import pytest
@@ -22,8 +24,6 @@ from cx_Freeze.dep_parser import ELFParser
 from cx_Freeze.exception import PlatformError
 
 if TYPE_CHECKING:
-    from pathlib import Path
-
     from tests.conftest import TempPackage, TempPackageVenv
 
 
@@ -48,7 +48,7 @@ if IS_WINDOWS:
 elif IS_MINGW:
     PACKAGE_VERSION = [("imagehlp", "bind")]
 elif IS_LINUX:
-    PACKAGE_VERSION = [("patchelf", "bind")]
+    PACKAGE_VERSION = [("patchelf", "bind"), ("ldd", "bind")]
 else:
     PACKAGE_VERSION = [("", "")]
 
@@ -99,10 +99,61 @@ def test_elf_parser(tmp_package: TempPackage) -> None:
     for i, so_name in enumerate(so_names):
         parser.replace_needed(filename, so_name, new_names[i])
     parser.set_soname(filename, "foo.so")
+    assert len(parser.get_needed(filename)) == len(so_names)
+    assert parser.get_soname(filename) == "foo.so"
 
     assert parser.get_rpath("foo") == ""
 
 
+@pytest.mark.skipif(not IS_LINUX, reason="Linux test")
+@pytest.mark.skipif(shutil.which("ldd") is None, reason="requires ldd")
+@pytest.mark.parametrize("name", ["_ctypes", "_ssl"])
+def test_elf_parser_ldd(name: str) -> None:
+    """Test that the libraries are resolved like ldd does."""
+    spec = find_spec(name)
+    if spec is None or not spec.origin or not os.path.isfile(spec.origin):
+        pytest.skip(f"requires {name} as an extension module")
+    filename = Path(spec.origin)
+    warnings: dict[str, bool] = {}
+    parser = ELFParser(
+        sys.path, [sysconfig.get_config_var("LIBDIR")], 0, warnings
+    )
+    get_ldd = parser._get_dependent_files_ldd  # noqa: SLF001
+    get_elf = parser._get_dependent_files_elf  # noqa: SLF001
+    expected = {library.resolve() for library in get_ldd(filename)}
+    # ldd lists the dependencies of the dependencies too
+    found: set[Path] = set()
+    pending = [filename]
+    while pending:
+        for library in get_elf(pending.pop()):
+            if library.resolve() not in found:
+                found.add(library.resolve())
+                pending.append(library)
+    assert found == expected
+    assert not any(warnings.values())
+
+
+@pytest.mark.skipif(not IS_LINUX, reason="Linux test")
+def test_elf_parser_update_dynamic(tmp_package: TempPackage) -> None:
+    """Test the rpath, needed and soname changes made at once."""
+    tmp_package.create(SOURCE)
+    parser = ELFParser(sys.path, [sysconfig.get_config_var("LIBDIR")], 0, {})
+    found = parser.find_library("python") or parser.find_library("sqlite3")
+    assert found, "library not found"
+    filename: Path = tmp_package.path / found.name
+    shutil.copyfile(found, filename)
+    so_names = parser.get_needed(filename)
+    parser.update_dynamic(
+        filename,
+        rpath="$ORIGIN/.:$ORIGIN/lib",
+        replace_needed={so_names[0]: "libfoo.so", "libnotfound.so": "bar.so"},
+        soname="foo.so",
+    )
+    assert parser.get_rpath(filename) == "$ORIGIN:$ORIGIN/lib"
+    assert parser.get_needed(filename) == ["libfoo.so", *so_names[1:]]
+    assert parser.get_soname(filename) == "foo.so"
+
+
 @pytest.mark.skipif(not IS_LINUX, reason="Linux test")
 def test_verify_patchelf(monkeypatch: pytest.MonkeyPatch) -> None:
     """Test the _verify_patchelf."""
@@ -0,0 +1,182 @@
+"""Tests for cx_Freeze._elf."""
+
+from __future__ import annotations
+
+import shutil
+import struct
+import subprocess
+import sys
+import sysconfig
+from pathlib import Path
+
+import pytest
+
+from cx_Freeze._compat import IS_LINUX
+from cx_Freeze._elf import ELFFile
+
+PATCHELF = shutil.which("patchelf")
+
+
+def create_elf(
+    path: Path,
+    elf_class: int,
+    order: str,
+    strings: list[tuple[int, str]],
+) -> None:
+    """Create a minimal ELF file with a dynamic section."""
+    is_64 = elf_class == 2
+    ehsize, phentsize = (64, 56) if is_64 else (52, 32)
+    dyn_size = 16 if is_64 else 8
+    vaddr = 0x10000
+    phoff = ehsize
+    dynamic_off = phoff + 2 * phentsize
+    dynamic_size = (len(strings) + 2) * dyn_size
+    strtab_off = dynamic_off + dynamic_size
+    strtab = b"\0"
+    entries = []
+    for d_tag, value in strings:
+        entries.append((d_tag, len(strtab)))
+        strtab += value.encode() + b"\0"
+    entries.append((5, vaddr + strtab_off))  # DT_STRTAB
+    entries.append((0, 0))  # DT_NULL
+    file_size = strtab_off + len(strtab)
+
+    ident = b"\x7fELF" + bytes([elf_class, 1 if order == "<" else 2, 1])
+    ident = ident.ljust(16, b"\0")
+    if is_64:
+        header = struct.pack(
+            f"{order}HHIQQQIHHHHHH",
+            3, 62, 1, 0, phoff, 0, 0, ehsize, phentsize, 2, 0, 0, 0,
+        )  # fmt: skip
+        phdrs = struct.pack(
+            f"{order}IIQQQQQQ", 1, 4, 0, vaddr, vaddr, file_size, file_size, 0
+        ) + struct.pack(
+            f"{order}IIQQQQQQ",
+            2, 4, dynamic_off, vaddr + dynamic_off, vaddr + dynamic_off,
+            dynamic_size, dynamic_size, 8,
+        )  # fmt: skip
+        dynamic = b"".join(struct.pack(f"{order}qQ", *e) for e in entries)
+    else:
+        header = struct.pack(
+            f"{order}HHIIIIIHHHHHH",
+            3, 3, 1, 0, phoff, 0, 0, ehsize, phentsize, 2, 0, 0, 0,
+        )  # fmt: skip
+        phdrs = struct.pack(
+            f"{order}IIIIIIII", 1, 0, vaddr, vaddr, file_size, file_size, 4, 0
+        ) + struct.pack(
+            f"{order}IIIIIIII",
+            2, dynamic_off, vaddr + dynamic_off, vaddr + dynamic_off,
+            dynamic_size, dynamic_size, 4, 4,
+        )  # fmt: skip
+        dynamic = b"".join(struct.pack(f"{order}iI", *e) for e in entries)
+    path.write_bytes(ident + header + phdrs + dynamic + strtab)
+
+
+@pytest.mark.parametrize(
+    ("elf_class", "order"),
+    [(2, "<"), (2, ">"), (1, "<"), (1, ">")],
+    ids=["64-lsb", "64-msb", "32-lsb", "32-msb"],
+)
+def test_elf_file(tmp_path: Path, elf_class: int, order: str) -> None:
+    """Test the dynamic section of 32/64-bit files in both endiannesses."""
+    filename = tmp_path / "libtest.so"
+    create_elf(
+        filename,
+        elf_class,
+        order,
+        [
+            (14, "libtest.so.1"),  # DT_SONAME
+            (1, "libc.so.6"),  # DT_NEEDED
+            (1, "libm.so.6"),
+            (29, "$ORIGIN/../lib"),  # DT_RUNPATH
+            (15, "/opt/lib"),  # DT_RPATH
+        ],
+    )
+    elf = ELFFile(filename)
+    assert elf.elf_class == elf_class
+    assert elf.machine == (62 if elf_class == 2 else 3)
+    assert elf.needed == ["libc.so.6", "libm.so.6"]
+    assert elf.soname == "libtest.so.1"
+    assert elf.runpath == "$ORIGIN/../lib"
+    assert elf.rpath == "/opt/lib"
+
+
+def test_elf_file_invalid(tmp_path: Path) -> None:
+    """Test files that are not ELF files."""
+    filename = tmp_path / "test.txt"
+    filename.write_text("Hello from cx_Freeze")
+    with pytest.raises(ValueError, match="not an ELF file"):
+        ELFFile(filename)
+    filename.write_bytes(b"\x7fELF\x02\x01\x01")
+    with pytest.raises(ValueError, match="truncated ELF file"):
+        ELFFile(filename)
+
+
+@pytest.mark.skipif(not IS_LINUX, reason="Linux test")
+@pytest.mark.skipif(PATCHELF is None, reason="requires patchelf")
+def test_elf_file_patchelf() -> None:
+    """Compare the dynamic section of the python executable with patchelf."""
+    filename = sys.executable
+    elf = ELFFile(filename)
+    needed = subprocess.run(
+        [PATCHELF, "--print-needed", filename],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.split()
+    rpath = subprocess.run(
+        [PATCHELF, "--print-rpath", filename],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+    interpreter = subprocess.run(
+        [PATCHELF, "--print-interpreter", filename],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+    assert elf.needed == needed
+    assert (elf.runpath or elf.rpath or "") == rpath
+    assert elf.interpreter == interpreter
+
+
+@pytest.mark.skipif(not IS_LINUX, reason="Linux test")
+@pytest.mark.skipif(PATCHELF is None, reason="requires patchelf")
+def test_elf_file_set_rpath(tmp_path: Path) -> None:
+    """Test the rpath written in place."""
+    lib_dynload = Path(sysconfig.get_path("platstdlib"), "lib-dynload")
+    source = next(lib_dynload.glob("*.so"), None)
+    if source is None:
+        pytest.skip("requires an extension module")
+    filename = tmp_path / source.name
+    shutil.copyfile(source, filename)
+    subprocess.run(
+        [PATCHELF, "--force-rpath", "--set-rpath", "/opt/long/lib", filename],
+        check=True,
+    )
+    elf = ELFFile(filename)
+    assert elf.rpath == "/opt/long/lib"
+    assert elf.set_rpath("$ORIGIN/lib")
+    # too long to fit in place
+    assert not elf.set_rpath("$ORIGIN/lib:/opt/long/lib")
+
+    elf = ELFFile(filename)
+    assert elf.rpath is None
+    assert elf.runpath == "$ORIGIN/lib"
+    rpath = subprocess.run(
+        [PATCHELF, "--print-rpath", filename],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout.strip()
+    assert rpath == "$ORIGIN/lib"
+
+
+def test_elf_file_set_rpath_no_sections(tmp_path: Path) -> None:
+    """Test that files without section headers are not changed in place."""
+    filename = tmp_path / "libtest.so"
+    create_elf(filename, 2, "<", [(29, "/opt/long/lib")])
+    elf = ELFFile(filename)
+    assert not elf.set_rpath("/opt")
+    assert ELFFile(filename).runpath == "/opt/long/lib"
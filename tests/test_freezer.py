@@ -2,16 +2,22 @@
 
 from __future__ import annotations
 
+import compileall
+import json
+import os
 import sys
 import sysconfig
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, NoReturn
+from xml.etree import ElementTree as ET
+from zipfile import ZipFile
 
 import pytest
 
 from cx_Freeze import Freezer
 from cx_Freeze._compat import (
     ABI_THREAD,
+    EXE_SUFFIX,
     IS_CONDA,
     IS_MACOS,
     IS_MINGW,
@@ -516,3 +522,860 @@ def test_freezer_excludes(tmp_package: TempPackage) -> None:
         for fn in filelist:
             print(fn)
         assert len(filelist) == 3
+
+
+SOURCE_INCREMENTAL = """
+hello.py
+    print("Hello from cx_Freeze")
+data.txt
+    data
+stale.txt
+    stale
+"""
+
+
+def test_freezer_incremental(tmp_package: TempPackage) -> None:
+    """Test the freeze incremental option."""
+    tmp_package.create(SOURCE_INCREMENTAL)
+
+    def freeze(include_files: list[str]) -> Freezer:
+        freezer = Freezer(
+            executables=["hello.py"],
+            include_files=include_files,
+            incremental=True,
+            silent=True,
+        )
+        freezer.freeze()
+        return freezer
+
+    freezer = freeze(["data.txt", "stale.txt"])
+    target_dir = freezer.target_dir
+    data = target_dir / "data.txt"
+    library = target_dir / "lib/library.zip"
+    data_stat = data.stat()
+    library_stat = library.stat()
+
+    # rebuild without changes - the files are reused
+    freeze(["data.txt"])
+    assert data.stat().st_ino == data_stat.st_ino
+    assert library.stat().st_ino == library_stat.st_ino
+    assert not target_dir.joinpath("stale.txt").exists()
+    assert not target_dir.with_name(f"{target_dir.name}.previous").exists()
+
+    # rebuild with a changed script - the zip file is rewritten
+    tmp_package.path.joinpath("hello.py").write_text(
+        'print("Hello again from cx_Freeze")\n'
+    )
+    freeze(["data.txt"])
+    assert data.stat().st_ino == data_stat.st_ino
+    assert library.stat().st_ino != library_stat.st_ino
+
+    executable = tmp_package.executable("hello")
+    result = tmp_package.run(executable)
+    result.stdout.fnmatch_lines("Hello again from cx_Freeze")
+
+
+@pytest.mark.parametrize("jobs", [2, 0])
+def test_freezer_jobs(tmp_package: TempPackage, jobs: int) -> None:
+    """Test the freeze jobs option."""
+    tmp_package.create(SOURCE_WITH_EXTRA_FILES)
+
+    serial = Freezer(
+        executables=["hello.py"],
+        path=[tmp_package.path, *sys.path],
+        target_dir="serial",
+        silent=True,
+    )
+    serial.freeze()
+
+    freezer = Freezer(
+        executables=["hello.py"],
+        path=[tmp_package.path, *sys.path],
+        silent=True,
+        jobs=jobs,
+    )
+    assert freezer.jobs >= 1
+    freezer.freeze()
+
+    executable = tmp_package.executable("hello")
+    assert executable.is_file()
+    result = tmp_package.run(executable)
+    result.stdout.fnmatch_lines("Hello from cx_Freeze")
+
+    # the layout does not depend on the number of jobs
+    files = sorted(
+        file.relative_to(freezer.target_dir)
+        for file in freezer.target_dir.rglob("*")
+    )
+    expected = sorted(
+        file.relative_to(serial.target_dir)
+        for file in serial.target_dir.rglob("*")
+    )
+    assert files == expected
+
+
+def test_freezer_jobs_invalid(tmp_package: TempPackage) -> None:
+    """Test the freeze jobs option with an invalid value."""
+    tmp_package.create(SOURCE)
+    with pytest.raises(OptionError, match="the number of jobs must be"):
+        Freezer(executables=["hello.py"], jobs=-1)
+
+
+def test_freezer_jobs_failure(
+    tmp_package: TempPackage, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the workers are stopped when the freeze fails."""
+    tmp_package.create(SOURCE)
+    pending: list[int] = []
+
+    def write_modules(freezer: Freezer) -> None:
+        pending.append(len(freezer._pending))  # noqa: SLF001
+        msg = "write failed"
+        raise RuntimeError(msg)
+
+    monkeypatch.setattr(Freezer, "_write_modules", write_modules)
+    freezer = Freezer(executables=["hello.py"], silent=True, jobs=2)
+    with pytest.raises(RuntimeError, match="write failed"):
+        freezer.freeze()
+    assert pending[0] > 0
+    assert freezer._executor is None  # noqa: SLF001
+    assert not freezer._pending  # noqa: SLF001
+
+
+def test_freezer_compress_level(tmp_package: TempPackage) -> None:
+    """Test the compression level of the zip file."""
+    tmp_package.create(SOURCE)
+    freezer = Freezer(
+        executables=["hello.py"], silent=True, compress_level=9, jobs=2
+    )
+    freezer.freeze()
+
+    executable = tmp_package.executable("hello")
+    assert executable.is_file()
+    result = tmp_package.run(executable)
+    result.stdout.fnmatch_lines("Hello from cx_Freeze")
+    assert freezer.zip_filename is not None
+    with ZipFile(freezer.zip_filename) as zip_file:
+        assert zip_file.testzip() is None
+
+
+def test_freezer_compress_level_invalid(tmp_package: TempPackage) -> None:
+    """Test the compression level with an invalid value."""
+    tmp_package.create(SOURCE)
+    with pytest.raises(OptionError, match="the compression level must be"):
+        Freezer(executables=["hello.py"], compress_level=10)
+
+
+def test_freezer_invalidation_mode(tmp_package: TempPackage) -> None:
+    """Test the compiled modules with unchecked hash-based headers."""
+    tmp_package.create(SOURCE)
+    freezer = Freezer(
+        executables=["hello.py"],
+        silent=True,
+        invalidation_mode="unchecked-hash",
+    )
+    freezer.freeze()
+
+    assert freezer.zip_filename is not None
+    with ZipFile(freezer.zip_filename) as zip_file:
+        for name in zip_file.namelist():
+            if name.endswith(".pyc"):
+                # flags of the header (PEP 552): hash-based, unchecked
+                assert zip_file.read(name)[4:8] == b"\x01\0\0\0", name
+    executable = tmp_package.executable("hello")
+    result = tmp_package.run(executable)
+    result.stdout.fnmatch_lines("Hello from cx_Freeze")
+
+
+def test_freezer_invalidation_mode_invalid(tmp_package: TempPackage) -> None:
+    """Test the invalidation mode with an invalid value."""
+    tmp_package.create(SOURCE)
+    with pytest.raises(OptionError, match="the invalidation mode must be"):
+        Freezer(executables=["hello.py"], invalidation_mode="never")
+
+
+SOURCE_IMPORT_INDEX = """
+hello.py
+    import sys
+
+    import json
+    import pkg.sub
+
+    finders = [type(finder).__name__ for finder in sys.meta_path]
+    print("IndexFinder" in finders, json.dumps(pkg.sub.VALUE))
+    print(pkg.sub.__spec__.origin)
+pkg/__init__.py
+pkg/sub.py
+    VALUE = "Hello from cx_Freeze"
+"""
+
+
+@pytest.mark.parametrize("import_index", [True, False])
+def test_freezer_import_index(
+    tmp_package: TempPackage, import_index: bool
+) -> None:
+    """Test the index of the modules used to find them at startup."""
+    tmp_package.create(SOURCE_IMPORT_INDEX)
+    freezer = Freezer(
+        executables=["hello.py"],
+        path=[tmp_package.path, *sys.path],
+        silent=True,
+        packages=["pkg"],
+        zip_exclude_packages=["pkg"],
+        import_index=import_index,
+    )
+    freezer.freeze()
+
+    assert freezer.zip_filename is not None
+    with ZipFile(freezer.zip_filename) as zip_file:
+        assert ("_cx_freeze_index.dat" in zip_file.namelist()) is import_index
+    executable = tmp_package.executable("hello")
+    result = tmp_package.run(executable)
+    result.stdout.fnmatch_lines(
+        [
+            f'{import_index} "Hello from cx_Freeze"',
+            str(freezer.target_dir / "lib" / "pkg" / "sub.pyc"),
+        ]
+    )
+
+
+SOURCE_ARCHIVE_FORMAT = """
+hello.py
+    import pkgutil
+    import sys
+    from importlib.resources import files
+
+    import json
+    import pkg.sub
+
+    finders = [type(finder).__name__ for finder in sys.meta_path]
+    print("IndexFinder" in finders, json.dumps(pkg.sub.VALUE))
+    print(pkg.sub.__spec__.origin)
+    print(files(pkg).joinpath("data.txt").read_text())
+    print(pkgutil.get_data("pkg", "data.txt").decode())
+pkg/__init__.py
+pkg/data.txt
+    Data of pkg
+pkg/sub.py
+    VALUE = "Hello from cx_Freeze"
+"""
+
+
+def test_freezer_archive_format(tmp_package: TempPackage) -> None:
+    """Test the modules of the application stored in a mapped archive."""
+    tmp_package.create(SOURCE_ARCHIVE_FORMAT)
+    freezer = Freezer(
+        executables=["hello.py"],
+        path=[tmp_package.path, *sys.path],
+        silent=True,
+        packages=["pkg"],
+        zip_include_packages=["pkg"],
+        zip_includes=[("pkg/data.txt", "pkg/data.txt")],
+        archive_format="mmap",
+        import_index=True,
+    )
+    freezer.freeze()
+
+    assert freezer.zip_filename is not None
+    with ZipFile(freezer.zip_filename) as zip_file:
+        names = zip_file.namelist()
+    # the modules used to install the finder are kept in the zip file
+    assert "__init__hello.pyc" in names
+    assert "_cx_freeze_archive.pyc" in names
+    assert "pkg/sub.pyc" not in names
+    archive = freezer.target_dir / "lib" / "library.mar"
+    assert archive.is_file()
+    executable = tmp_package.executable("hello")
+    result = tmp_package.run(executable)
+    # the modules are located in the zip file that stores the data files
+    result.stdout.fnmatch_lines(
+        [
+            'True "Hello from cx_Freeze"',
+            str(freezer.zip_filename / "pkg" / "sub.pyc"),
+            "Data of pkg",
+            "Data of pkg",
+        ]
+    )
+
+
+def test_freezer_archive_format_invalid(tmp_package: TempPackage) -> None:
+    """Test the archive format with an invalid value."""
+    tmp_package.create(SOURCE)
+    with pytest.raises(OptionError, match="the archive format must be"):
+        Freezer(executables=["hello.py"], archive_format="tar")
+
+
+SOURCE_GRAPH = """
+hello.py
+    import mod
+    __import__("dyn")
+    print("Hello from cx_Freeze")
+mod.py
+    import pkg.sub
+    import not_found_module
+dyn.py
+    NAME = "dyn"
+pkg/__init__.py
+    NAME = "pkg"
+pkg/sub.py
+    NAME = "pkg.sub"
+pkg/other.py
+    NAME = "pkg.other"
+"""
+
+
+@pytest.mark.parametrize("suffix", [".json", ".graphml"])
+def test_freezer_graph_output(tmp_package: TempPackage, suffix: str) -> None:
+    """Test the dependency graph, with the reason of each edge."""
+    tmp_package.create(SOURCE_GRAPH)
+    output = tmp_package.path / f"graph{suffix}"
+    freezer = Freezer(
+        executables=["hello.py"],
+        path=[tmp_package.path, *sys.path],
+        silent=True,
+        includes=["json"],
+        packages=["pkg"],
+        graph_output=output,
+    )
+    freezer.freeze()
+
+    if suffix == ".json":
+        data = json.loads(output.read_text(encoding="utf-8"))
+        nodes = {node["id"]: node for node in data["nodes"]}
+        edges = {
+            (edge["source"], edge["target"], edge["reason"])
+            for edge in data["edges"]
+        }
+    else:
+        namespace = {"g": "http://graphml.graphdrawing.org/xmlns"}
+        graph = ET.parse(output).getroot().find("g:graph", namespace)  # noqa: S314
+        assert graph is not None
+        nodes = {
+            node.get("id"): {
+                data.get("key"): data.text
+                for data in node.findall("g:data", namespace)
+            }
+            for node in graph.findall("g:node", namespace)
+        }
+        edges = {
+            (
+                edge.get("source"),
+                edge.get("target"),
+                edge.findtext("g:data", None, namespace),
+            )
+            for edge in graph.findall("g:edge", namespace)
+        }
+    assert ("<build>", "json", "includes") in edges
+    assert ("<build>", "pkg", "packages") in edges
+    assert ("pkg", "pkg.other", "package") in edges
+    assert ("pkg.sub", "pkg", "parent") in edges
+    assert ("mod", "pkg.sub", "import") in edges
+    assert ("mod", "not_found_module", "import") in edges
+    assert ("__main__hello", "mod", "import") in edges
+    assert ("__main__hello", "dyn", "__import__") in edges
+    assert nodes["mod"]["kind"] == "module"
+    assert (
+        int(nodes["mod"]["size"])
+        == (tmp_package.path / "mod.py").stat().st_size
+    )
+    assert nodes["pkg"]["kind"] == "package"
+    assert nodes["not_found_module"]["kind"] == "missing"
+    assert nodes["sys"]["kind"] == "builtin"
+
+
+SOURCE_SIZE_REPORT = """
+hello.py
+    import pkg
+    print("Hello from cx_Freeze")
+pkg/__init__.py
+    from . import sub
+pkg/sub.py
+    NAME = "pkg.sub"
+pkg/data.bin
+    0123456789
+"""
+
+
+def test_freezer_size_report(
+    tmp_package: TempPackage, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Test the report of the size of the build."""
+    tmp_package.create(SOURCE_SIZE_REPORT)
+    output = tmp_package.path / "size.json"
+    freezer = Freezer(
+        executables=["hello.py"],
+        path=[tmp_package.path, *sys.path],
+        silent=True,
+        zip_exclude_packages=["pkg"],
+        size_report=output,
+    )
+    freezer.freeze()
+
+    data = json.loads(output.read_text(encoding="utf-8"))
+    total_size = sum(
+        file.lstat().st_size
+        for file in freezer.target_dir.rglob("*")
+        if not file.is_dir()
+    )
+    assert data["total_size"] == total_size
+    files = {file["path"]: file for file in data["files"]}
+    data_file = files["lib/pkg/data.bin"]
+    assert data_file["owner"] == "pkg"
+    assert data_file["distribution"] == "<application>"
+    assert data_file["chain"] == ["__main__hello", "pkg"]
+    assert files["lib/pkg/sub.pyc"]["chain"] == [
+        "__main__hello",
+        "pkg",
+        "pkg.sub",
+    ]
+    assert files["lib/library.zip/__main__hello.pyc"]["owner"] == (
+        "__main__hello"
+    )
+    assert files[f"hello{EXE_SUFFIX}"]["owner"] == "<executable>"
+    names = [item["name"] for item in data["distributions"]]
+    assert "<python>" in names
+    assert "<unattributed>" not in names
+
+    freezer.silent = 1
+    freezer.print_report()
+    assert "Distribution" in capsys.readouterr().out
+
+
+SOURCE_TREE_SHAKING = """
+hello.py
+    import importlib
+    import pkg.used
+    name = "pkg." + "unused"
+    try:
+        module = importlib.import_module(name)
+    except ImportError:
+        print("not found")
+    else:
+        print("found", module.__file__)
+pkg/__init__.py
+    NAME = "pkg"
+pkg/used.py
+    NAME = "pkg.used"
+pkg/unused.py
+    import extra
+pkg/tests/__init__.py
+    NAME = "pkg.tests"
+pkg/tests/test_pkg.py
+    import extra
+pkg/tests/data.txt
+    test data
+extra.py
+    NAME = "extra"
+"""
+
+
+@pytest.mark.parametrize("tree_shaking", ["archive", "drop"])
+def test_freezer_tree_shaking(
+    tmp_package: TempPackage,
+    capsys: pytest.CaptureFixture[str],
+    tree_shaking: str,
+) -> None:
+    """Test the submodules left out by tree shaking."""
+    tmp_package.create(SOURCE_TREE_SHAKING)
+    freezer = Freezer(
+        executables=["hello.py"],
+        path=[tmp_package.path, *sys.path],
+        silent=True,
+        zip_include_packages=["pkg"],
+        tree_shaking=tree_shaking,
+    )
+    # a blanket include_package, as done by the hooks
+    freezer.finder.include_package("pkg")
+    freezer.freeze()
+    freezer.silent = 1
+    freezer.print_report()
+    assert "Tree shaking: 4 optional modules" in capsys.readouterr().out
+
+    lib_dir = freezer.target_dir / "lib"
+    assert freezer.zip_filename is not None
+    with ZipFile(freezer.zip_filename) as zip_file:
+        names = zip_file.namelist()
+    assert "pkg/used.pyc" in names
+    assert "pkg/unused.pyc" not in names
+    assert "extra.pyc" not in names
+    assert not lib_dir.joinpath("pkg", "tests", "data.txt").exists()
+    executable = tmp_package.executable("hello")
+    result = tmp_package.run(executable)
+    if tree_shaking == "archive":
+        optional_zip = lib_dir / "optional.zip"
+        with ZipFile(optional_zip) as zip_file:
+            assert sorted(zip_file.namelist()) == [
+                "extra.pyc",
+                "pkg/tests/__init__.pyc",
+                "pkg/tests/test_pkg.pyc",
+                "pkg/unused.pyc",
+            ]
+        result.stdout.fnmatch_lines(
+            [f"found {optional_zip / 'pkg' / 'unused.pyc'}"]
+        )
+    else:
+        assert not lib_dir.joinpath("optional.zip").exists()
+        result.stdout.fnmatch_lines(["not found"])
+
+
+def test_freezer_tree_shaking_packages(tmp_package: TempPackage) -> None:
+    """Test that the packages option keeps all the submodules."""
+    tmp_package.create(SOURCE_TREE_SHAKING)
+    freezer = Freezer(
+        executables=["hello.py"],
+        path=[tmp_package.path, *sys.path],
+        silent=True,
+        packages=["pkg"],
+        tree_shaking="drop",
+    )
+    freezer.freeze()
+    lib_dir = freezer.target_dir / "lib"
+    assert lib_dir.joinpath("pkg", "unused.pyc").is_file()
+    assert lib_dir.joinpath("pkg", "tests", "data.txt").is_file()
+
+
+def test_freezer_tree_shaking_invalid(tmp_package: TempPackage) -> None:
+    """Test the tree shaking mode with an invalid value."""
+    tmp_package.create(SOURCE)
+    with pytest.raises(OptionError, match="the tree shaking mode must be"):
+        Freezer(executables=["hello.py"], tree_shaking="all")
+
+
+SOURCE_LAZY_IMPORTS = """
+hello.py
+    import heavy
+    print("imported")
+    print(heavy.VALUE)
+heavy/__init__.py
+    print("heavy loaded")
+    VALUE = 42
+"""
+
+
+def test_freezer_lazy_imports(tmp_package: TempPackage) -> None:
+    """Test the modules loaded lazily by the frozen application."""
+    tmp_package.create(SOURCE_LAZY_IMPORTS)
+    freezer = Freezer(
+        executables=["hello.py"],
+        path=[tmp_package.path, *sys.path],
+        silent=True,
+        lazy_imports=["heavy"],
+    )
+    freezer.freeze()
+    assert freezer.zip_filename is not None
+    with ZipFile(freezer.zip_filename) as zip_file:
+        assert "_cx_freeze_lazy.dat" in zip_file.namelist()
+    executable = tmp_package.executable("hello")
+    result = tmp_package.run(executable)
+    result.stdout.fnmatch_lines(["imported", "heavy loaded", "42"])
+
+
+SOURCE_IMPORT_PROFILER = """
+hello.py
+    import mod
+    print(mod.VALUE)
+mod.py
+    VALUE = 42
+"""
+
+
+def test_freezer_import_profiler(
+    tmp_package: TempPackage, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test the profiler of the imports of the frozen application."""
+    tmp_package.create(SOURCE_IMPORT_PROFILER)
+    freezer = Freezer(
+        executables=["hello.py"],
+        path=[tmp_package.path, *sys.path],
+        silent=True,
+        import_profiler=True,
+    )
+    freezer.freeze()
+    executable = tmp_package.executable("hello")
+
+    # disabled unless the environment variable is set
+    result = tmp_package.run(executable)
+    result.stdout.fnmatch_lines(["42"])
+    assert "import time" not in result.stderr.str()
+
+    monkeypatch.setenv("CXFREEZE_IMPORTTIME", "1")
+    result = tmp_package.run(executable)
+    result.stdout.fnmatch_lines(["42"])
+    result.stderr.fnmatch_lines(
+        ["import time: self*", "import time:*zip*<application>*| mod"]
+    )
+
+    trace = tmp_package.path / "trace.json"
+    monkeypatch.setenv("CXFREEZE_IMPORTTIME", os.fspath(trace))
+    result = tmp_package.run(executable)
+    result.stdout.fnmatch_lines(["42"])
+    events = json.loads(trace.read_text(encoding="utf-8"))["traceEvents"]
+    event = next(event for event in events if event["name"] == "mod")
+    assert event["cat"] == "zip"
+    assert event["args"]["distribution"] == "<application>"
+    assert event["args"]["bytes"] > 0
+
+
+def test_freezer_timings(
+    tmp_package: TempPackage, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Test the timings of the phases of the freeze."""
+    tmp_package.create(SOURCE)
+    trace_file = tmp_package.path / "trace.json"
+    freezer = Freezer(
+        executables=["hello.py"],
+        silent=True,
+        timings=True,
+        trace_file=trace_file,
+    )
+    freezer.freeze()
+    freezer.silent = 1
+    freezer.print_report()
+    output = capsys.readouterr().out
+    for name in (
+        "freeze",
+        "module finder",
+        "load module code",
+        "scan code",
+        "copy file",
+        "write modules",
+        "post freeze hook",
+    ):
+        assert f"  {name}\n" in output
+    events = json.loads(trace_file.read_text(encoding="utf-8"))["traceEvents"]
+    names = {event["name"] for event in events}
+    assert {"freeze", "write modules", "hook os"} <= names
+
+
+@pytest.mark.parametrize("deduplicate", ["hardlink", "symlink"])
+def test_freezer_deduplicate(
+    tmp_package: TempPackage,
+    capsys: pytest.CaptureFixture[str],
+    deduplicate: str,
+) -> None:
+    """Test the files with the same contents replaced by links."""
+    tmp_package.create(SOURCE)
+    data = bytes(range(256)) * 32
+    for name in ("data1.bin", "data2.bin", "data3.bin"):
+        tmp_package.path.joinpath(name).write_bytes(data)
+    tmp_package.path.joinpath("other.bin").write_bytes(data[::-1])
+    freezer = Freezer(
+        executables=["hello.py"],
+        include_files=[
+            ("data1.bin", "data/a.bin"),
+            ("data2.bin", "data/b.bin"),
+            ("data3.bin", "c.bin"),
+            "other.bin",
+        ],
+        silent=True,
+        deduplicate=deduplicate,
+    )
+    freezer.freeze()
+    freezer.silent = 1
+    freezer.print_report()
+    assert "Deduplication: 2 duplicate files (16.0 KiB)" in (
+        capsys.readouterr().out
+    )
+
+    target_dir = freezer.target_dir
+    # the first file in sorted order is kept
+    kept = target_dir / "c.bin"
+    for path in (target_dir / "data/a.bin", target_dir / "data/b.bin"):
+        assert path.read_bytes() == data
+        if deduplicate == "hardlink":
+            assert path.stat().st_ino == kept.stat().st_ino
+        else:
+            assert path.is_symlink()
+            assert not os.path.isabs(os.readlink(path))
+    assert not kept.is_symlink()
+    assert not target_dir.joinpath("other.bin").is_symlink()
+    assert target_dir.joinpath("other.bin").stat().st_nlink == 1
+    executable = tmp_package.executable("hello")
+    result = tmp_package.run(executable)
+    result.stdout.fnmatch_lines("Hello from cx_Freeze")
+
+
+def test_freezer_deduplicate_invalid(tmp_package: TempPackage) -> None:
+    """Test the deduplicate option with an invalid value."""
+    tmp_package.create(SOURCE)
+    with pytest.raises(OptionError, match="the deduplicate mode must be"):
+        Freezer(executables=["hello.py"], deduplicate="copy")
+
+
+SOURCE_DEFER_COMPILE = """
+hello.py
+    \"\"\"Docstring.\"\"\"
+    import module
+    print(__doc__, module.__doc__, module.VALUE)
+module.py
+    \"\"\"Docstring.\"\"\"
+    VALUE = 1
+"""
+
+
+def test_freezer_defer_compile(
+    tmp_package: TempPackage, capsys: pytest.CaptureFixture[str]
+) -> None:
+    """Test the modules compiled at the optimization level when written."""
+    tmp_package.create(SOURCE_DEFER_COMPILE)
+    compileall.compile_dir(tmp_package.path, quiet=2, optimize=2)
+    freezer = Freezer(
+        executables=["hello.py"],
+        path=[tmp_package.path, *sys.path],
+        optimize=2,
+        silent=True,
+        timings=True,
+        defer_compile=True,
+    )
+    freezer.freeze()
+    freezer.silent = 1
+    freezer.print_report()
+    assert "  compile deferred\n" in capsys.readouterr().out
+    executable = tmp_package.executable("hello")
+    result = tmp_package.run(executable)
+    result.stdout.fnmatch_lines("None None 1")
+
+
+SOURCE_DEFER_COMPILE_JOBS = """
+hello.py
+    import pkg.mod
+    print(pkg.mod.PACKAGE, pkg.mod.FILE)
+pkg/__init__.py
+pkg/mod.py
+    \"\"\"Docstring.\"\"\"
+    PACKAGE = __package__
+    FILE = (lambda: __file__)().endswith("mod.pyc")
+"""
+
+
+def test_freezer_defer_compile_jobs(
+    tmp_package: TempPackage, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the workers compile the modules as the freezer does."""
+    tmp_package.create(SOURCE_DEFER_COMPILE_JOBS)
+    compileall.compile_dir(tmp_package.path, quiet=2, optimize=2)
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1700000000")
+
+    def build(target_dir: str, jobs: int) -> dict[str, bytes]:
+        freezer = Freezer(
+            executables=["hello.py"],
+            path=[tmp_package.path, *sys.path],
+            target_dir=target_dir,
+            optimize=2,
+            replace_paths=[("*", "")],
+            zip_include_packages=["pkg"],
+            silent=True,
+            cache=False,
+            jobs=jobs,
+            defer_compile=True,
+        )
+        freezer.freeze()
+        assert freezer.zip_filename is not None
+        with ZipFile(freezer.zip_filename) as zip_file:
+            return {
+                name: zip_file.read(name)
+                for name in zip_file.namelist()
+                if name.startswith(("hello", "pkg/", "__main__"))
+            }
+
+    assert build("build1", 1) == build("build2", 2)
+    executable = tmp_package.path / "build2" / f"hello{EXE_SUFFIX}"
+    result = tmp_package.run(executable)
+    result.stdout.fnmatch_lines("pkg True")
+
+
+SOURCE_STREAM_MODULES = """
+hello.py
+    import pkg.mod
+    print(pkg.mod.PACKAGE, pkg.mod.VALUE)
+pkg/__init__.py
+pkg/mod.py
+    PACKAGE = __package__
+    VALUE = [value * 2 for value in range(3)]
+"""
+
+
+def test_freezer_stream_modules(
+    tmp_package: TempPackage, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the streamed modules are written as the other modules."""
+    tmp_package.create(SOURCE_STREAM_MODULES)
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1700000000")
+
+    def build(target_dir: str, stream_modules: bool) -> dict[str, bytes]:
+        freezer = Freezer(
+            executables=["hello.py"],
+            path=[tmp_package.path, *sys.path],
+            target_dir=target_dir,
+            zip_include_packages=["pkg"],
+            silent=True,
+            cache=False,
+            stream_modules=stream_modules,
+        )
+        freezer.freeze()
+        if stream_modules:
+            # the code of the written modules is not kept in memory
+            for module in freezer.finder.modules:
+                assert not module.has_code or module.code_deferred, module
+        assert freezer.zip_filename is not None
+        with ZipFile(freezer.zip_filename) as zip_file:
+            return {
+                name: zip_file.read(name)
+                for name in zip_file.namelist()
+                if name.endswith(".pyc")
+            }
+
+    assert build("build1", False) == build("build2", True)
+    executable = tmp_package.path / "build2" / f"hello{EXE_SUFFIX}"
+    result = tmp_package.run(executable)
+    result.stdout.fnmatch_lines("pkg [[]0, 2, 4[]]")
+
+
+def test_freezer_reproducible(
+    tmp_package: TempPackage, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that reproducible builds create the same files."""
+    tmp_package.create(SOURCE_WITH_EXTRA_FILES)
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "1700000000")
+
+    def build(target_dir: str) -> dict[Path, tuple[bytes, int]]:
+        freezer = Freezer(
+            executables=["hello.py"],
+            path=[tmp_package.path, *sys.path],
+            target_dir=target_dir,
+            silent=True,
+            cache_dir=tmp_package.path / "cache",
+        )
+        assert freezer.reproducible
+        freezer.freeze()
+        return {
+            file.relative_to(freezer.target_dir): (
+                file.read_bytes(),
+                file.stat().st_mtime_ns,
+            )
+            for file in freezer.target_dir.rglob("*")
+            if file.is_file()
+        }
+
+    # a cold and a warm build, using the module cache
+    first = build("build1")
+    second = build("build2")
+    assert first == second
+    assert {mtime for _, mtime in first.values()} == {1700000000 * 10**9}
+
+    executable = tmp_package.path / "build1" / f"hello{EXE_SUFFIX}"
+    result = tmp_package.run(executable)
+    result.stdout.fnmatch_lines("Hello from cx_Freeze")
+
+
+def test_freezer_reproducible_invalid(
+    tmp_package: TempPackage, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test reproducible builds with an invalid SOURCE_DATE_EPOCH."""
+    tmp_package.create(SOURCE)
+    monkeypatch.setenv("SOURCE_DATE_EPOCH", "yesterday")
+    with pytest.raises(OptionError, match="SOURCE_DATE_EPOCH must be"):
+        Freezer(executables=["hello.py"])
+    # ignored if disabled
+    freezer = Freezer(executables=["hello.py"], reproducible=False)
+    assert not freezer.reproducible
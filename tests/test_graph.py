@@ -0,0 +1,89 @@
+"""Tests for cx_Freeze._graph."""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING
+from xml.etree import ElementTree as ET
+
+from cx_Freeze._graph import GRAPHML_NAMESPACE, ROOT, ImportGraph
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+NS = {"g": GRAPHML_NAMESPACE}
+
+
+def create_graph() -> ImportGraph:
+    """Create a graph with a module, its imports and a binary file."""
+    graph = ImportGraph()
+    graph.add_node("hello", kind="module", size=10, file="hello.py")
+    graph.add_node("ext", kind="extension", size=100, file="/lib/ext.so")
+    graph.add_node("/lib/ext.so", kind="binary", size=100, file="/lib/ext.so")
+    graph.add_edge(None, "hello", "script")
+    graph.add_edge("hello", "ext", "import")
+    graph.add_edge("hello", "ext", "import")
+    graph.add_edge("hello", "hello", "import")
+    graph.add_edge("hello", "missing", "__import__")
+    graph.add_edge("ext", "/lib/ext.so", "extension")
+    return graph
+
+
+def test_graph_json(tmp_path: Path) -> None:
+    """Test the graph written as JSON."""
+    filename = tmp_path / "graph.json"
+    create_graph().write(filename)
+    data = json.loads(filename.read_text(encoding="utf-8"))
+    assert data["directed"] is True
+    nodes = {node["id"]: node for node in data["nodes"]}
+    assert set(nodes) == {ROOT, "hello", "ext", "/lib/ext.so", "missing"}
+    assert nodes["ext"] == {
+        "id": "ext",
+        "kind": "extension",
+        "size": 100,
+        "file": "/lib/ext.so",
+    }
+    assert nodes["missing"] == {"id": "missing"}
+    # duplicated edges and imports of the module itself are discarded
+    assert data["edges"] == [
+        {"source": ROOT, "target": "hello", "reason": "script"},
+        {"source": "hello", "target": "ext", "reason": "import"},
+        {"source": "hello", "target": "missing", "reason": "__import__"},
+        {"source": "ext", "target": "/lib/ext.so", "reason": "extension"},
+    ]
+
+
+def test_graph_graphml(tmp_path: Path) -> None:
+    """Test the graph written as GraphML."""
+    filename = tmp_path / "graph.graphml"
+    create_graph().write(filename)
+    root = ET.parse(filename).getroot()  # noqa: S314
+    keys = {
+        key.get("id"): key.get("attr.type")
+        for key in root.findall("g:key", NS)
+    }
+    assert keys == {
+        "kind": "string",
+        "size": "long",
+        "file": "string",
+        "reason": "string",
+    }
+    graph = root.find("g:graph", NS)
+    assert graph is not None
+    assert graph.get("edgedefault") == "directed"
+    sizes = {
+        node.get("id"): node.findtext("g:data[@key='size']", None, NS)
+        for node in graph.findall("g:node", NS)
+    }
+    assert sizes["hello"] == "10"
+    assert sizes["missing"] is None
+    edges = [
+        (
+            edge.get("source"),
+            edge.get("target"),
+            edge.findtext("g:data[@key='reason']", None, NS),
+        )
+        for edge in graph.findall("g:edge", NS)
+    ]
+    assert ("ext", "/lib/ext.so", "extension") in edges
+    assert len(edges) == 4
@@ -0,0 +1,93 @@
+"""Tests for cx_Freeze._importindex."""
+
+from __future__ import annotations
+
+import os
+import py_compile
+import sys
+from importlib.util import module_from_spec
+from typing import TYPE_CHECKING
+from zipfile import ZipFile
+
+from cx_Freeze._importindex import (
+    IN_ZIP,
+    IS_PACKAGE,
+    IndexFinder,
+)
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from .conftest import TempPackage
+
+SOURCE = """
+src/zpkg/__init__.py
+    NAME = "zpkg"
+src/zpkg/mod.py
+    NAME = "zpkg.mod"
+src/fpkg/__init__.py
+    NAME = "fpkg"
+src/fpkg/mod.py
+    NAME = "fpkg.mod"
+"""
+
+INDEX = {
+    "zpkg": ("zpkg/__init__.pyc", IN_ZIP | IS_PACKAGE),
+    "zpkg.mod": ("zpkg/mod.pyc", IN_ZIP),
+    "fpkg": ("fpkg/__init__.pyc", IS_PACKAGE),
+    "fpkg.mod": ("fpkg/mod.pyc", 0),
+}
+
+
+def create_lib(tmp_package: TempPackage) -> Path:
+    """Create a lib directory with a zip file, like a frozen application."""
+    tmp_package.create(SOURCE)
+    lib_dir = tmp_package.path / "lib"
+    lib_dir.mkdir()
+    with ZipFile(lib_dir / "library.zip", "w") as zip_file:
+        for location, flags in INDEX.values():
+            source = tmp_package.path / "src" / location
+            target = None if flags & IN_ZIP else lib_dir / location
+            compiled = py_compile.compile(
+                os.fspath(source.with_suffix(".py")),
+                os.fspath(target) if target else None,
+                doraise=True,
+            )
+            if target is None:
+                zip_file.write(compiled, location)
+    return lib_dir
+
+
+def test_index_finder(tmp_package: TempPackage) -> None:
+    """Test the specs of the modules in the zip file and in the lib dir."""
+    lib_dir = create_lib(tmp_package)
+    library = os.fspath(lib_dir / "library.zip")
+    finder = IndexFinder(INDEX, os.fspath(lib_dir), library)
+    try:
+        for name in INDEX:
+            spec = finder.find_spec(name)
+            assert spec is not None, name
+            assert spec.name == name
+            module = module_from_spec(spec)
+            assert spec.loader is not None
+            spec.loader.exec_module(module)
+            assert name == module.NAME
+            if name.endswith(".mod"):
+                assert spec.submodule_search_locations is None
+            else:
+                assert spec.submodule_search_locations
+        spec = finder.find_spec("fpkg")
+        assert spec is not None
+        assert spec.origin == os.path.join(lib_dir, "fpkg", "__init__.pyc")
+        # modules not in the index are left to other finders
+        assert finder.find_spec("missing") is None
+    finally:
+        for key in list(sys.path_importer_cache):
+            if key.startswith(library):
+                del sys.path_importer_cache[key]
+
+
+def test_index_finder_no_library(tmp_path: Path) -> None:
+    """Test the modules in a zip file when there is no zip file."""
+    finder = IndexFinder(INDEX, os.fspath(tmp_path))
+    assert finder.find_spec("zpkg") is None
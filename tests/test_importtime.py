@@ -0,0 +1,68 @@
+"""Tests for cx_Freeze._importtime."""
+
+from __future__ import annotations
+
+import io
+import sys
+from typing import TYPE_CHECKING
+
+from cx_Freeze._importtime import ImportProfiler, loader_kind
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_loader_kind() -> None:
+    """Test the kind of the loaders."""
+    assert loader_kind(sys.__spec__.loader) == "builtin"
+    assert loader_kind(sys.modules["json"].__spec__.loader) == "filesystem"
+
+
+def test_import_profiler(tmp_path: Path) -> None:
+    """Test the records of nested imports."""
+    tmp_path.joinpath("profiled_outer.py").write_text(
+        "import profiled_inner\n", encoding="utf-8"
+    )
+    tmp_path.joinpath("profiled_inner.py").write_text(
+        "VALUE = 42\n", encoding="utf-8"
+    )
+    profiler = ImportProfiler({"profiled_inner": ("inner-dist", 11)})
+    sys.path.insert(0, str(tmp_path))
+    sys.meta_path.insert(0, profiler)
+    try:
+        import profiled_outer  # noqa: PLC0415
+
+        assert profiled_outer.profiled_inner.VALUE == 42
+        assert profiled_outer.__loader__ is profiled_outer.__spec__.loader
+        assert loader_kind(profiled_outer.__loader__) == "filesystem"
+    finally:
+        sys.meta_path.remove(profiler)
+        sys.path.remove(str(tmp_path))
+        sys.modules.pop("profiled_outer", None)
+        sys.modules.pop("profiled_inner", None)
+
+    inner, outer = profiler.records
+    assert inner["name"] == "profiled_inner"
+    assert inner["depth"] == 1
+    assert inner["distribution"] == "inner-dist"
+    assert inner["bytes"] == 11
+    assert outer["name"] == "profiled_outer"
+    assert outer["depth"] == 0
+    assert outer["loader"] == "filesystem"
+    assert outer["cumulative"] >= inner["cumulative"]
+    assert outer["self"] <= outer["cumulative"] - inner["cumulative"] + 1e-9
+
+    output = io.StringIO()
+    profiler.print_report(output)
+    lines = output.getvalue().splitlines()
+    assert lines[0].startswith("import time: self [us] | cumulative")
+    assert lines[1].endswith("|   profiled_inner")
+    assert lines[2].endswith("| profiled_outer")
+
+    events = profiler.to_trace()["traceEvents"]
+    assert [event["name"] for event in events] == [
+        "profiled_inner",
+        "profiled_outer",
+    ]
+    assert events[0]["ph"] == "X"
+    assert events[0]["args"]["bytes"] == 11
@@ -0,0 +1,46 @@
+"""Tests for cx_Freeze._lazy."""
+
+from __future__ import annotations
+
+import sys
+from typing import TYPE_CHECKING
+
+from cx_Freeze._lazy import LazyFinder
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_lazy_finder_names() -> None:
+    """Test the selection of the modules and their submodules."""
+    finder = LazyFinder(["pkg", "other.sub"])
+    assert finder.is_lazy("pkg")
+    assert finder.is_lazy("pkg.mod")
+    assert finder.is_lazy("other.sub.mod")
+    assert not finder.is_lazy("other")
+    assert not finder.is_lazy("pkg2")
+    assert not finder.is_lazy("mod.pkg")
+
+
+def test_lazy_finder(tmp_path: Path) -> None:
+    """Test that a selected module is executed on first use."""
+    tmp_path.joinpath("lazy_heavy.py").write_text(
+        "import sys\nsys.lazy_heavy_loaded = True\nVALUE = 42\n",
+        encoding="utf-8",
+    )
+    finder = LazyFinder(["lazy_heavy"])
+    sys.path.insert(0, str(tmp_path))
+    sys.meta_path.insert(0, finder)
+    try:
+        assert finder.find_spec("json") is None
+        import lazy_heavy  # noqa: PLC0415
+
+        assert not hasattr(sys, "lazy_heavy_loaded")
+        assert lazy_heavy.VALUE == 42
+        assert sys.lazy_heavy_loaded is True
+    finally:
+        sys.meta_path.remove(finder)
+        sys.path.remove(str(tmp_path))
+        sys.modules.pop("lazy_heavy", None)
+        if hasattr(sys, "lazy_heavy_loaded"):
+            del sys.lazy_heavy_loaded
@@ -16,6 +16,7 @@ from cx_Freeze.exception import OptionError
 
 if TYPE_CHECKING:
     from collections.abc import Callable
+    from pathlib import Path
 
     from .conftest import TempPackage
 
@@ -55,6 +56,39 @@ def test_implicit_namespace_package(tmp_package: TempPackage) -> None:
     assert namespacepack.stub_code is None
 
 
+def test_module_compact(tmp_path: Path) -> None:
+    """Test the interned paths and the shared sets of names of Module."""
+    package = Module("pkg", path=[tmp_path / "pkg"])
+    modules = [
+        Module(f"pkg.mod{i}", filename=tmp_path / "pkg" / f"mod{i}.py")
+        for i in range(2)
+    ]
+    assert not hasattr(package, "__dict__")
+    assert package.is_package
+    path = package.path
+    assert path == (tmp_path / "pkg",)
+    # the path is changed by setting it again, not in place
+    with pytest.raises(AttributeError):
+        path.append(tmp_path / "extra")  # ty: ignore[unresolved-attribute]
+    package.path = [*path, tmp_path / "extra"]
+    assert package.path == (tmp_path / "pkg", tmp_path / "extra")
+    assert modules[0].file == tmp_path / "pkg" / "mod0.py"
+    assert modules[0].file_name == "mod0.py"
+    assert not modules[0].is_package
+    assert modules[0].path is None
+
+    shared: dict[frozenset[str], frozenset[str]] = {}
+    for module in modules:
+        module.global_names.update(["a", "b"])
+        module.share_names(shared)
+    assert modules[0].global_names == {"a", "b"}
+    assert shared == {frozenset({"a", "b"}): frozenset({"a", "b"})}
+    # changed after being shared
+    modules[1].global_names.add("c")
+    assert modules[0].global_names == {"a", "b"}
+    assert modules[1].global_names == {"a", "b", "c"}
+
+
 zip_packages = pytest.mark.parametrize(
     "zip_packages", [False, True], ids=["", "zip_packages"]
 )
@@ -2,14 +2,20 @@
 
 from __future__ import annotations
 
+import compileall
+import gc
+import marshal
 import os
 import py_compile
 import sys
+import weakref
 from typing import TYPE_CHECKING, Any
 
 import pytest
 
 from cx_Freeze import ConstantsModule, ModuleFinder
+from cx_Freeze import finder as finder_module
+from cx_Freeze._spill import SpillStore
 
 from .datatest import (
     A_MODULE,
@@ -52,6 +58,10 @@ from .datatest import (
 
 if TYPE_CHECKING:
     from collections.abc import Callable
+    from concurrent.futures import Future
+    from types import CodeType
+
+    from cx_Freeze.module import Module
 
     from .conftest import TempPackage
 
@@ -286,3 +296,281 @@ def test_load_module_code(tmp_package: TempPackage) -> None:
     path = tmp_package.path / "a.py"
     msg = f"Unknown module loader in {path.as_posix()!r}"
     assert module.error_msg == msg
+
+
+@pytest.mark.parametrize(
+    ("import_this", "modules", "missing", "maybe_missing", "source", "kwargs"),
+    [
+        ABSOLUTE_IMPORT_TEST,
+        MAYBE_TEST_NEW,
+        NAMESPACE_TEST,
+        PACKAGE_TEST,
+        RELATIVE_IMPORT_TEST,
+        RELATIVE_IMPORT_TEST_4,
+        SUB_PACKAGE_TEST,
+        SYNTAX_ERROR_TEST,
+        OPTIMIZE_2_TEST,
+    ],
+    ids=[
+        "absolute_import_test",
+        "maybe_test_new",
+        "namespace_test",
+        "package_test",
+        "relative_import_test",
+        "relative_import_test_4",
+        "sub_package_test",
+        "syntax_error_test",
+        "optimize_2_test",
+    ],
+)
+def test_finder_jobs(
+    import_this: str,
+    modules: list[str],
+    missing: list[str],
+    maybe_missing: list[str],
+    source: str,
+    *,
+    tmp_package: TempPackage,
+    kwargs: dict[str, Any],
+) -> None:
+    """Test that modules compiled in workers find the same modules."""
+    _do_test(
+        import_this,
+        modules,
+        missing,
+        maybe_missing,
+        source,
+        test_dir=tmp_package,
+        jobs=2,
+        **kwargs,
+    )
+
+
+@pytest.mark.parametrize(
+    ("import_this", "modules", "missing", "maybe_missing", "source", "kwargs"),
+    [
+        ABSOLUTE_IMPORT_TEST,
+        MAYBE_TEST_NEW,
+        NAMESPACE_TEST,
+        PACKAGE_TEST,
+        RELATIVE_IMPORT_TEST,
+        RELATIVE_IMPORT_TEST_4,
+        SUB_PACKAGE_TEST,
+        SYNTAX_ERROR_TEST,
+    ],
+    ids=[
+        "absolute_import_test",
+        "maybe_test_new",
+        "namespace_test",
+        "package_test",
+        "relative_import_test",
+        "relative_import_test_4",
+        "sub_package_test",
+        "syntax_error_test",
+    ],
+)
+def test_finder_defer_compile(
+    import_this: str,
+    modules: list[str],
+    missing: list[str],
+    maybe_missing: list[str],
+    source: str,
+    *,
+    tmp_package: TempPackage,
+    kwargs: dict[str, Any],
+) -> None:
+    """Test that the cached bytecode finds the same modules."""
+    tmp_package.create(source)
+    compileall.compile_dir(tmp_package.path, quiet=2, optimize=2)
+    _do_test(
+        import_this,
+        modules,
+        missing,
+        maybe_missing,
+        source,
+        test_dir=tmp_package,
+        defer_compile=True,
+        **{"optimize": 2, **kwargs},
+    )
+
+
+SOURCE_DEFER_COMPILE = '''
+hello.py
+    """Docstring."""
+    import json
+    VALUE = 1
+'''
+
+
+def test_finder_defer_compile_code(tmp_package: TempPackage) -> None:
+    """Test that the code is compiled at the optimization level when used."""
+    tmp_package.create(SOURCE_DEFER_COMPILE)
+    compileall.compile_dir(tmp_package.path, quiet=2, optimize=2)
+    finder = ModuleFinder(
+        ConstantsModule(),
+        path=[tmp_package.path, *sys.path],
+        optimize=2,
+        defer_compile=True,
+    )
+    module = finder.include_module("hello")
+    assert module.code_deferred
+    assert "VALUE" in module.global_names
+    assert "json" in [m.name for m in finder.modules]
+    assert module.code is not None
+    assert not module.code_deferred
+    assert "Docstring." not in module.code.co_consts
+
+
+SOURCE_DEFER_COMPILE_LEVEL = """
+hello.py
+    if __debug__:
+        import debug_only
+"""
+
+
+def test_finder_defer_compile_level(tmp_package: TempPackage) -> None:
+    """Test that only the bytecode cached at the optimization level is used."""
+    tmp_package.create(SOURCE_DEFER_COMPILE_LEVEL)
+    hello = tmp_package.path / "hello.py"
+
+    def include_hello() -> Module:
+        finder = ModuleFinder(
+            ConstantsModule(),
+            path=[tmp_package.path, *sys.path],
+            optimize=2,
+            defer_compile=True,
+        )
+        try:
+            return finder.include_module("hello")
+        finally:
+            finder.cleanup()
+
+    # the bytecode of the interpreter finds imports removed at the level
+    compileall.compile_file(hello, quiet=2)
+    assert not include_hello().code_deferred
+    compileall.compile_file(hello, quiet=2, optimize=2)
+    module = include_hello()
+    assert module.code_deferred
+    assert module.global_names == set()
+    # the out of date bytecode is not used
+    hello.write_text("import os\n")
+    os.utime(hello, ns=(0, 0))
+    module = include_hello()
+    assert not module.code_deferred
+    assert "os" in module.global_names
+
+
+def test_finder_compile_deferred(
+    tmp_package: TempPackage, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the parent keeps no code of the modules compiled later."""
+    tmp_package.create(SOURCE_DEFER_COMPILE)
+    compileall.compile_dir(tmp_package.path, quiet=2, optimize=2)
+    scanned: list[weakref.ref[CodeType]] = []
+    load_cached_bytecode = finder_module._load_cached_bytecode  # noqa: SLF001
+
+    def spy(filename: str, optimize: int) -> CodeType | None:
+        code = load_cached_bytecode(filename, optimize)
+        if code is not None:
+            scanned.append(weakref.ref(code))
+        return code
+
+    monkeypatch.setattr(finder_module, "_load_cached_bytecode", spy)
+    finder = ModuleFinder(
+        ConstantsModule(),
+        path=[tmp_package.path, *sys.path],
+        optimize=2,
+        defer_compile=True,
+        jobs=2,
+    )
+    try:
+        module = finder.include_module("hello")
+        compiled = dict(finder.compile_deferred(finder.modules))
+        assert list(compiled) == finder.modules
+        future = compiled[module]
+        assert future is not None
+        data = future.result()
+        gc.collect()
+        assert scanned
+        assert [ref for ref in scanned if ref() is not None] == []
+        assert module.code_deferred
+        code = marshal.loads(data)  # noqa: S302
+        assert "Docstring." not in code.co_consts
+    finally:
+        finder.cleanup()
+
+
+def test_finder_compile_deferred_window(
+    tmp_package: TempPackage, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a few modules per job are compiled ahead, in order."""
+    tmp_package.create(SOURCE_DEFER_COMPILE)
+    compileall.compile_dir(tmp_package.path, quiet=2, optimize=2)
+    monkeypatch.setattr("cx_Freeze.finder.COMPILE_AHEAD", 1)
+    finder = ModuleFinder(
+        ConstantsModule(),
+        path=[tmp_package.path, *sys.path],
+        optimize=2,
+        defer_compile=True,
+        jobs=2,
+    )
+    submitted: list[str] = []
+    submit = finder._submit_compile  # noqa: SLF001
+
+    def spy(module: Module) -> Future[bytes] | None:
+        future = submit(module)
+        if future is not None:
+            submitted.append(module.name)
+        return future
+
+    monkeypatch.setattr(finder, "_submit_compile", spy)
+    try:
+        finder.include_module("hello")
+        yielded: list[str] = []
+        for module, future in finder.compile_deferred(finder.modules):
+            yielded.append(module.name)
+            assert len(set(submitted).difference(yielded)) <= 2
+            if future is not None:
+                assert marshal.loads(future.result())  # noqa: S302
+        assert yielded == [module.name for module in finder.modules]
+        assert len(submitted) > 2
+    finally:
+        finder.cleanup()
+
+
+def test_finder_stream_modules(
+    tmp_package: TempPackage, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the code of the scanned modules is loaded when used."""
+    tmp_package.create(SOURCE_DEFER_COMPILE)
+    spilled: list[weakref.ref[CodeType]] = []
+    put = SpillStore.put
+
+    def spy(store: SpillStore, name: str, code: CodeType) -> None:
+        spilled.append(weakref.ref(code))
+        put(store, name, code)
+
+    monkeypatch.setattr(SpillStore, "put", spy)
+    finder = ModuleFinder(
+        ConstantsModule(),
+        path=[tmp_package.path, *sys.path],
+        stream_modules=True,
+    )
+    try:
+        module = finder.include_module("hello")
+        assert module.code_deferred
+        # the code objects spilled are released
+        gc.collect()
+        assert spilled
+        assert [ref for ref in spilled if ref() is not None] == []
+        assert "json" in [m.name for m in finder.modules]
+        data = finder.spilled_code(module)
+        assert data is not None
+        code = marshal.loads(data)  # noqa: S302
+        assert finder.peek_code(module) == code
+        assert module.code_deferred
+        assert module.code == code
+        # the code may be changed once it is used
+        assert finder.spilled_code(module) is None
+    finally:
+        finder.cleanup()
@@ -0,0 +1,44 @@
+"""Tests for cx_Freeze._optional."""
+
+from __future__ import annotations
+
+import os
+import sys
+from importlib.util import module_from_spec
+from typing import TYPE_CHECKING
+from zipfile import ZipFile
+
+from cx_Freeze._optional import OptionalFinder
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def test_optional_finder(tmp_path: Path) -> None:
+    """Test the modules of the side zip file."""
+    archive = os.fspath(tmp_path / "optional.zip")
+    with ZipFile(archive, "w") as zip_file:
+        zip_file.writestr("pkg/tests/__init__.py", "NAME = 'pkg.tests'")
+        zip_file.writestr("pkg/tests/test_a.py", "NAME = 'pkg.tests.test_a'")
+        zip_file.writestr("extra.py", "NAME = 'extra'")
+    finder = OptionalFinder(archive)
+    try:
+        for name in ("pkg.tests", "pkg.tests.test_a", "extra"):
+            spec = finder.find_spec(name)
+            assert spec is not None, name
+            assert spec.loader is not None
+            module = module_from_spec(spec)
+            spec.loader.exec_module(module)
+            assert name == module.NAME
+        assert finder.find_spec("pkg.missing") is None
+        assert finder.find_spec("missing") is None
+    finally:
+        for key in list(sys.path_importer_cache):
+            if key.startswith(archive):
+                del sys.path_importer_cache[key]
+
+
+def test_optional_finder_no_archive(tmp_path: Path) -> None:
+    """Test the finder when the side zip file does not exist."""
+    finder = OptionalFinder(os.fspath(tmp_path / "optional.zip"))
+    assert finder.find_spec("extra") is None
@@ -0,0 +1,147 @@
+"""Tests for cx_Freeze._resolver."""
+
+from __future__ import annotations
+
+import os
+import sys
+from importlib.machinery import ModuleSpec, PathFinder
+from typing import TYPE_CHECKING
+
+import pytest
+
+from cx_Freeze._resolver import SpecResolver
+
+if TYPE_CHECKING:
+    from types import ModuleType
+
+    from .conftest import TempPackage
+
+SOURCE = """
+first/mod.py
+    pass
+first/pkg/__init__.py
+    pass
+first/pkg/sub.py
+    pass
+first/nspkg/a.py
+    pass
+first/shadow/data.txt
+    data
+first/shadow.py
+    pass
+second/nspkg/b.py
+    pass
+second/mod.py
+    pass
+second/pkg/__init__.py
+    pass
+"""
+
+
+@pytest.mark.parametrize(
+    "name",
+    ["mod", "pkg", "nspkg", "shadow", "missing"],
+)
+def test_resolver(tmp_package: TempPackage, name: str) -> None:
+    """Test that the resolver finds the same specs as PathFinder."""
+    tmp_package.create(SOURCE)
+    path = [
+        os.fspath(tmp_package.path / "first"),
+        os.fspath(tmp_package.path / "notfound"),
+        os.fspath(tmp_package.path / "second"),
+    ]
+    spec = SpecResolver().find_spec(name, path)
+    expected = PathFinder.find_spec(name, path)
+    if expected is None:
+        assert spec is None
+        return
+    assert spec is not None
+    assert spec.origin == expected.origin
+    assert type(spec.loader) is type(expected.loader)
+    if expected.submodule_search_locations is None:
+        assert spec.submodule_search_locations is None
+    else:
+        assert spec.submodule_search_locations == list(
+            expected.submodule_search_locations
+        )
+
+
+def test_resolver_submodule(tmp_package: TempPackage) -> None:
+    """Test a dotted name."""
+    tmp_package.create(SOURCE)
+    path = [os.fspath(tmp_package.path / "first" / "pkg")]
+    spec = SpecResolver().find_spec("pkg.sub", path)
+    assert spec is not None
+    assert spec.name == "pkg.sub"
+    assert spec.origin == os.path.join(path[0], "sub.py")
+
+
+def test_resolver_volatile(tmp_package: TempPackage) -> None:
+    """Test that the listings are memoized, except for volatile ones."""
+    tmp_package.create(SOURCE)
+    first = tmp_package.path / "first"
+    second = tmp_package.path / "second"
+    resolver = SpecResolver(volatile=[second])
+    assert resolver.find_spec("new1", [first]) is None
+    assert resolver.find_spec("new2", [second]) is None
+    first.joinpath("new1.py").touch()
+    second.joinpath("new2.py").touch()
+    assert resolver.find_spec("new1", [first]) is None
+    assert resolver.find_spec("new2", [second]) is not None
+    resolver.invalidate_caches()
+    assert resolver.find_spec("new1", [first]) is not None
+
+
+def test_resolver_relative(
+    tmp_package: TempPackage, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that a relative entry of the path gives absolute locations."""
+    tmp_package.create(SOURCE)
+    monkeypatch.chdir(tmp_package.path)
+    spec = SpecResolver().find_spec("pkg", ["first"])
+    assert spec is not None
+    package_dir = os.fspath(tmp_package.path / "first" / "pkg")
+    assert spec.origin == os.path.join(package_dir, "__init__.py")
+    assert spec.submodule_search_locations == [package_dir]
+
+
+class CustomFinder:
+    """A finder returned by a custom path hook."""
+
+    def __init__(self, entry: str) -> None:
+        self.entry = entry
+
+    def find_spec(
+        self,
+        fullname: str,
+        target: ModuleType | None = None,  # noqa: ARG002
+    ) -> ModuleSpec | None:
+        """Return a spec for any module."""
+        return ModuleSpec(fullname, self, origin=f"custom:{fullname}")
+
+    def invalidate_caches(self) -> None:
+        """Nothing to invalidate."""
+
+
+def test_resolver_path_hook(
+    tmp_package: TempPackage, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the entries handled by a custom path hook use it."""
+    tmp_package.create(SOURCE)
+    first = os.fspath(tmp_package.path / "first")
+
+    def path_hook(entry: str) -> CustomFinder:
+        if entry != first:
+            raise ImportError
+        return CustomFinder(entry)
+
+    monkeypatch.setattr(sys, "path_hooks", [path_hook, *sys.path_hooks])
+    monkeypatch.setattr(sys, "path_importer_cache", {})
+    resolver = SpecResolver()
+    spec = resolver.find_spec("mod", [first])
+    assert spec is not None
+    assert spec.origin == "custom:mod"
+    second = os.fspath(tmp_package.path / "second")
+    spec = resolver.find_spec("mod", [second])
+    assert spec is not None
+    assert spec.origin == os.path.join(second, "mod.py")
@@ -0,0 +1,108 @@
+"""Tests for cx_Freeze._sizereport."""
+
+from __future__ import annotations
+
+import json
+import os
+from typing import TYPE_CHECKING
+from zipfile import ZipFile
+
+import pytest
+
+from cx_Freeze._sizereport import UNATTRIBUTED, SizeReport, format_size
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+DISTRIBUTIONS = {"mod": "dist", "pkg": "dist", "other": "other-dist"}
+
+
+def describe(owner: str) -> tuple[str, list[str]]:
+    """Return the distribution of the owner and a fake chain of imports."""
+    return DISTRIBUTIONS.get(owner, owner), ["main", owner]
+
+
+def test_size_report(tmp_path: Path) -> None:
+    """Test that every byte of the directory is attributed."""
+    target_dir = tmp_path / "build"
+    lib_dir = target_dir / "lib"
+    lib_dir.mkdir(parents=True)
+    (target_dir / "exe").write_bytes(b"x" * 1000)
+    (lib_dir / "mod.so").write_bytes(b"x" * 300)
+    (lib_dir / "data.txt").write_bytes(b"x" * 10)
+    with ZipFile(lib_dir / "library.zip", "w") as zip_file:
+        zip_file.writestr("pkg/__init__.pyc", b"x" * 200)
+        zip_file.writestr("other.pyc", b"x" * 100)
+        zip_file.writestr("unknown.pyc", b"x" * 50)
+    (lib_dir / "library.mar").write_bytes(b"x" * 64)
+
+    report = SizeReport(target_dir)
+    report.record(target_dir / "exe", "<executable>")
+    report.record(lib_dir / "mod.so", "mod")
+    report.record(lib_dir / "mod.so", "other")  # the first owner is kept
+    report.record(lib_dir / "library.zip", "<metadata>")
+    report.record_member(lib_dir / "library.zip", "pkg/__init__.pyc", "pkg")
+    report.record_member(lib_dir / "library.zip", "other.pyc", "other")
+    report.record_member(lib_dir / "library.mar", "mod.sub", "mod", 40)
+    report.analyze(describe)
+
+    files = {file["path"]: file for file in report.files}
+    total_size = sum(
+        path.stat().st_size for path in target_dir.rglob("*") if path.is_file()
+    )
+    assert report.total_size == total_size
+    assert files["lib/mod.so"]["owner"] == "mod"
+    assert files["lib/mod.so"]["chain"] == ["main", "mod"]
+    assert files["lib/data.txt"]["owner"] == UNATTRIBUTED
+    assert files["lib/library.zip/pkg/__init__.pyc"]["distribution"] == "dist"
+    assert files["lib/library.zip/other.pyc"]["size"] > 100
+    assert files["lib/library.zip/unknown.pyc"]["owner"] == UNATTRIBUTED
+    assert files["lib/library.mar/mod.sub"]["size"] == 40
+    assert files["lib/library.mar"]["size"] == 24
+    # sorted by size
+    assert report.files[0]["path"] == "exe"
+    distributions = report.distributions()
+    assert [item["name"] for item in distributions][:2] == [
+        "<executable>",
+        "dist",
+    ]
+
+    report.write(tmp_path / "report.json")
+    data = json.loads((tmp_path / "report.json").read_text(encoding="utf-8"))
+    assert data["total_size"] == total_size
+    tree = data["tree"]
+    assert tree["name"] == "build"
+    values = [
+        leaf["value"]
+        for distribution in tree["children"]
+        for owner in distribution["children"]
+        for leaf in owner["children"]
+    ]
+    assert sum(values) == total_size
+
+
+def test_size_report_hard_links(tmp_path: Path) -> None:
+    """Test that the hard links of a file are counted once."""
+    target_dir = tmp_path / "build"
+    target_dir.mkdir()
+    (target_dir / "a.so").write_bytes(b"x" * 300)
+    os.link(target_dir / "a.so", target_dir / "b.so")
+    report = SizeReport(target_dir)
+    report.analyze(describe)
+    assert report.total_size == 300
+    assert sorted(file["size"] for file in report.files) == [0, 300]
+
+
+@pytest.mark.parametrize(
+    ("size", "expected"),
+    [
+        (0, "0 B"),
+        (1023, "1023 B"),
+        (1536, "1.5 KiB"),
+        (300 * 1024 * 1024, "300.0 MiB"),
+        (5 * 1024**4, "5120.0 GiB"),
+    ],
+)
+def test_format_size(size: int, expected: str) -> None:
+    """Test the sizes shown in the table."""
+    assert format_size(size) == expected
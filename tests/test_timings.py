@@ -0,0 +1,77 @@
+"""Tests for cx_Freeze._timings."""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+from typing import TYPE_CHECKING
+
+from cx_Freeze import _timings
+from cx_Freeze._timings import Timings, phase, timed
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    import pytest
+
+
+@timed("recurse")
+def recurse(depth: int) -> int:
+    """Call itself, to test recursive phases."""
+    if depth == 0:
+        return 0
+    return recurse(depth - 1) + 1
+
+
+def test_timings_disabled() -> None:
+    """Test that the phases are not measured unless started."""
+    timings = Timings()
+    assert recurse(3) == 3
+    with phase("block"):
+        pass
+    assert timings.phases == {}
+
+
+def test_timings(tmp_path: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    """Test the calls, times and subprocesses of the phases."""
+    timings = Timings(trace=True)
+    _timings.start(timings)
+    try:
+        with phase("outer"):
+            assert recurse(3) == 3
+            subprocess.run([sys.executable, "-c", "pass"], check=True)
+    finally:
+        _timings.stop()
+    with phase("after"):
+        pass
+
+    assert set(timings.phases) == {"outer", "recurse"}
+    calls, total, self_time, subprocesses = timings.phases["recurse"]
+    assert calls == 4
+    # the recursive calls are counted once in the total time
+    assert 0 < self_time <= total
+    assert subprocesses == 0
+    calls, total, self_time, subprocesses = timings.phases["outer"]
+    assert calls == 1
+    assert self_time <= total
+    assert total >= timings.phases["recurse"][1]
+    assert subprocesses == 1
+
+    timings.print_table()
+    lines = capsys.readouterr().out.splitlines()
+    assert "Phase" in lines[0]
+    assert lines[1].endswith("  outer")
+
+    trace = tmp_path / "trace.json"
+    timings.write_trace(trace)
+    events = json.loads(trace.read_text(encoding="utf-8"))["traceEvents"]
+    assert [event["name"] for event in events] == [
+        "recurse",
+        "recurse",
+        "recurse",
+        "recurse",
+        "outer",
+    ]
+    assert events[-1]["ph"] == "X"
+    assert events[-1]["args"]["subprocesses"] == 1
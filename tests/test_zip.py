@@ -0,0 +1,96 @@
+"""Tests for cx_Freeze._zip."""
+
+from __future__ import annotations
+
+import os
+import zipimport
+from typing import TYPE_CHECKING
+from zipfile import ZIP_DEFLATED, ZIP_STORED, ZipFile, ZipInfo
+
+import pytest
+
+from cx_Freeze import _zip
+from cx_Freeze._zip import ZipWriter
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+
+def create_zip(path: Path, filename: Path, jobs: int) -> None:
+    """Create a zip file with modules, data files and images."""
+    data_file = path / "data.txt"
+    data_file.write_text("Hello from cx_Freeze\n" * 100)
+    image_file = path / "image.png"
+    image_file.write_bytes(b"\x89PNG" + b"\0" * 1000)
+    with ZipWriter(filename, ZIP_DEFLATED, 9, jobs) as writer:
+        for i in range(20):
+            zinfo = ZipInfo(f"mod{i}.py", (2024, 1, 1, 0, 0, 0))
+            zinfo.compress_type = ZIP_DEFLATED
+            writer.writestr(zinfo, f"VALUE = {i}\n".encode() * 50)
+        writer.write(data_file, "pkg/data.txt")
+        writer.write(image_file, "pkg/image.png")
+        zinfo = ZipInfo("empty.py", (2024, 1, 1, 0, 0, 0))
+        zinfo.compress_type = ZIP_DEFLATED
+        writer.writestr(zinfo, b"")
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_zip_writer(tmp_path: Path, jobs: int) -> None:
+    """Test the contents and the order of the entries."""
+    filename = tmp_path / "library.zip"
+    create_zip(tmp_path, filename, jobs)
+    with ZipFile(filename) as zip_file:
+        assert zip_file.testzip() is None
+        names = zip_file.namelist()
+        assert names == [
+            *(f"mod{i}.py" for i in range(20)),
+            "pkg/data.txt",
+            "pkg/image.png",
+            "empty.py",
+        ]
+        assert zip_file.read("mod3.py") == b"VALUE = 3\n" * 50
+        assert zip_file.getinfo("mod3.py").compress_type == ZIP_DEFLATED
+        assert zip_file.getinfo("pkg/data.txt").compress_type == ZIP_DEFLATED
+        # already compressed or empty payloads are stored
+        assert zip_file.getinfo("pkg/image.png").compress_type == ZIP_STORED
+        assert zip_file.getinfo("empty.py").compress_type == ZIP_STORED
+
+    importer = zipimport.zipimporter(os.fspath(filename))
+    spec = importer.find_spec("mod7")
+    assert spec is not None
+    code = importer.get_code("mod7")
+    namespace: dict[str, int] = {}
+    exec(code, namespace)  # noqa: S102
+    assert namespace["VALUE"] == 7
+
+
+def test_zip_writer_jobs(tmp_path: Path) -> None:
+    """Test that the zip file does not depend on the number of jobs."""
+    serial = tmp_path / "serial.zip"
+    parallel = tmp_path / "parallel.zip"
+    create_zip(tmp_path, serial, 1)
+    create_zip(tmp_path, parallel, 4)
+    assert serial.read_bytes() == parallel.read_bytes()
+
+
+@pytest.mark.parametrize("jobs", [1, 4])
+def test_zip_writer_chunks(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch, jobs: int
+) -> None:
+    """Test the files read and compressed in chunks."""
+    monkeypatch.setattr(_zip, "CHUNK_SIZE", 64)
+    text = b"Hello from cx_Freeze\n" * 100
+    random = os.urandom(1000)
+    tmp_path.joinpath("text.txt").write_bytes(text)
+    tmp_path.joinpath("random.bin").write_bytes(random)
+    filename = tmp_path / "library.zip"
+    with ZipWriter(filename, ZIP_DEFLATED, 9, jobs) as writer:
+        writer.write(tmp_path / "text.txt", "text.txt")
+        writer.write(tmp_path / "random.bin", "random.bin")
+    with ZipFile(filename) as zip_file:
+        assert zip_file.testzip() is None
+        assert zip_file.read("text.txt") == text
+        assert zip_file.getinfo("text.txt").compress_type == ZIP_DEFLATED
+        # the data that would not get smaller is stored
+        assert zip_file.read("random.bin") == random
+        assert zip_file.getinfo("random.bin").compress_type == ZIP_STORED